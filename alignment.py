@@ -0,0 +1,255 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - CALENDAR ALIGNMENT
+Aligned Multi-Asset Return Matrices and Pairwise-Complete Covariance
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import hashlib
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from config_enhanced import RETURN_STORE_PATH
+from price_fetcher import PriceCache, fetch_prices
+from return_store import write_return_store
+from risk_model import LRUCache
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ALIGNMENT POLICY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class AlignmentPolicy:
+    """
+    How to reconcile trading calendars (hashable, part of the cache key)
+
+    Attributes:
+        calendar: "union" keeps every date any asset traded, "intersection"
+            only dates all assets traded, "weekdays" the union without
+            weekends (drops crypto-only weekend prints)
+        ffill_limit: Maximum consecutive missing prices carried forward
+            (None for unlimited, 0 for none)
+        min_coverage: Drop tickers observed on less than this fraction of dates
+        log_returns: Log instead of simple returns
+    """
+
+    calendar: str = "weekdays"
+    ffill_limit: int = 3
+    min_coverage: float = 0.0
+    log_returns: bool = False
+
+
+DEFAULT_POLICY = AlignmentPolicy()
+
+_aligned_cache = LRUCache(maxsize=32)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ALIGNMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def align_prices(prices, policy=DEFAULT_POLICY):
+    """
+    Put price series from different calendars on one date index
+
+    Args:
+        prices: DataFrame (dates x tickers, NaN where not traded) or a
+            dictionary {ticker: Series}
+        policy: AlignmentPolicy
+
+    Returns:
+        DataFrame of aligned prices
+    """
+    if isinstance(prices, dict):
+        # One outer join for all series instead of one per pair
+        prices = pd.concat(prices, axis=1, join="outer", sort=True)
+    prices = prices.sort_index()
+
+    if policy.calendar == "intersection":
+        prices = prices.dropna(how="any")
+    elif policy.calendar == "weekdays":
+        prices = prices[prices.index.dayofweek < 5]
+    elif policy.calendar != "union":
+        raise ValueError(f"Unknown calendar policy: {policy.calendar}")
+
+    if policy.ffill_limit != 0:
+        prices = prices.ffill(limit=policy.ffill_limit)
+
+    if policy.min_coverage > 0:
+        coverage = prices.notna().mean()
+        prices = prices.loc[:, coverage >= policy.min_coverage]
+
+    return prices
+
+
+def prices_to_returns(prices, log_returns=False):
+    """
+    Period returns; a return is NaN unless both endpoints are observed
+
+    Returns:
+        DataFrame of returns (first date dropped)
+    """
+    values = prices.to_numpy(dtype=float)
+    if log_returns:
+        returns = np.diff(np.log(values), axis=0)
+    else:
+        returns = values[1:] / values[:-1] - 1.0
+    return pd.DataFrame(returns, index=prices.index[1:], columns=prices.columns)
+
+
+def _data_version(prices):
+    """Content hash of the raw prices, so edited data never hits a stale entry"""
+    digest = hashlib.sha1()
+    if isinstance(prices, dict):
+        for ticker in sorted(prices):
+            digest.update(ticker.encode())
+            digest.update(pd.util.hash_pandas_object(prices[ticker]).to_numpy().tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(prices).to_numpy().tobytes())
+        digest.update(",".join(map(str, prices.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def _cache_key(universe, start, end, policy, data_version):
+    return tuple(universe), str(start), str(end), policy, data_version
+
+
+def aligned_returns(prices, start=None, end=None, policy=DEFAULT_POLICY, data_version=None):
+    """
+    Aligned return matrix, cached by (universe, date range, policy, data version)
+
+    Args:
+        prices: DataFrame or {ticker: Series} of prices
+        start, end: Optional date bounds
+        policy: AlignmentPolicy
+        data_version: Optional version key of the price data; defaults to a
+            content hash, which costs a pass over the prices on every call
+
+    Returns:
+        DataFrame of returns (dates x tickers); treat as read-only
+    """
+    universe = sorted(prices) if isinstance(prices, dict) else prices.columns
+    key = _cache_key(universe, start, end, policy, data_version or _data_version(prices))
+
+    cached = _aligned_cache.get(key)
+    if cached is not None:
+        return cached
+
+    aligned = align_prices(prices, policy).loc[start:end]
+    returns = prices_to_returns(aligned, policy.log_returns)
+    _aligned_cache.put(key, returns)
+    return returns
+
+
+def load_aligned_returns(tickers, start=None, end=None, policy=DEFAULT_POLICY, cache=None):
+    """
+    Aligned returns for tickers in the local price cache
+
+    Tickers without cached prices are left out. The data version is taken
+    from the cache files' modification stamps, so a cache hit reads no
+    CSV at all.
+
+    Args:
+        tickers: List of tickers
+        start, end: Optional date bounds
+        policy: AlignmentPolicy
+        cache: PriceCache; defaults to the configured cache directory
+
+    Returns:
+        DataFrame of returns (dates x tickers)
+    """
+    cache = cache or PriceCache()
+    stamps = {ticker: cache.stamp(ticker) for ticker in tickers}
+    stamps = {ticker: stamp for ticker, stamp in sorted(stamps.items()) if stamp is not None}
+    version = "cache-" + hashlib.sha1(repr(sorted(stamps.items())).encode()).hexdigest()[:16]
+
+    cached = _aligned_cache.get(_cache_key(sorted(stamps), start, end, policy, version))
+    if cached is not None:
+        return cached
+    series = {ticker: cache.read(ticker) for ticker in stamps}
+    return aligned_returns(series, start, end, policy, data_version=version)
+
+
+def build_return_store(tickers, start=None, end=None, policy=DEFAULT_POLICY, provider=None, cache=None,
+                       refresh=False, path=RETURN_STORE_PATH):
+    """
+    Fetch prices, align them and write the return store the pages read
+
+    Args:
+        tickers: List of tickers
+        start, end: Optional date bounds (end exclusive, as for fetch_prices)
+        policy: AlignmentPolicy
+        provider: Price provider for fetch_prices; defaults to Yahoo Finance
+        cache: PriceCache; defaults to the configured cache directory
+        refresh: Ignore cached prices and download everything
+        path: Return store directory
+
+    Returns:
+        Tuple of (DataFrame of the stored returns, list of failed tickers)
+    """
+    cache = cache or PriceCache()
+    _, failed = fetch_prices(tickers, start, end, provider=provider, cache=cache, refresh=refresh)
+    returns = load_aligned_returns([ticker for ticker in tickers if ticker not in failed], start, end, policy, cache)
+    if returns.empty:
+        raise ValueError("No price history to build a return store from")
+    write_return_store(returns.to_numpy(), list(returns.columns), returns.index, path=path)
+    return returns, failed
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PAIRWISE-COMPLETE COVARIANCE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def pairwise_covariance(returns, min_periods=2, make_psd=True):
+    """
+    Covariance using, for each pair, every date both assets were observed
+
+    Computed with three matrix products over a 0/1 observation mask rather
+    than a loop over pairs:
+        n_ij = M'M,  s_ij = (X'M)_ij (sum of x_i where j observed),  p_ij = X'X
+        cov_ij = (p_ij - s_ij s_ji / n_ij) / (n_ij - 1)
+
+    Args:
+        returns: DataFrame or array (T x n) with NaN for missing values
+        min_periods: Pairs with fewer common observations get NaN
+        make_psd: Clip negative eigenvalues, which pairwise estimates can produce;
+            assets with NaN pairs are left out of the repair
+
+    Returns:
+        Covariance matrix (n x n), a DataFrame if returns is a DataFrame
+    """
+    values = np.asarray(returns, dtype=float)
+    mask = ~np.isnan(values)
+    x = np.where(mask, values, 0.0)
+    m = mask.astype(float)
+
+    counts = m.T @ m
+    sums = x.T @ m
+    products = x.T @ x
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (products - sums * sums.T / counts) / (counts - 1)
+    cov[counts < max(min_periods, 2)] = np.nan
+
+    # Repair a block with every pair estimated, dropping the assets with the
+    # most NaN pairs (then the shortest history) first; the rest is left as is
+    missing = np.isnan(cov)
+    observed = np.diag(counts)
+    complete = ~missing.all(axis=1)
+    while missing[np.ix_(complete, complete)].any():
+        nan_pairs = np.where(complete, (missing & complete).sum(axis=1), -1)
+        worst = np.flatnonzero(nan_pairs == nan_pairs.max())
+        complete[worst[np.argmin(observed[worst])]] = False
+    if make_psd and complete.any():
+        block = np.ix_(complete, complete)
+        eigenvalues, eigenvectors = np.linalg.eigh(cov[block])
+        if eigenvalues[0] < 0:
+            cov[block] = (eigenvectors * np.clip(eigenvalues, 0.0, None)) @ eigenvectors.T
+
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+    return cov
+
+
+def clear_alignment_cache():
+    """Drop all cached aligned return matrices"""
+    _aligned_cache.clear()
@@ -13,6 +13,7 @@ Prof. V. Ravichandran
 import streamlit as st
 import pandas as pd
 from config_enhanced import PAGE_CONFIG, ASSET_STATS
+from portfolio import Portfolio
 from styles_enhanced import apply_main_styles, render_header, render_footer
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -294,8 +295,7 @@ elif len(selected_assets_list) > 6:
 
 # Initialize equal weights for selected assets
 equal_weight = 1.0 / len(selected_assets_list)
-selected_assets_dict = {asset: equal_weight for asset in selected_assets_list}
-st.session_state.selected_assets = selected_assets_dict
+st.session_state.selected_assets = Portfolio.equal_weight(selected_assets_list)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CURRENT SETTINGS DISPLAY
@@ -0,0 +1,185 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - BLACK-LITTERMAN
+Equilibrium Returns Blended with Investor Views
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from config_enhanced import MARKET_CAPS, RISK_AVERSION
+from risk_model import covariance_fingerprint, LRUCache
+
+DEFAULT_TAU = 0.05
+
+# Equilibrium depends only on the covariance and market portfolio; the
+# posterior additionally depends on the views, so tweaking a view in the UI
+# hits the equilibrium cache and recomputes only the posterior step.
+_equilibrium_cache = LRUCache(maxsize=32)
+_posterior_cache = LRUCache(maxsize=128)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MARKET PORTFOLIO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def market_cap_weights(assets, fallback_weights=None):
+    """
+    Market-capitalization weights for the given assets
+
+    Args:
+        assets: List of asset tickers
+        fallback_weights: Weights to use if any asset has no market cap
+            (e.g. the current holdings). If None, equal weights.
+
+    Returns:
+        Numpy array of weights summing to 1
+    """
+    if all(asset in MARKET_CAPS for asset in assets):
+        caps = np.array([MARKET_CAPS[asset] for asset in assets], dtype=float)
+    elif fallback_weights is not None:
+        caps = np.asarray(fallback_weights, dtype=float)
+    else:
+        caps = np.ones(len(assets))
+    return caps / caps.sum()
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EQUILIBRIUM RETURNS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def implied_equilibrium_returns(cov, market_weights, risk_aversion=RISK_AVERSION, cov_version=None):
+    """
+    Reverse-optimized equilibrium excess returns (pi = delta * Sigma * w_mkt)
+
+    Args:
+        cov: Covariance matrix (n x n), decimal units
+        market_weights: Market portfolio weights
+        risk_aversion: Market risk aversion coefficient (delta)
+        cov_version: Optional covariance version key; defaults to a fingerprint
+
+    Returns:
+        Numpy array of equilibrium excess returns
+    """
+    cov = np.asarray(cov, dtype=float)
+    market_weights = np.asarray(market_weights, dtype=float)
+    cov_version = cov_version or covariance_fingerprint(cov)
+    key = (cov_version, market_weights.tobytes(), float(risk_aversion))
+
+    pi = _equilibrium_cache.get(key)
+    if pi is None:
+        pi = risk_aversion * (cov @ market_weights)
+        _equilibrium_cache.put(key, pi)
+    return pi.copy()  # Callers may modify the result; the cached array stays intact
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VIEWS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_views(assets, views):
+    """
+    Convert view dictionaries into the pick matrix P, targets Q and confidences
+
+    Each view is a dictionary:
+        {"weights": {"AAPL": 1.0, "MSFT": -1.0}, "return": 0.02, "confidence": 0.6}
+    An absolute view uses a single asset with weight 1. Confidence is in (0, 1]
+    and defaults to 0.5.
+
+    Args:
+        assets: List of asset tickers (defines the column order)
+        views: List of view dictionaries
+
+    Returns:
+        Tuple of (P, Q, confidences) numpy arrays
+    """
+    index = {asset: i for i, asset in enumerate(assets)}
+    P = np.zeros((len(views), len(assets)))
+    Q = np.zeros(len(views))
+    confidences = np.zeros(len(views))
+
+    for k, view in enumerate(views):
+        for asset, weight in view["weights"].items():
+            if asset not in index:
+                raise ValueError(f"View references unknown asset: {asset}")
+            P[k, index[asset]] = weight
+        Q[k] = view["return"]
+        confidences[k] = view.get("confidence", 0.5)
+
+    if np.any((confidences <= 0) | (confidences > 1)):
+        raise ValueError("View confidence must be in (0, 1]")
+
+    return P, Q, confidences
+
+
+def _views_key(assets, views):
+    """Hashable representation of a list of views"""
+    return (
+        tuple(assets),
+        tuple(
+            (tuple(sorted(view["weights"].items())), float(view["return"]), float(view.get("confidence", 0.5)))
+            for view in views
+        ),
+    )
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POSTERIOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def black_litterman(assets, cov, market_weights=None, views=None, tau=DEFAULT_TAU,
+                    risk_aversion=RISK_AVERSION, cov_version=None):
+    """
+    Black-Litterman posterior expected returns and covariance
+
+    Uses the He-Litterman form with Cholesky solves on the (k x k) view
+    matrix only; no explicit inverse is formed. View uncertainty is
+    omega_k = (1 - c_k) / c_k * p_k' tau Sigma p_k for confidence c_k.
+
+    Args:
+        assets: List of asset tickers
+        cov: Covariance matrix (n x n), decimal units
+        market_weights: Market portfolio weights. If None, market-cap weights.
+        views: List of view dictionaries (see build_views)
+        tau: Uncertainty scaling of the prior
+        risk_aversion: Market risk aversion coefficient (delta)
+        cov_version: Optional covariance version key; defaults to a fingerprint
+
+    Returns:
+        Dictionary with equilibrium_returns, posterior_returns and posterior_covariance
+    """
+    cov = np.asarray(cov, dtype=float)
+    views = views or []
+    cov_version = cov_version or covariance_fingerprint(cov)
+    if market_weights is None:
+        market_weights = market_cap_weights(assets)
+    market_weights = np.asarray(market_weights, dtype=float)
+
+    pi = implied_equilibrium_returns(cov, market_weights, risk_aversion, cov_version=cov_version)
+
+    key = (cov_version, market_weights.tobytes(), float(risk_aversion), float(tau), _views_key(assets, views))
+    cached = _posterior_cache.get(key)
+    if cached is not None:
+        return {name: array.copy() for name, array in cached.items()}
+
+    tau_cov = tau * cov
+
+    if views:
+        P, Q, confidences = build_views(assets, views)
+        view_var = np.einsum("ij,jk,ik->i", P, tau_cov, P)
+        omega = np.diag(np.maximum((1.0 - confidences) / confidences * view_var, 1e-12))
+
+        # A = P tau Sigma P' + Omega is (k x k) and positive definite
+        tau_cov_pt = tau_cov @ P.T
+        factor = cho_factor(P @ tau_cov_pt + omega)
+
+        posterior_returns = pi + tau_cov_pt @ cho_solve(factor, Q - P @ pi)
+        posterior_uncertainty = tau_cov - tau_cov_pt @ cho_solve(factor, tau_cov_pt.T)
+    else:
+        posterior_returns = pi.copy()
+        posterior_uncertainty = tau_cov
+
+    result = {
+        "equilibrium_returns": pi,
+        "posterior_returns": posterior_returns,
+        "posterior_covariance": cov + posterior_uncertainty,
+    }
+    _posterior_cache.put(key, {name: array.copy() for name, array in result.items()})
+    return result
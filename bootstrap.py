@@ -0,0 +1,244 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - BOOTSTRAP CONFIDENCE INTERVALS
+Stationary Block Bootstrap of Sharpe, Sortino and Optimizer Weights
+═══════════════════════════════════════════════════════════════════════════════
+
+A replicate is a resampled history; every statistic used here (means,
+variances, downside deviations) depends only on how many times each period
+was drawn. A batch of replicates is therefore a (B x T) count matrix, and
+its statistics are a few matrix products with the (T x n) return matrix.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config_enhanced import BOOTSTRAP, RANDOM_SEED, RETURN_STORE_PERIODS_PER_YEAR
+from hierarchical_risk_parity import hierarchical_risk_parity
+from random_streams import block_seeds, generator
+from risk_model import build_covariance_matrix, LRUCache
+from risk_parity import equal_risk_contribution
+
+# Objectives whose optimizer is re-run on every replicate (see replicate_weights)
+BOOTSTRAP_OBJECTIVES = (
+    "Maximize Sharpe Ratio", "Minimize Risk", "Maximize Return",
+    "Risk Parity", "Hierarchical Risk Parity",
+)
+
+_results = LRUCache(maxsize=32)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESAMPLING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def stationary_bootstrap_counts(rng, n_obs, n_replicates, mean_block=BOOTSTRAP["mean_block"]):
+    """
+    Draw counts of the Politis-Romano stationary bootstrap
+
+    Each replicate is a circular walk through the history that jumps to a
+    random period with probability 1 / mean_block, so blocks have geometric
+    lengths and serial dependence inside them is kept.
+
+    Args:
+        rng: numpy Generator
+        n_obs: History length T
+        n_replicates: Number of replicates B
+        mean_block: Mean block length
+
+    Returns:
+        Integer counts (B x T): how often each period appears in each replicate
+    """
+    jumps = rng.random((n_replicates, n_obs)) < 1.0 / mean_block
+    jumps[:, 0] = True
+    starts = rng.integers(0, n_obs, (n_replicates, n_obs))
+
+    # Position of the latest jump at or before each step, then walk on from its start
+    steps = np.arange(n_obs)
+    last_jump = np.maximum.accumulate(np.where(jumps, steps, 0), axis=1)
+    rows = np.arange(n_replicates)[:, None]
+    periods = (starts[rows, last_jump] + steps - last_jump) % n_obs
+
+    flat = (periods + rows * n_obs).ravel()
+    return np.bincount(flat, minlength=n_replicates * n_obs).reshape(n_replicates, n_obs)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPLICATE STATISTICS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def ratio_statistics(counts, portfolio_returns, risk_free_rate=0.0, periods_per_year=RETURN_STORE_PERIODS_PER_YEAR):
+    """
+    Annualized Sharpe and Sortino ratios of every replicate
+
+    Args:
+        counts: Bootstrap counts (B x T)
+        portfolio_returns: Per-period portfolio returns (T x P)
+        risk_free_rate: Annual risk-free rate (decimal)
+        periods_per_year: History frequency
+
+    Returns:
+        Tuple of (sharpe (B x P), sortino (B x P))
+    """
+    n_obs = counts.shape[1]
+    excess = portfolio_returns - risk_free_rate / periods_per_year
+    mean = counts @ excess / n_obs
+    variance = np.maximum(counts @ excess ** 2 / n_obs - mean ** 2, 0.0)
+    downside = counts @ np.minimum(excess, 0.0) ** 2 / n_obs
+
+    scale = np.sqrt(periods_per_year)
+    sharpe = np.divide(mean, np.sqrt(variance), out=np.zeros_like(mean), where=variance > 0) * scale
+    sortino = np.divide(mean, np.sqrt(downside), out=np.zeros_like(mean), where=downside > 0) * scale
+    return sharpe, sortino
+
+
+def replicate_weights(objective, mu, volatility, risk_free_rate=0.0):
+    """
+    Re-run a page optimizer on each replicate's annualized estimates
+
+    The Sharpe, Minimize Risk and Maximize Return allocations are closed
+    form and evaluated for all replicates at once; Risk Parity and HRP are
+    solved per replicate on the assumed-correlation covariance (Risk Parity
+    warm-started from the previous replicate).
+
+    Args:
+        objective: One of BOOTSTRAP_OBJECTIVES
+        mu: Annual expected returns per replicate (B x n), decimal
+        volatility: Annual volatilities per replicate (B x n), decimal
+        risk_free_rate: Annual risk-free rate (decimal)
+
+    Returns:
+        Weights (B x n)
+    """
+    n_replicates, n = mu.shape
+    if objective == "Maximize Sharpe Ratio":
+        scores = np.maximum((mu - risk_free_rate) / volatility, 0.0)
+    elif objective == "Minimize Risk":
+        scores = 1.0 / volatility
+    elif objective == "Maximize Return":
+        scores = np.eye(n)[mu.argmax(axis=1)]
+    elif objective == "Risk Parity":
+        weights = np.empty((n_replicates, n))
+        previous = None
+        for b in range(n_replicates):
+            previous = equal_risk_contribution(build_covariance_matrix(volatility[b]), x0=previous)["weights"]
+            weights[b] = previous
+        return weights
+    elif objective == "Hierarchical Risk Parity":
+        return np.array([hierarchical_risk_parity(build_covariance_matrix(vol))["weights"] for vol in volatility])
+    else:
+        raise ValueError(f"No bootstrap optimizer for objective: {objective}")
+
+    totals = scores.sum(axis=1, keepdims=True)
+    return np.divide(scores, totals, out=np.full_like(scores, 1.0 / n), where=totals > 0)
+
+
+def _bootstrap_batch(asset_returns, weights, objective, n_replicates, mean_block, risk_free_rate,
+                     periods_per_year, seed):
+    """
+    One batch of replicates (runs in a worker process)
+
+    Returns:
+        Tuple of (sharpe (B x P), sortino (B x P), weights (B x n) or None)
+    """
+    counts = stationary_bootstrap_counts(generator(seed), len(asset_returns), n_replicates, mean_block)
+    sharpe, sortino = ratio_statistics(counts, asset_returns @ weights.T, risk_free_rate, periods_per_year)
+    if objective is None:
+        return sharpe, sortino, None
+
+    n_obs = len(asset_returns)
+    mean = counts @ asset_returns / n_obs
+    variance = np.maximum(counts @ asset_returns ** 2 / n_obs - mean ** 2, 1e-18)
+    optimized = replicate_weights(objective, mean * periods_per_year, np.sqrt(variance * periods_per_year),
+                                  risk_free_rate)
+    return sharpe, sortino, optimized
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIDENCE INTERVALS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def bootstrap_intervals(asset_returns, weights, objective=None, risk_free_rate=0.0,
+                        n_replicates=BOOTSTRAP["n_replicates"], mean_block=BOOTSTRAP["mean_block"],
+                        confidence=BOOTSTRAP["confidence"], periods_per_year=RETURN_STORE_PERIODS_PER_YEAR,
+                        batch_size=BOOTSTRAP["batch_size"], n_jobs=None, seed=RANDOM_SEED):
+    """
+    Percentile bootstrap intervals for portfolio ratios and optimizer weights
+
+    Replicates are split into batches that run in parallel across a
+    process pool; batch i always uses child stream i of the seed, so the
+    result does not depend on n_jobs. All portfolios are evaluated on the
+    same replicates, so their differences are paired.
+
+    Args:
+        asset_returns: Per-period asset returns (T x n), complete rows
+        weights: Portfolio weights (P x n), e.g. [current, optimized]
+        objective: Optional objective from BOOTSTRAP_OBJECTIVES to re-run on
+            every replicate for weight intervals
+        risk_free_rate: Annual risk-free rate (decimal)
+        n_replicates: Number of bootstrap replicates
+        mean_block: Mean block length of the stationary bootstrap
+        confidence: Two-sided interval level
+        periods_per_year: History frequency
+        batch_size: Replicates per batch
+        n_jobs: Worker processes. None uses every core; 1 runs in-process.
+        seed: Root seed
+
+    Returns:
+        Dictionary with sharpe and sortino ({point, lower, upper}, each (P,)),
+        sharpe_samples (B x P), weights ({point, lower, upper} (n,) or None)
+        and n_replicates
+    """
+    asset_returns = np.asarray(asset_returns, dtype=float)
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    n_obs = len(asset_returns)
+
+    n_batches = int(np.ceil(n_replicates / batch_size))
+    sizes = [min(batch_size, n_replicates - b * batch_size) for b in range(n_batches)]
+    jobs = [(asset_returns, weights, objective, size, mean_block, risk_free_rate, periods_per_year, s)
+            for size, s in zip(sizes, block_seeds(seed, n_batches, "bootstrap"))]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or n_batches == 1:
+        batches = [_bootstrap_batch(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_batches)) as pool:
+            batches = list(pool.map(_bootstrap_batch, *zip(*jobs)))
+
+    tails = [50 * (1 - confidence), 50 * (1 + confidence)]
+    full_sample = np.ones((1, n_obs), dtype=np.int64)
+    point_sharpe, point_sortino = ratio_statistics(full_sample, asset_returns @ weights.T, risk_free_rate, periods_per_year)
+
+    sharpe = np.vstack([batch[0] for batch in batches])
+    sortino = np.vstack([batch[1] for batch in batches])
+    result = {
+        "sharpe": dict(zip(("lower", "upper"), np.percentile(sharpe, tails, axis=0)), point=point_sharpe[0]),
+        "sortino": dict(zip(("lower", "upper"), np.percentile(sortino, tails, axis=0)), point=point_sortino[0]),
+        "sharpe_samples": sharpe,
+        "weights": None,
+        "n_replicates": n_replicates,
+    }
+
+    if objective is not None:
+        optimized = np.vstack([batch[2] for batch in batches])
+        mean = asset_returns.mean(axis=0)
+        point = replicate_weights(objective, mean[None, :] * periods_per_year,
+                                  asset_returns.std(axis=0)[None, :] * np.sqrt(periods_per_year), risk_free_rate)
+        result["weights"] = dict(zip(("lower", "upper"), np.percentile(optimized, tails, axis=0)), point=point[0])
+    return result
+
+
+def cached_bootstrap_intervals(data_version, assets, asset_returns, weights, objective=None, risk_free_rate=0.0,
+                               **options):
+    """
+    bootstrap_intervals() memoized by market data version
+
+    The key is the data version plus everything else the result depends
+    on, so reruns of the Results page reuse the replicates until the data,
+    the portfolios or the settings change.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    key = (data_version, tuple(assets), weights.tobytes(), objective, risk_free_rate, tuple(sorted(options.items())))
+    result = _results.get(key)
+    if result is None:
+        result = bootstrap_intervals(asset_returns, weights, objective, risk_free_rate, **options)
+        _results.put(key, result)
+    return result
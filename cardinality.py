@@ -0,0 +1,256 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - CARDINALITY-CONSTRAINED OPTIMIZER
+Best-K Mean-Variance Portfolios with Minimum Lots (Greedy + Local Search)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import time
+import numpy as np
+from scipy.linalg import solve_triangular
+from scipy.optimize import minimize
+from config_enhanced import RISK_AVERSION
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SUBSET SOLVERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _budget_utility(C, B, A, risk_aversion):
+    """
+    Utility of the budget-constrained (sign-unconstrained) optimum on a subset
+
+    For w = Sigma^-1 (mu - nu 1) / delta with sum(w) = 1, the utility
+    mu'w - (delta / 2) w'Sigma w equals (C - nu^2 A) / (2 delta), where
+    C = mu'Sigma^-1 mu, B = 1'Sigma^-1 mu, A = 1'Sigma^-1 1 and nu = (B - delta) / A.
+    """
+    nu = (B - risk_aversion) / A
+    return (C - nu ** 2 * A) / (2.0 * risk_aversion)
+
+
+def _solve_subset(mu, cov, risk_aversion, min_weight, max_weight, x0=None):
+    """
+    Long-only mean-variance weights on a fixed subset with lot bounds
+
+    Returns:
+        Tuple of (weights, utility)
+    """
+    k = len(mu)
+    x0 = np.full(k, 1.0 / k) if x0 is None else np.clip(x0, min_weight, max_weight)
+
+    def objective(w):
+        return -(mu @ w) + 0.5 * risk_aversion * (w @ cov @ w)
+
+    def gradient(w):
+        return -mu + risk_aversion * (cov @ w)
+
+    result = minimize(objective, x0, jac=gradient, method="SLSQP",
+                      bounds=[(min_weight, max_weight)] * k,
+                      constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: np.ones(k)}],
+                      options={"ftol": 1e-12, "maxiter": 200})
+    weights = np.clip(result.x, min_weight, max_weight)
+    weights /= weights.sum()
+    return weights, -objective(weights)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GREEDY FORWARD SELECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _greedy_select(mu, cov, n_select, risk_aversion, deadline):
+    """
+    Forward selection scored by the budget-constrained optimum
+
+    The Cholesky factor of the selected block is grown one row at a time,
+    so scoring every remaining candidate costs one triangular solve for the
+    whole candidate block instead of a fresh factorization per candidate.
+    """
+    n = len(mu)
+    first = int(np.argmax(mu - 0.5 * risk_aversion * np.diag(cov)))
+    selected = [first]
+
+    L = np.array([[np.sqrt(cov[first, first])]])
+    z_mu = np.array([mu[first] / L[0, 0]])
+    z_one = np.array([1.0 / L[0, 0]])
+
+    while len(selected) < n_select and time.perf_counter() < deadline:
+        candidates = np.setdiff1d(np.arange(n), selected)
+
+        # New Cholesky row for each candidate: l = L^-1 Sigma[S, j], d = sqrt(Sigma_jj - l'l)
+        l = solve_triangular(L, cov[np.ix_(selected, candidates)], lower=True)
+        d = np.sqrt(np.maximum(cov[candidates, candidates] - np.einsum("ij,ij->j", l, l), 1e-12))
+        z_mu_new = (mu[candidates] - z_mu @ l) / d
+        z_one_new = (1.0 - z_one @ l) / d
+
+        C = z_mu @ z_mu + z_mu_new ** 2
+        B = z_one @ z_mu + z_one_new * z_mu_new
+        A = z_one @ z_one + z_one_new ** 2
+        best = int(np.argmax(_budget_utility(C, B, A, risk_aversion)))
+
+        j = candidates[best]
+        k = len(selected)
+        L_new = np.zeros((k + 1, k + 1))
+        L_new[:k, :k] = L
+        L_new[k, :k] = l[:, best]
+        L_new[k, k] = d[best]
+        L = L_new
+        z_mu = np.append(z_mu, z_mu_new[best])
+        z_one = np.append(z_one, z_one_new[best])
+        selected.append(j)
+
+    return selected
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CARDINALITY-CONSTRAINED OPTIMIZATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def cardinality_constrained(mu, cov, max_assets, risk_aversion=RISK_AVERSION,
+                            min_weight=0.0, max_weight=1.0, lot_size=None,
+                            time_limit=2.0, max_swaps=5, callback=None):
+    """
+    Mean-variance portfolio holding at most max_assets assets
+
+    A greedy forward pass picks an initial subset, then a local search
+    tries single swaps, ranked by the KKT gradient, until no swap improves
+    the utility or the time limit is reached. The best portfolio found so
+    far is always available: it is returned on timeout and passed to the
+    optional callback every time it improves.
+
+    Args:
+        mu: Expected returns (n,), decimal units
+        cov: Covariance matrix (n x n), decimal units
+        max_assets: Maximum number of holdings (K)
+        risk_aversion: Risk aversion coefficient (delta)
+        min_weight: Minimum lot as a weight; every held asset gets at least this
+        max_weight: Upper bound per asset
+        lot_size: Optional weight increment; final weights are multiples of it
+        time_limit: Wall-clock budget in seconds
+        max_swaps: Swap candidates tried per insider in each local-search round
+        callback: Optional function called with the result dictionary on improvement
+
+    Returns:
+        Dictionary with weights (n,), selected (asset indices), utility,
+        iterations and timed_out
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    n_select = min(max_assets, n)
+
+    if n_select < 1:
+        raise ValueError("max_assets must be at least 1")
+    if min_weight > max_weight:
+        raise ValueError("min_weight must not exceed max_weight")
+    if min_weight * n_select > 1.0 + 1e-9:
+        # Fewer, larger positions are required to respect the minimum lot
+        n_select = int(np.floor(1.0 / min_weight + 1e-9))
+    if n_select * max_weight < 1.0 - 1e-9:
+        raise ValueError("No portfolio of at most max_assets holdings satisfies both weight bounds")
+
+    deadline = time.perf_counter() + time_limit
+
+    def evaluate(subset, x0=None):
+        weights, utility = _solve_subset(mu[subset], cov[np.ix_(subset, subset)],
+                                         risk_aversion, min_weight, max_weight, x0)
+        return {"selected": list(subset), "subset_weights": weights, "utility": utility}
+
+    best = evaluate(_greedy_select(mu, cov, n_select, risk_aversion, deadline))
+    iterations = 0
+
+    def report(candidate):
+        full = np.zeros(n)
+        full[candidate["selected"]] = candidate["subset_weights"]
+        return {"weights": full, "selected": sorted(candidate["selected"]),
+                "utility": candidate["utility"], "iterations": iterations}
+
+    if callback is not None:
+        callback(report(best))
+
+    improved = n_select < n
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        iterations += 1
+
+        selected = best["selected"]
+        full = np.zeros(n)
+        full[selected] = best["subset_weights"]
+        # Marginal utility of adding each outsider at the current solution
+        gain = mu - risk_aversion * (cov @ full)
+        outsiders = np.setdiff1d(np.arange(n), selected)
+        entering = outsiders[np.argsort(-gain[outsiders])][:max_swaps]
+        leaving = np.argsort(best["subset_weights"])
+
+        for out_pos in leaving:
+            for j in entering:
+                if time.perf_counter() >= deadline:
+                    break
+                subset = list(selected)
+                subset[out_pos] = j
+                x0 = best["subset_weights"].copy()
+                candidate = evaluate(subset, x0)
+                if candidate["utility"] > best["utility"] + 1e-12:
+                    best = candidate
+                    improved = True
+                    if callback is not None:
+                        callback(report(best))
+                    break
+            if improved or time.perf_counter() >= deadline:
+                break
+
+    result = report(best)
+    if lot_size:
+        result["weights"] = round_to_lots(result["weights"], lot_size, min_weight, max_weight)
+    result["timed_out"] = time.perf_counter() >= deadline
+    return result
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOT ROUNDING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def round_to_lots(weights, lot_size, min_weight=0.0, max_weight=1.0):
+    """
+    Round weights to multiples of lot_size while keeping the total at 1
+
+    Uses largest-remainder rounding within the weight bounds: every held
+    position keeps between ceil(min_weight / lot_size) and
+    floor(max_weight / lot_size) lots, and zero weights stay zero. When 1
+    is not a whole number of lots, the odd remainder (less than one lot)
+    goes to the held position with the most room below max_weight, so the
+    total is exact.
+
+    Args:
+        weights: Portfolio weights summing to 1
+        lot_size: Weight increment (e.g. 0.01 for 1% lots)
+        min_weight: Minimum weight of every held position
+        max_weight: Maximum weight of any position
+
+    Returns:
+        Numpy array of rounded weights
+    """
+    weights = np.asarray(weights, dtype=float)
+    held = np.flatnonzero(weights > 0)
+    units = weights[held] / lot_size
+    low = np.ceil(min_weight / lot_size - 1e-9)
+    high = np.floor(max_weight / lot_size + 1e-9)
+    total_lots = int(np.floor(1.0 / lot_size + 1e-9))
+    if len(held) * low > total_lots or len(held) * high * lot_size < 1.0 - 1e-9:
+        raise ValueError("Weight bounds cannot be met in multiples of lot_size")
+
+    lots = np.clip(np.floor(units + 1e-9), low, high)
+    # Hand out (or take back) single lots by largest (smallest) remainder
+    shortfall = total_lots - int(lots.sum())
+    while shortfall > 0:
+        room = np.flatnonzero(lots < high)
+        j = room[np.argmax(units[room] - lots[room])]
+        lots[j] += 1
+        shortfall -= 1
+    while shortfall < 0:
+        room = np.flatnonzero(lots > low)
+        j = room[np.argmin(units[room] - lots[room])]
+        lots[j] -= 1
+        shortfall += 1
+
+    rounded = np.zeros_like(weights)
+    rounded[held] = lots * lot_size
+    odd_lot = 1.0 - rounded.sum()
+    rounded[held[np.argmax(max_weight - rounded[held])]] += odd_lot
+    return rounded
@@ -10,6 +10,8 @@ Prof. V. Ravichandran
 10+ Years Academic Excellence
 """
 
+import os
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MOUNTAIN PATH COLOR SCHEME - DARK BLUE THEME
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -170,12 +172,291 @@ ASSET_STATS = {
     "ETH": {"return": 0.55, "volatility": 0.80, "description": "Ethereum", "emoji": "₿", "class": "Cryptocurrencies"},
 }
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# APP UNIVERSE ASSUMPTIONS (Annualized %, used by the Streamlit pages)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ASSET_ASSUMPTIONS = {
+    # Tech Giants
+    "AAPL": {"return": 28.5, "volatility": 32.1, "class": "Stocks"},
+    "MSFT": {"return": 26.3, "volatility": 28.9, "class": "Stocks"},
+    "GOOGL": {"return": 24.7, "volatility": 30.2, "class": "Stocks"},
+    "AMZN": {"return": 22.1, "volatility": 34.5, "class": "Stocks"},
+    "NVDA": {"return": 35.2, "volatility": 45.8, "class": "Stocks"},
+    "META": {"return": 25.8, "volatility": 38.4, "class": "Stocks"},
+    "INTC": {"return": 18.9, "volatility": 31.5, "class": "Stocks"},
+    "AMD": {"return": 22.4, "volatility": 42.1, "class": "Stocks"},
+    
+    # Financial Services
+    "JPM": {"return": 15.3, "volatility": 25.6, "class": "Stocks"},
+    "BAC": {"return": 12.5, "volatility": 28.3, "class": "Stocks"},
+    "WFC": {"return": 11.8, "volatility": 27.5, "class": "Stocks"},
+    "GS": {"return": 14.2, "volatility": 29.8, "class": "Stocks"},
+    "V": {"return": 19.5, "volatility": 24.3, "class": "Stocks"},
+    "MA": {"return": 20.1, "volatility": 25.6, "class": "Stocks"},
+    "PYPL": {"return": 16.8, "volatility": 38.2, "class": "Stocks"},
+    
+    # Healthcare & Pharma
+    "JNJ": {"return": 10.2, "volatility": 18.4, "class": "Stocks"},
+    "UNH": {"return": 17.6, "volatility": 22.1, "class": "Stocks"},
+    "PFE": {"return": 8.9, "volatility": 21.3, "class": "Stocks"},
+    "LLY": {"return": 14.3, "volatility": 20.2, "class": "Stocks"},
+    "ABBV": {"return": 12.7, "volatility": 19.8, "class": "Stocks"},
+    
+    # Consumer & Retail
+    "PG": {"return": 9.7, "volatility": 16.8, "class": "Stocks"},
+    "KO": {"return": 7.3, "volatility": 18.2, "class": "Stocks"},
+    "PEP": {"return": 8.5, "volatility": 17.3, "class": "Stocks"},
+    "HD": {"return": 13.2, "volatility": 21.5, "class": "Stocks"},
+    "MCD": {"return": 10.8, "volatility": 19.2, "class": "Stocks"},
+    "COST": {"return": 11.5, "volatility": 20.1, "class": "Stocks"},
+    "WMT": {"return": 9.3, "volatility": 17.8, "class": "Stocks"},
+    
+    # Energy & Utilities
+    "XOM": {"return": 8.9, "volatility": 22.4, "class": "Stocks"},
+    "CVX": {"return": 8.2, "volatility": 23.1, "class": "Stocks"},
+    "SO": {"return": 6.5, "volatility": 14.2, "class": "Stocks"},
+    
+    # Media & Entertainment
+    "NFLX": {"return": 20.3, "volatility": 42.8, "class": "Stocks"},
+    "DIS": {"return": 12.4, "volatility": 26.3, "class": "Stocks"},
+    
+    # Transportation & Other
+    "TSLA": {"return": 32.1, "volatility": 58.3, "class": "Stocks"},
+    "BA": {"return": 9.8, "volatility": 29.4, "class": "Stocks"},
+    
+    # Bonds
+    "BND": {"return": 4.2, "volatility": 6.3, "class": "Bonds"},
+    "AGG": {"return": 4.5, "volatility": 6.8, "class": "Bonds"},
+    "LQD": {"return": 5.1, "volatility": 7.4, "class": "Bonds"},
+    "TLT": {"return": 3.8, "volatility": 8.9, "class": "Bonds"},
+    "SHV": {"return": 3.2, "volatility": 2.1, "class": "Bonds"},
+    
+    # Commodities
+    "GLD": {"return": 6.5, "volatility": 14.2, "class": "Commodities"},
+    "SLV": {"return": 5.8, "volatility": 18.6, "class": "Commodities"},
+    "USO": {"return": 3.2, "volatility": 22.1, "class": "Commodities"},
+    "DBC": {"return": 2.1, "volatility": 19.8, "class": "Commodities"},
+    "UUP": {"return": 1.5, "volatility": 8.3, "class": "Commodities"},
+    
+    # Cryptocurrencies
+    "BTC": {"return": 65.3, "volatility": 78.5, "class": "Cryptocurrencies"},
+    "ETH": {"return": 58.2, "volatility": 82.3, "class": "Cryptocurrencies"},
+    "BNB": {"return": 52.1, "volatility": 88.2, "class": "Cryptocurrencies"},
+    "ADA": {"return": 45.3, "volatility": 92.4, "class": "Cryptocurrencies"},
+    "SOL": {"return": 48.9, "volatility": 95.1, "class": "Cryptocurrencies"},
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TICKER -> ASSET CLASS LOOKUP (Configured universe plus the wider app universe)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TICKER_CLASS = {ticker: cls for cls, info in ASSET_CLASSES.items() for ticker in info["assets"]}
+TICKER_CLASS.update({
+    **{ticker: "Equities" for ticker in [
+        "INTC", "AMD", "BAC", "WFC", "GS", "MA", "PYPL", "JNJ", "UNH", "PFE", "LLY", "ABBV",
+        "PG", "KO", "PEP", "HD", "MCD", "COST", "XOM", "CVX", "SO", "NFLX", "DIS", "BA",
+    ]},
+    "UUP": "Commodities",
+    "BNB": "Cryptocurrencies", "ADA": "Cryptocurrencies", "SOL": "Cryptocurrencies",
+})
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TRANSACTION COSTS (One-way, basis points of traded value)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TRANSACTION_COST_BPS = {
+    "Equities": 5,
+    "Indices": 2,
+    "Bonds": 3,
+    "Commodities": 8,
+    "Cryptocurrencies": 25,
+}
+
+DEFAULT_TRANSACTION_COST_BPS = 5
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # RISK-FREE RATE
 # ═══════════════════════════════════════════════════════════════════════════════
 
 RISK_FREE_RATE = 0.045  # 4.5% (Current US Treasury rate)
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# RANDOM SEED
+# ═══════════════════════════════════════════════════════════════════════════════
+
+RANDOM_SEED = 42  # Root seed for every simulation (see random_streams.py)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORRELATION ASSUMPTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ASSUMED_CORRELATION = 0.30  # Pairwise correlation used when no history is loaded
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MARKET CAPITALIZATION (Approximate, USD billions - fund AUM for ETFs)
+# Used as the equilibrium portfolio for Black-Litterman expected returns
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MARKET_CAPS = {
+    # Equities
+    "AAPL": 3400, "MSFT": 3100, "GOOGL": 2100, "AMZN": 2000, "NVDA": 3300,
+    "META": 1400, "INTC": 100, "AMD": 250, "TSLA": 1000, "BA": 130,
+    "JPM": 650, "BAC": 330, "WFC": 230, "GS": 170, "V": 600, "MA": 480, "PYPL": 75,
+    "JNJ": 380, "UNH": 500, "PFE": 160, "LLY": 750, "ABBV": 330,
+    "PG": 390, "KO": 300, "PEP": 210, "HD": 390, "MCD": 210, "COST": 420, "WMT": 700,
+    "XOM": 480, "CVX": 280, "SO": 95, "NFLX": 400, "DIS": 200,
+
+    # Indices
+    "SPY": 600, "QQQ": 320, "IWM": 65, "EFA": 55, "VTI": 450,
+
+    # Bonds
+    "BND": 125, "AGG": 120, "SHV": 20, "TLT": 55, "LQD": 30,
+
+    # Commodities
+    "GLD": 90, "SLV": 15, "USO": 1, "DBC": 1.5, "PDBC": 4.5, "UUP": 0.5,
+
+    # Cryptocurrencies
+    "BTC": 1800, "ETH": 400, "BNB": 90, "ADA": 25, "SOL": 90,
+}
+
+# Market risk aversion (delta) used to reverse-optimize equilibrium returns
+RISK_AVERSION = 2.5
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATA STORAGE (Local market data files shared by all sessions)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DATA_DIR = os.environ.get("PORTFOLIO_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+RETURN_STORE_PATH = os.path.join(DATA_DIR, "returns")
+RETURN_STORE_PERIODS_PER_YEAR = 252  # Daily return history
+PRICE_CACHE_DIR = os.path.join(DATA_DIR, "prices")
+MARKET_DATA_CHECK_SECONDS = 5  # How often the market data registry looks for a rewritten return store
+
+# Price download settings (bulk multi-ticker requests)
+PRICE_FETCH = {
+    "batch_size": 50,          # Tickers per download request
+    "max_workers": 8,          # Concurrent requests
+    "max_retries": 3,          # Retries per batch after the first attempt
+    "backoff_seconds": 1.0,    # Initial retry delay, doubled each retry
+    "requests_per_second": 2,  # Shared rate limit across workers
+    "cache_max_age_hours": 24, # Cached prices older than this are refetched
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STRESS SCENARIOS (Approximate peak-to-trough total returns, decimal)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Class shocks apply to every asset in the class; ticker shocks override them.
+# Crypto had no history in 2008, so its GFC shock is an assumed proxy.
+STRESS_SCENARIOS = {
+    "2008 Global Financial Crisis": {
+        "classes": {"Equities": -0.50, "Indices": -0.50, "Bonds": 0.05, "Commodities": -0.55, "Cryptocurrencies": -0.80},
+        "tickers": {"IWM": -0.55, "EFA": -0.57, "TLT": 0.25, "SHV": 0.03, "LQD": -0.10,
+                    "GLD": 0.05, "SLV": -0.25, "USO": -0.75, "JPM": -0.60, "WMT": -0.05},
+    },
+    "2020 COVID Crash": {
+        "classes": {"Equities": -0.34, "Indices": -0.34, "Bonds": -0.02, "Commodities": -0.30, "Cryptocurrencies": -0.50},
+        "tickers": {"QQQ": -0.28, "IWM": -0.41, "TLT": 0.12, "SHV": 0.005, "LQD": -0.13,
+                    "GLD": -0.03, "SLV": -0.30, "USO": -0.60, "ETH": -0.60, "AMZN": -0.10},
+    },
+    "2022 Rate Shock": {
+        "classes": {"Equities": -0.25, "Indices": -0.25, "Bonds": -0.15, "Commodities": 0.15, "Cryptocurrencies": -0.65},
+        "tickers": {"QQQ": -0.33, "TLT": -0.33, "SHV": 0.01, "LQD": -0.22, "AGG": -0.16,
+                    "GLD": -0.08, "SLV": -0.15, "USO": 0.25, "DBC": 0.20, "ETH": -0.70, "META": -0.70},
+    },
+}
+
+STRESS_TEST = {
+    "chunk_size": 10000,   # Portfolios per matrix product when streaming a book
+}
+
+STRESS_RESULTS_PATH = os.path.join(DATA_DIR, "stress")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VOLATILITY FORECASTING (GARCH / EWMA on the return store)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+VOLATILITY_FORECAST = {
+    "enabled": True,          # Replace assumed volatilities with forecasts when history is stored
+    "model": "garch",         # "garch" (GARCH(1,1)) or "ewma" (RiskMetrics)
+    "ewma_lambda": 0.94,
+    "horizon": 252,           # Forecast horizon (history periods); vols are annualized averages over it
+    "min_observations": 250,  # Assets with less history keep their assumed volatility
+    "chunk_size": 16,         # Assets per fitting job
+}
+VOLATILITY_PARAMS_PATH = os.path.join(DATA_DIR, "volatility", "params.json")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BOOTSTRAP CONFIDENCE INTERVALS (Stationary block bootstrap of the return store)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+BOOTSTRAP = {
+    "n_replicates": 2000,
+    "mean_block": 21,    # Mean block length (history periods)
+    "confidence": 0.95,
+    "batch_size": 250,   # Replicates per batch (unit of work sent to a process)
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RISK SIMULATION SCENARIOS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SCENARIO_MODELS = {
+    "normal": "Normal",
+    "student_t": "Student-t",
+    "gaussian_copula": "Gaussian Copula",
+    "t_copula": "t Copula",
+    "bootstrap": "Block Bootstrap",
+}
+
+SCENARIO_SETTINGS = {
+    "model": "student_t",
+    "dof": 5,                 # Degrees of freedom of Student-t draws and t copulas
+    "block_length": 21,       # Bootstrap block length (history periods)
+    "n_scenarios": 20000,
+    "chunk_size": 10000,
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WEALTH PROJECTION (Monte Carlo)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PROJECTION = {
+    "n_paths": 10000,               # Paths for the Results page fan chart
+    "block_size": 20000,            # Paths generated at a time (bounds memory)
+    "steps_per_year": 12,           # Monthly steps
+    "percentiles": (5, 25, 50, 75, 95),
+    "bins": 4000,                   # Log-wealth histogram bins per time step
+    "log_range": (-8.0, 8.0),       # Minimum log wealth range covered (multiples of e^-8 to e^8)
+    "range_sigmas": 8.0,            # Widened to the log drift +/- this many sigma*sqrt(years)
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EFFICIENT FRONTIER CHART (Optimize page, drawn progressively)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+FRONTIER_CHART = {
+    "n_portfolios": 5000,           # Simulated portfolios in the finished chart
+    "coarse_portfolios": 250,       # Drawn with the corner-portfolio frontier in the first frame
+    "chunk_size": 1250,             # Portfolios added per refinement frame
+    "points_per_segment": 20,       # Frontier curve points between consecutive corner portfolios
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCORING SERVICE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SCORING_SERVICE = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "workers": 4,          # Worker processes scoring chunks (1 scores in the server process)
+    "chunk_size": 32,      # Portfolios per worker task
+    "max_batch": 256,      # Portfolios coalesced into one dispatch across concurrent requests
+    "max_wait_ms": 5,      # How long the dispatcher waits to fill a batch
+    "cache_size": 10000,   # Scored portfolios kept in memory
+}
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # THEME DICTIONARY
 # ═══════════════════════════════════════════════════════════════════════════════
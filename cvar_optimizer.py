@@ -0,0 +1,171 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - CVAR OPTIMIZER
+Rockafellar-Uryasev Conditional Value-at-Risk Minimization (HiGHS LP)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+from scipy.optimize import linprog
+from random_streams import generator
+from return_store import portfolio_returns
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCENARIO SUBSAMPLING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def subsample_scenarios(scenarios, max_scenarios, seed=None):
+    """
+    Uniformly subsample scenarios to bound the LP size
+
+    Args:
+        scenarios: Scenario matrix (S x n)
+        max_scenarios: Maximum number of rows to keep
+        seed: Seed or numpy Generator
+
+    Returns:
+        Scenario matrix with at most max_scenarios rows
+    """
+    if len(scenarios) <= max_scenarios:
+        return scenarios
+    rng = generator(seed)
+    rows = rng.choice(len(scenarios), size=max_scenarios, replace=False)
+    return scenarios[np.sort(rows)]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CVAR MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def var_cvar_from_returns(portfolio_returns, alpha=0.95):
+    """
+    VaR and CVaR (as positive losses) of a series of portfolio returns
+
+    Args:
+        portfolio_returns: Historical or simulated portfolio returns (S,)
+        alpha: Confidence level
+
+    Returns:
+        Tuple of (VaR, CVaR)
+    """
+    losses = -np.asarray(portfolio_returns, dtype=float)
+    var = np.quantile(losses, alpha)
+    tail = losses[losses >= var]
+    return var, tail.mean() if len(tail) else var
+
+
+def portfolio_var_cvar(weights, scenarios, alpha=0.95):
+    """
+    Historical/simulated VaR and CVaR of a portfolio (as positive losses)
+
+    Args:
+        weights: Portfolio weights (n,)
+        scenarios: Scenario matrix (S x n)
+        alpha: Confidence level
+
+    Returns:
+        Tuple of (VaR, CVaR)
+    """
+    return var_cvar_from_returns(np.asarray(scenarios) @ np.asarray(weights, dtype=float), alpha)
+
+
+def historical_var_cvar(store, weights, alpha=0.95, start=None, end=None):
+    """
+    Historical VaR and CVaR (as positive losses) of a portfolio over a return store
+
+    Args:
+        store: ReturnStore; the asset histories are read as column views
+        weights: Dictionary with ticker: weight (fractions)
+        alpha: Confidence level
+        start, end: Optional date bounds
+
+    Returns:
+        Tuple of (VaR, CVaR)
+    """
+    return var_cvar_from_returns(portfolio_returns(store, weights, start, end), alpha)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CVAR MINIMIZATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def minimize_cvar(scenarios, alpha=0.95, expected_returns=None, target_return=None,
+                  max_weight=1.0, max_scenarios=None, seed=None):
+    """
+    Long-only portfolio minimizing CVaR over a scenario matrix
+
+    The Rockafellar-Uryasev linear program
+
+        min   zeta + 1 / ((1 - alpha) S) * sum(u_s)
+        s.t.  u_s >= -r_s'w - zeta,  u_s >= 0,  sum(w) = 1,  0 <= w <= max_weight
+              mu'w >= target_return (optional)
+
+    has one row per scenario. It is solved through its dual, which has one
+    row per asset instead, so the simplex basis stays (n x n) however many
+    scenarios there are. Weights and VaR are recovered from the dual
+    marginals reported by HiGHS.
+
+    Args:
+        scenarios: Scenario return matrix (S x n)
+        alpha: CVaR confidence level
+        expected_returns: Expected returns (n,), required with target_return
+        target_return: Optional minimum expected return
+        max_weight: Upper bound per asset
+        max_scenarios: Subsample to at most this many scenarios before solving
+        seed: Seed for the subsampling
+
+    Returns:
+        Dictionary with weights, var, cvar, status and message
+    """
+    scenarios = np.asarray(scenarios, dtype=float)
+    if max_scenarios is not None:
+        scenarios = subsample_scenarios(scenarios, max_scenarios, seed)
+    n_scenarios, n_assets = scenarios.shape
+
+    # Dual variables: [pi (S), lambda (1), kappa (return constraint), nu (upper bounds)]
+    #   max  lambda + kappa * target - max_weight * sum(nu)
+    #   s.t. R'pi + lambda + kappa * mu - nu <= 0,  sum(pi) = 1,  0 <= pi <= 1 / ((1 - alpha) S)
+    columns = [scenarios.T, np.ones((n_assets, 1))]
+    costs = [np.zeros(n_scenarios), [-1.0]]
+    bounds = [(0.0, 1.0 / ((1.0 - alpha) * n_scenarios))] * n_scenarios + [(None, None)]
+
+    if target_return is not None:
+        if expected_returns is None:
+            raise ValueError("expected_returns is required with target_return")
+        columns.append(np.asarray(expected_returns, dtype=float).reshape(-1, 1))
+        costs.append([-target_return])
+        bounds.append((0.0, None))
+
+    if max_weight < 1.0:
+        columns.append(-np.eye(n_assets))
+        costs.append(np.full(n_assets, max_weight))
+        bounds += [(0.0, None)] * n_assets
+
+    A_ub = np.hstack(columns)
+    c = np.concatenate(costs)
+    A_eq = np.zeros((1, len(c)))
+    A_eq[0, :n_scenarios] = 1.0
+
+    result = linprog(c, A_ub=A_ub, b_ub=np.zeros(n_assets), A_eq=A_eq, b_eq=[1.0],
+                     bounds=bounds, method="highs")
+
+    if result.status != 0:
+        # An unbounded dual means the primal constraints cannot all be met
+        message = "Target return or weight limits cannot be met" if result.status == 3 else result.message
+        return {
+            "weights": None,
+            "var": None,
+            "cvar": None,
+            "status": result.status,
+            "message": message,
+        }
+
+    # Primal solution from the dual marginals
+    weights = np.clip(-result.ineqlin.marginals, 0.0, None)
+    weights /= weights.sum()
+    return {
+        "weights": weights,
+        "var": -result.eqlin.marginals[0],
+        "cvar": -result.fun,
+        "status": result.status,
+        "message": result.message,
+    }
@@ -0,0 +1,192 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - FACTOR RISK MODEL
+Covariance as B F B' + D without Forming the Dense Matrix
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+from config_enhanced import ASSUMED_CORRELATION
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FACTOR RISK MODEL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class FactorRiskModel:
+    """
+    Factor covariance model Sigma = B F B' + diag(D)
+
+    Every product with Sigma costs O(nk) instead of O(n^2), and the dense
+    matrix is only built on request. The model supports ``model @ w`` and
+    ``w @ model`` so code written against a covariance matrix (variance
+    w @ cov @ w, gradient cov @ w) can take a model unchanged.
+
+    Args:
+        exposures: Factor exposures B (n x k)
+        factor_cov: Factor covariance F (k x k)
+        specific_var: Specific (idiosyncratic) variances D (n,)
+        assets: Optional list of asset tickers
+    """
+
+    # Make numpy defer ``ndarray @ model`` to __rmatmul__
+    __array_ufunc__ = None
+
+    def __init__(self, exposures, factor_cov, specific_var, assets=None):
+        self.exposures = np.atleast_2d(np.asarray(exposures, dtype=float))
+        self.factor_cov = np.atleast_2d(np.asarray(factor_cov, dtype=float))
+        self.specific_var = np.asarray(specific_var, dtype=float)
+        self.assets = list(assets) if assets is not None else None
+
+        n, k = self.exposures.shape
+        if self.factor_cov.shape != (k, k) or self.specific_var.shape != (n,):
+            raise ValueError("Inconsistent factor model dimensions")
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # CONSTRUCTORS
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @classmethod
+    def constant_correlation(cls, volatilities, correlation=ASSUMED_CORRELATION, assets=None):
+        """
+        Exact one-factor form of the constant-correlation covariance
+
+        rho * s s' + diag((1 - rho) s^2) equals the covariance with unit
+        diagonal correlation and every off-diagonal equal to rho. It is
+        positive definite for -1/(n-1) < rho < 1; a negative rho is carried
+        by a factor variance of -1 on exposures sqrt(|rho|) s.
+        """
+        vols = np.asarray(volatilities, dtype=float)
+        n = len(vols)
+        lower = -1.0 / (n - 1) if n > 1 else -np.inf
+        if not lower < correlation < 1.0:
+            raise ValueError(f"Constant correlation must be in ({lower:.4g}, 1) for {n} assets, got {correlation}")
+        return cls(
+            exposures=(np.sqrt(abs(correlation)) * vols)[:, None],
+            factor_cov=[[np.sign(correlation) or 1.0]],
+            specific_var=(1.0 - correlation) * vols ** 2,
+            assets=assets,
+        )
+
+    @classmethod
+    def from_pca(cls, returns, n_factors=3, assets=None):
+        """
+        Statistical factor model from the leading principal components of returns
+
+        Args:
+            returns: Return matrix (T x n)
+            n_factors: Number of principal components (k)
+            assets: Optional list of asset tickers
+
+        Returns:
+            FactorRiskModel whose diagonal matches the sample variances
+        """
+        returns = np.asarray(returns, dtype=float)
+        centered = returns - returns.mean(axis=0)
+        n_obs = len(centered)
+
+        # Thin SVD: right singular vectors are the covariance eigenvectors
+        _, singular_values, vt = np.linalg.svd(centered, full_matrices=False)
+        k = min(n_factors, len(singular_values))
+        exposures = vt[:k].T
+        factor_var = singular_values[:k] ** 2 / (n_obs - 1)
+
+        sample_var = centered.var(axis=0, ddof=1)
+        systematic_var = (exposures ** 2) @ factor_var
+        return cls(exposures, np.diag(factor_var), np.maximum(sample_var - systematic_var, 0.0), assets=assets)
+
+    @classmethod
+    def from_exposures(cls, exposures, factor_returns, residual_returns, assets=None):
+        """
+        Fundamental factor model from user-supplied exposures
+
+        Args:
+            exposures: Factor exposures B (n x k)
+            factor_returns: Factor return history (T x k)
+            residual_returns: Residual return history (T x n)
+            assets: Optional list of asset tickers
+        """
+        factor_cov = np.atleast_2d(np.cov(np.asarray(factor_returns, dtype=float), rowvar=False))
+        specific_var = np.asarray(residual_returns, dtype=float).var(axis=0, ddof=1)
+        return cls(exposures, factor_cov, specific_var, assets=assets)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # PRODUCTS WITH SIGMA (O(nk))
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @property
+    def shape(self):
+        n = len(self.specific_var)
+        return (n, n)
+
+    def factor_exposure(self, weights):
+        """Portfolio factor exposures B'w (k,) or (m x k) for a batch of portfolios"""
+        return np.asarray(weights, dtype=float) @ self.exposures
+
+    def __matmul__(self, weights):
+        weights = np.asarray(weights, dtype=float)
+        if weights.ndim == 1:
+            return self.exposures @ (self.factor_cov @ (self.exposures.T @ weights)) + self.specific_var * weights
+        # (n x m) block of column vectors
+        return self.exposures @ (self.factor_cov @ (self.exposures.T @ weights)) + self.specific_var[:, None] * weights
+
+    def __rmatmul__(self, weights):
+        # Sigma is symmetric, so w' Sigma = (Sigma w)'
+        weights = np.asarray(weights, dtype=float)
+        return (self @ weights.T).T
+
+    def column(self, index):
+        """Column i of Sigma in O(nk), for rank-one updates when one weight changes"""
+        column = self.exposures @ (self.factor_cov @ self.exposures[index])
+        column[index] += self.specific_var[index]
+        return column
+
+    def portfolio_variance(self, weights):
+        """
+        Portfolio variance w' Sigma w
+
+        Args:
+            weights: Weights (n,) or a batch of portfolios (m x n)
+
+        Returns:
+            Variance (float) or array of variances (m,)
+        """
+        weights = np.asarray(weights, dtype=float)
+        exposure = self.factor_exposure(weights)
+        systematic = np.einsum("...i,ij,...j->...", exposure, self.factor_cov, exposure)
+        return systematic + (weights ** 2) @ self.specific_var
+
+    def portfolio_volatility(self, weights):
+        """Portfolio volatility; accepts (n,) or (m x n) weights"""
+        return np.sqrt(np.maximum(self.portfolio_variance(weights), 0.0))
+
+    def variance_gradient(self, weights):
+        """Gradient of the portfolio variance, 2 Sigma w"""
+        return 2.0 * (self @ weights)
+
+    def marginal_risk(self, weights):
+        """Marginal contribution to volatility, Sigma w / sigma_p"""
+        sigma_w = self @ weights
+        vol = np.sqrt(max(float(np.asarray(weights, dtype=float) @ sigma_w), 0.0))
+        return sigma_w / vol if vol > 0 else np.zeros_like(sigma_w)
+
+    def risk_contributions(self, weights):
+        """Fraction of portfolio variance contributed by each asset"""
+        weights = np.asarray(weights, dtype=float)
+        contributions = weights * (self @ weights)
+        total = contributions.sum()
+        return contributions / total if total > 0 else contributions
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # DENSE VIEW AND SUBSETS
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def covariance(self):
+        """Dense covariance matrix (n x n); O(n^2) memory, use sparingly"""
+        return self.exposures @ self.factor_cov @ self.exposures.T + np.diag(self.specific_var)
+
+    def subset(self, indices):
+        """Model restricted to the given asset indices"""
+        indices = np.asarray(indices)
+        assets = [self.assets[i] for i in indices] if self.assets is not None else None
+        return FactorRiskModel(self.exposures[indices], self.factor_cov, self.specific_var[indices], assets=assets)
@@ -0,0 +1,121 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - HIERARCHICAL RISK PARITY
+Lopez de Prado HRP Allocation with Cached Clustering
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+from risk_model import covariance_fingerprint, LRUCache
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLUSTERING CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_cluster_cache = LRUCache(maxsize=64)
+
+
+def _correlation_from_covariance(cov):
+    """Convert a covariance matrix to a correlation matrix"""
+    vols = np.sqrt(np.diag(cov))
+    corr = cov / np.outer(vols, vols)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def cluster_assets(cov, method="single"):
+    """
+    Linkage tree and quasi-diagonal ordering of the assets
+
+    Results are cached per covariance fingerprint so repeated solves on the
+    same covariance skip the clustering step.
+
+    Args:
+        cov: Covariance matrix (n x n)
+        method: SciPy linkage method ("single", "average", "complete", "ward")
+
+    Returns:
+        Tuple of (linkage matrix, ordering as an array of asset indices)
+    """
+    key = (covariance_fingerprint(cov), method)
+
+    cached = _cluster_cache.get(key)
+    if cached is not None:
+        return cached
+
+    corr = _correlation_from_covariance(np.asarray(cov, dtype=float))
+    distance = np.sqrt(np.clip(0.5 * (1.0 - corr), 0.0, None))
+    np.fill_diagonal(distance, 0.0)
+
+    link = linkage(squareform(distance, checks=False), method=method)
+    order = leaves_list(link)
+
+    _cluster_cache.put(key, (link, order))
+
+    return link, order
+
+
+def clear_cluster_cache():
+    """Drop all cached linkage trees"""
+    _cluster_cache.clear()
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RECURSIVE BISECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _cluster_variance(cov, diag, items):
+    """Variance of the inverse-variance portfolio of a cluster"""
+    ivp = 1.0 / diag[items]
+    ivp /= ivp.sum()
+    return ivp @ cov[np.ix_(items, items)] @ ivp
+
+
+def hierarchical_risk_parity(cov, method="single"):
+    """
+    Hierarchical Risk Parity weights
+
+    The covariance matrix is never inverted: weights are split top-down
+    between the two halves of each cluster in proportion to their
+    inverse-variance risk, following the quasi-diagonal ordering.
+
+    Args:
+        cov: Covariance matrix (n x n)
+        method: SciPy linkage method used for the clustering
+
+    Returns:
+        Dictionary with weights (in the original asset order) and the ordering
+    """
+    cov = np.asarray(cov, dtype=float)
+    if cov.shape[0] < 2:
+        # Nothing to cluster: a single asset holds everything
+        return {"weights": np.ones(cov.shape[0]), "order": np.arange(cov.shape[0])}
+
+    diag = np.diag(cov)
+    _, order = cluster_assets(cov, method=method)
+
+    weights = np.ones(len(order))
+    clusters = [order]
+
+    while clusters:
+        next_clusters = []
+        for items in clusters:
+            if len(items) < 2:
+                continue
+            half = len(items) // 2
+            left, right = items[:half], items[half:]
+
+            left_var = _cluster_variance(cov, diag, left)
+            right_var = _cluster_variance(cov, diag, right)
+            alpha = 1.0 - left_var / (left_var + right_var)
+
+            weights[left] *= alpha
+            weights[right] *= 1.0 - alpha
+            next_clusters.extend([left, right])
+        clusters = next_clusters
+
+    return {
+        "weights": weights / weights.sum(),
+        "order": order,
+    }
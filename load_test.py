@@ -0,0 +1,140 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - SCORING SERVICE LOAD TEST
+Latency Percentiles and Throughput for the Batch Scoring Service
+═══════════════════════════════════════════════════════════════════════════════
+
+Against a running service:
+    python load_test.py --url http://127.0.0.1:8765 --requests 500 --concurrency 16
+
+Self-contained (starts a local service first):
+    python load_test.py --local --workers 4
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config_enhanced import ASSET_STATS
+from scoring_service import create_server
+from random_streams import generator
+
+
+def make_payloads(n_requests, batch_size, objective=None, repeat_fraction=0.2, seed=0):
+    """
+    Random request bodies of batch_size portfolios each
+
+    A share of the portfolios repeats earlier ones, as real callers
+    re-score the same books, which exercises the result cache.
+    """
+    rng = generator(seed, "load_test")
+    tickers = sorted(ASSET_STATS)
+    seen = []
+    payloads = []
+    for _ in range(n_requests):
+        portfolios = []
+        for _ in range(batch_size):
+            if seen and rng.random() < repeat_fraction:
+                portfolios.append(seen[rng.integers(len(seen))])
+                continue
+            assets = rng.choice(tickers, size=rng.integers(2, 7), replace=False)
+            weights = np.round(rng.dirichlet(np.ones(len(assets))) * 100, 2)
+            portfolio = {"weights": dict(zip(assets.tolist(), weights.tolist()))}
+            if objective:
+                portfolio["objective"] = objective
+            seen.append(portfolio)
+            portfolios.append(portfolio)
+        payloads.append(json.dumps({"portfolios": portfolios}).encode())
+    return payloads
+
+
+def _post(url, body):
+    request = urllib.request.Request(f"{url}/score", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+        ok = response.status == 200
+    return time.perf_counter() - start, ok
+
+
+def run_load_test(url, payloads, concurrency):
+    """
+    Send all payloads with `concurrency` client threads
+
+    Returns:
+        Dictionary with latency percentiles (ms), throughput and error count
+    """
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(body):
+        nonlocal errors
+        try:
+            elapsed, ok = _post(url, body)
+        except Exception:
+            elapsed, ok = None, False
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, payloads))
+    wall = time.perf_counter() - start
+
+    portfolios = sum(len(json.loads(body)["portfolios"]) for body in payloads)
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(payloads),
+        "errors": errors,
+        "p50_ms": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else float("nan"),
+        "p99_ms": float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else float("nan"),
+        "requests_per_second": len(latencies) / wall,
+        "portfolios_per_second": portfolios / wall,
+        "seconds": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the scoring service")
+    parser.add_argument("--url", default=None, help="Service URL (omit with --local)")
+    parser.add_argument("--local", action="store_true", help="Start a local service on a free port")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes for --local")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=8, help="Portfolios per request")
+    parser.add_argument("--objective", default=None, help="Also optimize with this objective")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.local or url is None:
+        server = create_server(port=0, workers=args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        # Warm-up: start worker processes before timing
+        run_load_test(url, make_payloads(args.concurrency, 1, args.objective, seed=1), args.concurrency)
+        report = run_load_test(url, make_payloads(args.requests, args.batch_size, args.objective), args.concurrency)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            server.batcher.service.close()
+
+    print(f"Requests:     {report['requests']} ({report['errors']} errors) in {report['seconds']:.2f}s")
+    print(f"Latency p50:  {report['p50_ms']:.1f} ms")
+    print(f"Latency p99:  {report['p99_ms']:.1f} ms")
+    print(f"Throughput:   {report['requests_per_second']:.1f} req/s, {report['portfolios_per_second']:.1f} portfolios/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - MARKET DATA REGISTRY
+Process-Wide, Read-Only, Versioned Market Data Shared by All Sessions
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import os
+import threading
+import time
+from types import MappingProxyType
+import numpy as np
+from config_enhanced import ASSET_ASSUMPTIONS, MARKET_DATA_CHECK_SECONDS, RETURN_STORE_PATH, VOLATILITY_FORECAST
+from risk_model import build_covariance_matrix
+from return_store import INDEX_FILE, open_return_store
+from volatility_forecast import forecast_volatilities
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _read_only(array):
+    array = np.array(array, dtype=float)
+    array.setflags(write=False)
+    return array
+
+
+class MarketSnapshot:
+    """
+    Immutable market data for one version of the universe
+
+    Expected returns and volatilities are decimals; asset_data keeps the
+    pages' percent units. All arrays are read-only, so one snapshot can be
+    handed to every session without copying.
+
+    Args:
+        version: Monotonic version number
+        asset_data: {ticker: {"return": %, "volatility": %, ...}}
+        covariance: Optional covariance (n x n, decimals); defaults to the
+            assumed constant correlation
+        returns: Optional ReturnStore with the return histories
+    """
+
+    __slots__ = ("version", "assets", "index", "asset_data", "mu", "volatility", "covariance", "returns")
+
+    def __init__(self, version, asset_data, covariance=None, returns=None):
+        self.version = version
+        self.assets = tuple(asset_data)
+        self.index = MappingProxyType({asset: i for i, asset in enumerate(self.assets)})
+        self.asset_data = MappingProxyType({asset: MappingProxyType(dict(data)) for asset, data in asset_data.items()})
+        self.mu = _read_only([asset_data[asset]["return"] / 100 for asset in self.assets])
+        self.volatility = _read_only([asset_data[asset]["volatility"] / 100 for asset in self.assets])
+        self.covariance = _read_only(build_covariance_matrix(self.volatility) if covariance is None else covariance)
+        self.returns = returns
+
+    def subset(self, assets):
+        """Expected returns and covariance for the given assets (small copies)"""
+        idx = [self.index[asset] for asset in assets]
+        return self.mu[idx], self.covariance[np.ix_(idx, idx)]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REGISTRY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class MarketDataRegistry:
+    """
+    Holder of the current MarketSnapshot
+
+    Readers take a reference to the current snapshot and keep using it for
+    the whole rerun; a refresh builds the next snapshot off to the side and
+    swaps a single reference, so a reader never sees a half-updated mix of
+    old and new data.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._published = False
+        self._checked = float("-inf")   # time.monotonic() of the last look at the return store
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _default_is_stale(self):
+        # The default snapshot follows the return store: a rewrite maps a new store handle
+        return self._snapshot is None or (not self._published and _default_return_store() is not self._snapshot.returns)
+
+    def current(self):
+        """
+        Current snapshot
+
+        Until something is published, this is the static assumptions with
+        volatilities forecast from the return store (when one exists); it is
+        rebuilt when the store is rewritten. The store is looked at no more
+        than once every MARKET_DATA_CHECK_SECONDS. The rebuild (which may fit
+        forecasts in a process pool) runs in one thread without the registry
+        lock, while the others keep reading the previous snapshot.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and (self._published or time.monotonic() - self._checked < MARKET_DATA_CHECK_SECONDS):
+            return snapshot
+        # Only the first snapshot is worth waiting for
+        if not self._build_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            if self._default_is_stale():
+                store = _default_return_store()
+                asset_data = _default_asset_data(store)
+                with self._lock:
+                    if not self._published:
+                        version = (self._snapshot.version if self._snapshot is not None else 0) + 1
+                        self._snapshot = MarketSnapshot(version, asset_data, returns=store)
+            self._checked = time.monotonic()
+        finally:
+            self._build_lock.release()
+        return self._snapshot
+
+    def publish(self, asset_data, covariance=None, returns=None):
+        """
+        Build a new snapshot and atomically make it current
+
+        Returns:
+            The new MarketSnapshot
+        """
+        with self._lock:
+            version = (self._snapshot.version if self._snapshot is not None else 0) + 1
+            snapshot = MarketSnapshot(version, asset_data, covariance=covariance, returns=returns)
+            self._snapshot = snapshot
+            self._published = True
+        return snapshot
+
+    @property
+    def version(self):
+        return self.current().version
+
+
+def _default_return_store():
+    """Return store at the configured location, if one has been written"""
+    if os.path.exists(os.path.join(RETURN_STORE_PATH, INDEX_FILE)):
+        return open_return_store(RETURN_STORE_PATH)
+    return None
+
+
+def _default_asset_data(store):
+    """
+    ASSET_ASSUMPTIONS with forecast volatilities where the store has enough history
+
+    The assumed volatility is kept as "assumed_volatility". Covariances are
+    built from "volatility", so every page picks the forecasts up.
+    """
+    if store is None or not VOLATILITY_FORECAST["enabled"]:
+        return ASSET_ASSUMPTIONS
+    forecasts = forecast_volatilities(store, list(ASSET_ASSUMPTIONS))
+    return {
+        asset: {**data, "volatility": forecasts[asset] * 100, "assumed_volatility": data["volatility"]}
+        if asset in forecasts else data
+        for asset, data in ASSET_ASSUMPTIONS.items()
+    }
+
+
+# Module state is process-wide: every Streamlit session in the server
+# process imports this module once and shares the same registry.
+_registry = MarketDataRegistry()
+
+
+def get_registry():
+    """The process-wide market data registry"""
+    return _registry
+
+
+def session_asset_data():
+    """
+    Per-rerun ASSET_DATA dictionary for a page
+
+    Only the outer dictionary is copied, so a page can swap entries
+    (e.g. Black-Litterman estimates) without touching the shared snapshot;
+    the per-asset entries themselves are shared and read-only.
+    """
+    return dict(_registry.current().asset_data)
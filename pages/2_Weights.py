@@ -13,6 +13,10 @@ Prof. V. Ravichandran
 import streamlit as st
 import pandas as pd
 from config_enhanced import PAGE_CONFIG
+from market_data import session_asset_data
+from factor_model import FactorRiskModel
+from portfolio_state import sync_portfolio_state
+from portfolio import Portfolio
 from styles_enhanced import apply_main_styles, render_header, render_footer
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -148,7 +152,7 @@ st.markdown("""
 
 # Initialize weights in session state if not already done
 if "asset_weights_adjusted" not in st.session_state or len(st.session_state.asset_weights_adjusted) == 0:
-    st.session_state.asset_weights_adjusted = {asset: value for asset, value in st.session_state.selected_assets.items()}
+    st.session_state.asset_weights_adjusted = Portfolio.from_dict(st.session_state.selected_assets)
 
 # Track if weights have been validated and saved
 if "weights_validated" not in st.session_state:
@@ -253,10 +257,8 @@ with col2:
 
 with col3:
     if st.button("🔄 Reset to Equal", help="Reset all weights to equal distribution", use_container_width=True):
-        equal_weight = 1.0 / num_assets
         # Update session state with equal weights
-        for asset in selected_assets_list:
-            st.session_state.asset_weights_adjusted[asset] = equal_weight
+        st.session_state.asset_weights_adjusted = Portfolio.equal_weight(selected_assets_list)
         st.session_state.weights_validated = False  # Reset validation flag
         st.rerun()
 
@@ -264,20 +266,76 @@ with col4:
     if st.button("📋 Auto-Normalize", help="Automatically adjust to 100%", use_container_width=True):
         if total_weight > 0:
             # Normalize weights to sum to exactly 100%
-            for asset in selected_assets_list:
-                normalized_weight = weights[asset] / total_weight
-                st.session_state.asset_weights_adjusted[asset] = normalized_weight
+            normalized_weights = [weights[asset] / total_weight for asset in selected_assets_list]
             
             # Adjust last asset to ensure exactly 1.0 (100%) to handle floating point rounding
-            remaining = 1.0 - sum(list(st.session_state.asset_weights_adjusted.values())[:-1])
             if len(selected_assets_list) > 0:
-                st.session_state.asset_weights_adjusted[selected_assets_list[-1]] = remaining
+                normalized_weights[-1] = 1.0 - sum(normalized_weights[:-1])
+            st.session_state.asset_weights_adjusted = Portfolio(selected_assets_list, normalized_weights)
             
             st.session_state.weights_validated = True
             st.rerun()
         else:
             st.error("❌ Cannot normalize - all weights are 0. Please enter values first.")
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# LIVE PORTFOLIO METRICS (incremental: each edited weight is an O(n) update)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ASSET_DATA = session_asset_data()
+risk_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+
+if risk_assets:
+    risk_free_rate = st.session_state.get("risk_free_rate", 4.5)
+    market_key = tuple((ASSET_DATA[asset]["return"], ASSET_DATA[asset]["volatility"]) for asset in risk_assets)
+    portfolio_state = sync_portfolio_state(
+        st.session_state.get("portfolio_state"),
+        risk_assets,
+        [ASSET_DATA[asset]["return"] for asset in risk_assets],
+        FactorRiskModel.constant_correlation([ASSET_DATA[asset]["volatility"] for asset in risk_assets]),
+        weights,
+        key=market_key,
+    )
+    st.session_state.portfolio_state = portfolio_state
+
+    st.markdown("""
+        <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+            <h2 style='color: #FFD700; margin-top: 0;'>📈 LIVE PORTFOLIO METRICS</h2>
+            <p style='color: #90EE90; margin: 0.5rem 0 0 0;'>Updated as you type, based on the weights entered above</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    contributions = portfolio_state.risk_contributions()
+    live_col1, live_col2, live_col3, live_col4 = st.columns(4)
+
+    with live_col1:
+        st.metric("📈 Expected Return", f"{portfolio_state.expected_return:.2f}%")
+
+    with live_col2:
+        st.metric("📊 Volatility", f"{portfolio_state.volatility:.2f}%")
+
+    with live_col3:
+        st.metric("⚡ Sharpe Ratio", f"{portfolio_state.sharpe_ratio(risk_free_rate):.3f}")
+
+    with live_col4:
+        top = int(contributions.argmax())
+        st.metric("🎯 Largest Risk Share", f"{risk_assets[top]} ({contributions[top] * 100:.1f}%)")
+
+    live_risk = pd.DataFrame({
+        "Asset": risk_assets,
+        "Weight %": portfolio_state.weights * 100,
+        "Risk Contribution %": contributions * 100,
+    })
+    st.dataframe(
+        live_risk,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Weight %": st.column_config.NumberColumn("Weight %", format="%.2f%%"),
+            "Risk Contribution %": st.column_config.NumberColumn("Risk Contribution %", format="%.2f%%"),
+        }
+    )
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # WEIGHTS SUMMARY TABLE
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -362,8 +420,9 @@ else:
         for asset in selected_assets_list:
             weights[asset] = weights[asset] + adjustment
     
-    st.session_state.selected_assets = weights
-    st.session_state.asset_weights_adjusted = weights
+    # One immutable portfolio shared by both keys
+    st.session_state.selected_assets = Portfolio.from_dict(weights)
+    st.session_state.asset_weights_adjusted = st.session_state.selected_assets
     st.session_state.weights_validated = True  # Mark as validated
     
     # Recalculate with corrected weights
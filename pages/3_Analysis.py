@@ -14,6 +14,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from config_enhanced import PAGE_CONFIG
+from market_data import session_asset_data
+from factor_model import FactorRiskModel
+from portfolio_state import sync_portfolio_state
+from risk_attribution import risk_attribution, aggregate_by_class
 from styles_enhanced import apply_main_styles, render_header, render_footer
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -105,76 +109,8 @@ if "investment_period" not in st.session_state:
 # ASSET DATA - Historical Returns & Volatility (Annualized %)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-ASSET_DATA = {
-    # Tech Giants
-    "AAPL": {"return": 28.5, "volatility": 32.1, "class": "Stocks"},
-    "MSFT": {"return": 26.3, "volatility": 28.9, "class": "Stocks"},
-    "GOOGL": {"return": 24.7, "volatility": 30.2, "class": "Stocks"},
-    "AMZN": {"return": 22.1, "volatility": 34.5, "class": "Stocks"},
-    "NVDA": {"return": 35.2, "volatility": 45.8, "class": "Stocks"},
-    "META": {"return": 25.8, "volatility": 38.4, "class": "Stocks"},
-    "INTC": {"return": 18.9, "volatility": 31.5, "class": "Stocks"},
-    "AMD": {"return": 22.4, "volatility": 42.1, "class": "Stocks"},
-    
-    # Financial Services
-    "JPM": {"return": 15.3, "volatility": 25.6, "class": "Stocks"},
-    "BAC": {"return": 12.5, "volatility": 28.3, "class": "Stocks"},
-    "WFC": {"return": 11.8, "volatility": 27.5, "class": "Stocks"},
-    "GS": {"return": 14.2, "volatility": 29.8, "class": "Stocks"},
-    "V": {"return": 19.5, "volatility": 24.3, "class": "Stocks"},
-    "MA": {"return": 20.1, "volatility": 25.6, "class": "Stocks"},
-    "PYPL": {"return": 16.8, "volatility": 38.2, "class": "Stocks"},
-    
-    # Healthcare & Pharma
-    "JNJ": {"return": 10.2, "volatility": 18.4, "class": "Stocks"},
-    "UNH": {"return": 17.6, "volatility": 22.1, "class": "Stocks"},
-    "PFE": {"return": 8.9, "volatility": 21.3, "class": "Stocks"},
-    "LLY": {"return": 14.3, "volatility": 20.2, "class": "Stocks"},
-    "ABBV": {"return": 12.7, "volatility": 19.8, "class": "Stocks"},
-    
-    # Consumer & Retail
-    "PG": {"return": 9.7, "volatility": 16.8, "class": "Stocks"},
-    "KO": {"return": 7.3, "volatility": 18.2, "class": "Stocks"},
-    "PEP": {"return": 8.5, "volatility": 17.3, "class": "Stocks"},
-    "HD": {"return": 13.2, "volatility": 21.5, "class": "Stocks"},
-    "MCD": {"return": 10.8, "volatility": 19.2, "class": "Stocks"},
-    "COST": {"return": 11.5, "volatility": 20.1, "class": "Stocks"},
-    "WMT": {"return": 9.3, "volatility": 17.8, "class": "Stocks"},
-    
-    # Energy & Utilities
-    "XOM": {"return": 8.9, "volatility": 22.4, "class": "Stocks"},
-    "CVX": {"return": 8.2, "volatility": 23.1, "class": "Stocks"},
-    "SO": {"return": 6.5, "volatility": 14.2, "class": "Stocks"},
-    
-    # Media & Entertainment
-    "NFLX": {"return": 20.3, "volatility": 42.8, "class": "Stocks"},
-    "DIS": {"return": 12.4, "volatility": 26.3, "class": "Stocks"},
-    
-    # Transportation & Other
-    "TSLA": {"return": 32.1, "volatility": 58.3, "class": "Stocks"},
-    "BA": {"return": 9.8, "volatility": 29.4, "class": "Stocks"},
-    
-    # Bonds
-    "BND": {"return": 4.2, "volatility": 6.3, "class": "Bonds"},
-    "AGG": {"return": 4.5, "volatility": 6.8, "class": "Bonds"},
-    "LQD": {"return": 5.1, "volatility": 7.4, "class": "Bonds"},
-    "TLT": {"return": 3.8, "volatility": 8.9, "class": "Bonds"},
-    "SHV": {"return": 3.2, "volatility": 2.1, "class": "Bonds"},
-    
-    # Commodities
-    "GLD": {"return": 6.5, "volatility": 14.2, "class": "Commodities"},
-    "SLV": {"return": 5.8, "volatility": 18.6, "class": "Commodities"},
-    "USO": {"return": 3.2, "volatility": 22.1, "class": "Commodities"},
-    "DBC": {"return": 2.1, "volatility": 19.8, "class": "Commodities"},
-    "UUP": {"return": 1.5, "volatility": 8.3, "class": "Commodities"},
-    
-    # Cryptocurrencies
-    "BTC": {"return": 65.3, "volatility": 78.5, "class": "Cryptocurrencies"},
-    "ETH": {"return": 58.2, "volatility": 82.3, "class": "Cryptocurrencies"},
-    "BNB": {"return": 52.1, "volatility": 88.2, "class": "Cryptocurrencies"},
-    "ADA": {"return": 45.3, "volatility": 92.4, "class": "Cryptocurrencies"},
-    "SOL": {"return": 48.9, "volatility": 95.1, "class": "Cryptocurrencies"},
-}
+# Shared, read-only market data; each rerun gets its own top-level dict
+ASSET_DATA = session_asset_data()
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PAGE TITLE
@@ -201,23 +137,26 @@ weights = list(st.session_state.selected_assets.values())
 
 # Calculate portfolio metrics
 portfolio_return = 0
-portfolio_variance = 0
 
 for i, asset in enumerate(selected_assets_list):
     if asset in ASSET_DATA:
         portfolio_return += weights[i] * ASSET_DATA[asset]["return"]
 
-# Simplified volatility calculation (assumes correlation of 0.3)
-for i, asset_i in enumerate(selected_assets_list):
-    if asset_i in ASSET_DATA:
-        portfolio_variance += (weights[i] ** 2) * (ASSET_DATA[asset_i]["volatility"] ** 2)
-
-# Add cross-product terms with correlation
-for i, asset_i in enumerate(selected_assets_list):
-    for j, asset_j in enumerate(selected_assets_list):
-        if i < j and asset_i in ASSET_DATA and asset_j in ASSET_DATA:
-            correlation = 0.3  # Assumed correlation
-            portfolio_variance += 2 * weights[i] * weights[j] * ASSET_DATA[asset_i]["volatility"] * ASSET_DATA[asset_j]["volatility"] * correlation
+# Volatility under the assumed correlation, via its one-factor form (O(n), no pairwise loop)
+risk_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+factor_risk = FactorRiskModel.constant_correlation([ASSET_DATA[asset]["volatility"] for asset in risk_assets])
+
+# Reuse the Weights page's incremental state: only weights changed since then are updated
+portfolio_state = sync_portfolio_state(
+    st.session_state.get("portfolio_state"),
+    risk_assets,
+    [ASSET_DATA[asset]["return"] for asset in risk_assets],
+    factor_risk,
+    st.session_state.selected_assets,
+    key=tuple((ASSET_DATA[asset]["return"], ASSET_DATA[asset]["volatility"]) for asset in risk_assets),
+)
+st.session_state.portfolio_state = portfolio_state
+portfolio_variance = portfolio_state.variance
 
 portfolio_volatility = np.sqrt(portfolio_variance)
 
@@ -341,6 +280,61 @@ st.dataframe(
     }
 )
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# RISK ATTRIBUTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+st.markdown("""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🧩 RISK ATTRIBUTION</h2>
+        <p style='color: white;'>Where the portfolio's risk comes from (95% parametric VaR/CVaR, 1 year)</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+risk_weights = np.array([st.session_state.selected_assets[asset] for asset in risk_assets])
+attribution = risk_attribution(risk_weights, factor_risk,
+                               expected_returns=[ASSET_DATA[asset]["return"] for asset in risk_assets])
+
+df_risk = pd.DataFrame({
+    "Asset": risk_assets,
+    "Weight": risk_weights * 100,
+    "Marginal Risk": attribution["marginal_risk"],
+    "% of Risk": attribution["percent_risk"] * 100,
+    "Component VaR": attribution["component_var"],
+    "Component CVaR": attribution["component_cvar"],
+})
+
+risk_col1, risk_col2 = st.columns([3, 2])
+
+with risk_col1:
+    st.dataframe(
+        df_risk,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Asset": st.column_config.TextColumn("Asset", width="small"),
+            "Weight": st.column_config.NumberColumn("Weight", format="%.1f%%"),
+            "Marginal Risk": st.column_config.NumberColumn("Marginal Risk", format="%.2f%%"),
+            "% of Risk": st.column_config.NumberColumn("% of Risk", format="%.1f%%"),
+            "Component VaR": st.column_config.NumberColumn("Component VaR", format="%.2f%%"),
+            "Component CVaR": st.column_config.NumberColumn("Component CVaR", format="%.2f%%"),
+        }
+    )
+
+with risk_col2:
+    df_class_risk = aggregate_by_class(attribution["percent_risk"] * 100, risk_assets)
+    df_class_risk.columns = ["% of Risk"]
+    st.dataframe(
+        df_class_risk,
+        use_container_width=True,
+        column_config={"% of Risk": st.column_config.NumberColumn("% of Risk", format="%.1f%%")}
+    )
+    st.info(f"""
+    **Portfolio VaR (95%):** {attribution['var']:.2f}%
+    
+    **Portfolio CVaR (95%):** {attribution['cvar']:.2f}%
+    """)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PORTFOLIO VISUALIZATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -11,7 +11,11 @@ Prof. V. Ravichandran
 """
 
 import streamlit as st
-from config_enhanced import PAGE_CONFIG
+import pandas as pd
+from config_enhanced import PAGE_CONFIG, SCENARIO_MODELS, SCENARIO_SETTINGS
+from market_data import get_registry
+from rebalancing import transaction_cost_table
+from scenarios import history_returns
 from styles_enhanced import apply_main_styles, render_header, render_footer
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -96,6 +100,26 @@ if "selected_assets" not in st.session_state:
     st.session_state.selected_assets = {}
 if "optimization_objective" not in st.session_state:
     st.session_state.optimization_objective = "Maximize Sharpe Ratio"
+if "use_black_litterman" not in st.session_state:
+    st.session_state.use_black_litterman = False
+if "bl_views" not in st.session_state:
+    st.session_state.bl_views = []
+if "bl_tau" not in st.session_state:
+    st.session_state.bl_tau = 0.05
+if "max_turnover" not in st.session_state:
+    st.session_state.max_turnover = 0.25
+if "turnover_penalty_bps" not in st.session_state:
+    st.session_state.turnover_penalty_bps = 0.0
+if "transaction_costs" not in st.session_state:
+    st.session_state.transaction_costs = {}
+if "max_holdings" not in st.session_state:
+    st.session_state.max_holdings = 3
+if "min_lot" not in st.session_state:
+    st.session_state.min_lot = 0.05
+if "scenario_model" not in st.session_state:
+    st.session_state.scenario_model = SCENARIO_SETTINGS["model"]
+if "scenario_dof" not in st.session_state:
+    st.session_state.scenario_dof = SCENARIO_SETTINGS["dof"]
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PAGE TITLE
@@ -131,6 +155,12 @@ objective = st.radio(
         "Maximize Sharpe Ratio",
         "Minimize Risk",
         "Maximize Return",
+        "Risk Parity",
+        "Hierarchical Risk Parity",
+        "Minimize CVaR",
+        "Cost-Aware Rebalance",
+        "Cardinality Constrained",
+        "Resampled Efficient Frontier",
         "Equal Weight"
     ],
     index=0,
@@ -180,6 +210,66 @@ elif objective == "Maximize Return":
         </div>
         """, unsafe_allow_html=True)
     
+elif objective == "Risk Parity":
+    st.markdown("""
+        <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
+            <h3 style='color: #FFD700; margin-top: 0;'>🧮 Risk Parity (Equal Risk Contribution)</h3>
+            <p style='color: white;'><strong>Diversified</strong></p>
+            <p style='color: #90EE90;'>Every asset contributes the same share of portfolio risk</p>
+            <p style='color: white; font-size: 0.9rem;'>This strategy sizes positions so that each asset adds an equal amount to total portfolio volatility, taking correlations into account. Volatile assets get smaller weights, diversifiers get larger ones.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+elif objective == "Hierarchical Risk Parity":
+    st.markdown("""
+        <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
+            <h3 style='color: #FFD700; margin-top: 0;'>🌳 Hierarchical Risk Parity (HRP)</h3>
+            <p style='color: white;'><strong>Robust</strong></p>
+            <p style='color: #90EE90;'>Cluster-based diversification</p>
+            <p style='color: white; font-size: 0.9rem;'>This strategy groups assets into a tree by correlation and splits capital between clusters according to their risk. It never inverts the covariance matrix, so it stays stable for very large universes.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+elif objective == "Minimize CVaR":
+    st.markdown("""
+        <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
+            <h3 style='color: #FFD700; margin-top: 0;'>📉 Minimize CVaR (Expected Shortfall)</h3>
+            <p style='color: white;'><strong>Tail-Risk Protection</strong></p>
+            <p style='color: #90EE90;'>Smallest average loss in the worst 5% of outcomes</p>
+            <p style='color: white; font-size: 0.9rem;'>This strategy simulates thousands of market scenarios and finds the portfolio whose average loss in the worst 5% of them is lowest. It targets crash risk directly rather than overall volatility.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+elif objective == "Cost-Aware Rebalance":
+    st.markdown("""
+        <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
+            <h3 style='color: #FFD700; margin-top: 0;'>🔁 Cost-Aware Rebalance</h3>
+            <p style='color: white;'><strong>Executable</strong></p>
+            <p style='color: #90EE90;'>Best risk-return trade-off after trading costs</p>
+            <p style='color: white; font-size: 0.9rem;'>This strategy starts from your current weights and only trades where the expected improvement outweighs the transaction cost. A turnover limit caps how much of the portfolio changes hands, so the proposal can be executed as a realistic rebalance.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+elif objective == "Cardinality Constrained":
+    st.markdown("""
+        <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
+            <h3 style='color: #FFD700; margin-top: 0;'>🎲 Cardinality Constrained</h3>
+            <p style='color: white;'><strong>Concentrated</strong></p>
+            <p style='color: #90EE90;'>Best K holdings with minimum position sizes</p>
+            <p style='color: white; font-size: 0.9rem;'>This strategy searches for the best mean-variance portfolio that holds at most K of your assets, each at least a minimum lot. It suits mandates that cap the number of holdings and avoids tiny, uneconomic positions.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+elif objective == "Resampled Efficient Frontier":
+    st.markdown("""
+        <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
+            <h3 style='color: #FFD700; margin-top: 0;'>🎰 Resampled Efficient Frontier (Michaud)</h3>
+            <p style='color: white;'><strong>Estimation-Robust</strong></p>
+            <p style='color: #90EE90;'>Averages optimal weights over hundreds of simulated histories</p>
+            <p style='color: white; font-size: 0.9rem;'>Return and risk estimates are uncertain. This strategy re-estimates them from hundreds of simulated 5-year histories, optimizes each one and averages the weights, giving steadier allocations and a confidence band on every weight.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
 else:  # Equal Weight
     st.markdown("""
         <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem;'>
@@ -190,6 +280,185 @@ else:  # Equal Weight
         </div>
         """, unsafe_allow_html=True)
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# REBALANCING CONSTRAINTS (COST-AWARE REBALANCE ONLY)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+if objective == "Cost-Aware Rebalance":
+    st.markdown("""
+        <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+            <h2 style='color: #FFD700; margin-top: 0;'>🔁 REBALANCING CONSTRAINTS</h2>
+            <p style='color: white;'>Limit turnover and set one-way trading costs per asset:</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    rebal_col1, rebal_col2 = st.columns(2)
+    with rebal_col1:
+        max_turnover_pct = st.slider(
+            "Maximum turnover (% of portfolio traded)",
+            min_value=0,
+            max_value=100,
+            value=int(round(st.session_state.max_turnover * 100)),
+            step=5,
+            help="One-way turnover: the total weight bought (equal to the total weight sold)"
+        )
+        st.session_state.max_turnover = max_turnover_pct / 100
+    with rebal_col2:
+        st.session_state.turnover_penalty_bps = st.number_input(
+            "Extra turnover penalty (bps per trade)",
+            min_value=0.0,
+            max_value=500.0,
+            value=float(st.session_state.turnover_penalty_bps),
+            step=5.0,
+            help="Added on top of transaction costs to discourage small trades"
+        )
+
+    rebal_assets = list(st.session_state.selected_assets.keys())
+    cost_table = transaction_cost_table(rebal_assets, st.session_state.transaction_costs)
+    cost_df = st.data_editor(
+        pd.DataFrame({
+            "Asset": rebal_assets,
+            "Cost (bps)": [cost_table[asset] for asset in rebal_assets],
+        }),
+        disabled=["Asset"],
+        hide_index=True,
+        use_container_width=True,
+        key="transaction_cost_editor"
+    )
+    st.session_state.transaction_costs = dict(zip(cost_df["Asset"], cost_df["Cost (bps)"].astype(float)))
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HOLDINGS CONSTRAINTS (CARDINALITY CONSTRAINED ONLY)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+if objective == "Cardinality Constrained":
+    st.markdown("""
+        <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+            <h2 style='color: #FFD700; margin-top: 0;'>🎲 HOLDINGS CONSTRAINTS</h2>
+            <p style='color: white;'>Cap the number of holdings and set a minimum position size:</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    num_selected = len(st.session_state.selected_assets)
+    card_col1, card_col2 = st.columns(2)
+    with card_col1:
+        st.session_state.max_holdings = st.slider(
+            "Maximum number of holdings (K)",
+            min_value=1,
+            max_value=num_selected,
+            value=min(st.session_state.max_holdings, num_selected)
+        )
+    with card_col2:
+        min_lot_pct = st.slider(
+            "Minimum position size (%)",
+            min_value=0,
+            max_value=100 // st.session_state.max_holdings,
+            value=min(int(round(st.session_state.min_lot * 100)), 100 // st.session_state.max_holdings),
+            step=1
+        )
+        st.session_state.min_lot = min_lot_pct / 100
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EXPECTED RETURNS - BLACK-LITTERMAN VIEWS (OPTIONAL)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+st.markdown("""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🔭 EXPECTED RETURNS (BLACK-LITTERMAN)</h2>
+        <p style='color: white;'>Blend market equilibrium returns with your own views (optional):</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+use_bl = st.checkbox(
+    "Use Black-Litterman expected returns",
+    value=st.session_state.use_black_litterman,
+    help="Start from market-cap implied equilibrium returns and tilt them toward your views"
+)
+st.session_state.use_black_litterman = use_bl
+
+if use_bl:
+    st.session_state.bl_tau = st.slider(
+        "τ (uncertainty in equilibrium returns)",
+        min_value=0.01,
+        max_value=0.50,
+        value=st.session_state.bl_tau,
+        step=0.01
+    )
+
+    viewed_assets = st.multiselect(
+        "Assets you have a view on",
+        list(st.session_state.selected_assets.keys()),
+        default=[
+            asset for view in st.session_state.bl_views for asset in view["weights"]
+            if asset in st.session_state.selected_assets
+        ]
+    )
+
+    previous_views = {next(iter(view["weights"])): view for view in st.session_state.bl_views}
+    bl_views = []
+    for asset in viewed_assets:
+        previous = previous_views.get(asset, {"return": 0.10, "confidence": 0.5})
+        view_col1, view_col2 = st.columns(2)
+        with view_col1:
+            view_return = st.number_input(
+                f"{asset} expected return (%)",
+                min_value=-100.0,
+                max_value=300.0,
+                value=round(previous["return"] * 100, 2),
+                step=0.5,
+                key=f"bl_view_return_{asset}"
+            )
+        with view_col2:
+            view_confidence = st.slider(
+                f"{asset} confidence",
+                min_value=0.05,
+                max_value=1.0,
+                value=float(previous["confidence"]),
+                step=0.05,
+                key=f"bl_view_confidence_{asset}"
+            )
+        bl_views.append({"weights": {asset: 1.0}, "return": view_return / 100, "confidence": view_confidence})
+
+    st.session_state.bl_views = bl_views
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RISK SIMULATION MODEL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+st.markdown("""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🎲 RISK SIMULATION MODEL</h2>
+        <p style='color: white;'>Return distribution behind simulated VaR, CVaR and wealth projections:</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+# The bootstrap resamples history, so it is only offered when every selected asset has one
+scenario_models = list(SCENARIO_MODELS)
+if history_returns(get_registry().current().returns, list(st.session_state.selected_assets)) is None:
+    scenario_models.remove("bootstrap")
+if st.session_state.scenario_model not in scenario_models:
+    st.session_state.scenario_model = SCENARIO_SETTINGS["model"]
+
+sim_col1, sim_col2 = st.columns(2)
+with sim_col1:
+    st.session_state.scenario_model = st.selectbox(
+        "Return distribution",
+        scenario_models,
+        index=scenario_models.index(st.session_state.scenario_model),
+        format_func=SCENARIO_MODELS.get,
+        help="Student-t and t copula scenarios have fat tails and joint crashes; "
+             "the bootstrap resamples blocks of the stored return history"
+    )
+with sim_col2:
+    if st.session_state.scenario_model in ("student_t", "t_copula"):
+        st.session_state.scenario_dof = st.slider(
+            "Degrees of freedom (lower = fatter tails)",
+            min_value=3,
+            max_value=30,
+            value=int(st.session_state.scenario_dof),
+            step=1
+        )
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # OBJECTIVES COMPARISON TABLE
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -230,6 +499,42 @@ comparison_html = """
                 <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Aggressive</td>
                 <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>High</td>
             </tr>
+            <tr style='background-color: #004d80;'>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>🧮 Risk Parity</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Equal Risk Contribution</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Diversified Mandates</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Low-Moderate</td>
+            </tr>
+            <tr style='background-color: #003366;'>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>🌳 Hierarchical Risk Parity</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Cluster Diversification</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Broad Universes</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Low-Moderate</td>
+            </tr>
+            <tr style='background-color: #004d80;'>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>📉 Minimize CVaR</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Tail Loss</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Pension / Liability-Driven</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Low</td>
+            </tr>
+            <tr style='background-color: #003366;'>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>🔁 Cost-Aware Rebalance</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Utility Net of Costs</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Existing Portfolios</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Near Current</td>
+            </tr>
+            <tr style='background-color: #004d80;'>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>🎲 Cardinality Constrained</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Best K Holdings</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Capped Mandates</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Moderate-High</td>
+            </tr>
+            <tr style='background-color: #003366;'>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>🎰 Resampled Frontier</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Estimation Robustness</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Long-Term Allocation</td>
+                <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Moderate</td>
+            </tr>
             <tr style='background-color: #004d80;'>
                 <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>⚖️ Equal Weight</td>
                 <td style='padding: 0.75rem; border: 1px solid rgba(255,215,0,0.3);'>Simple Benchmark</td>
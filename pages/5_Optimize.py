@@ -14,7 +14,21 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from config_enhanced import PAGE_CONFIG
+from config_enhanced import PAGE_CONFIG, RANDOM_SEED, SCENARIO_SETTINGS, FRONTIER_CHART
+from market_data import get_registry, session_asset_data
+from risk_model import build_covariance_matrix
+from risk_parity import equal_risk_contribution
+from hierarchical_risk_parity import hierarchical_risk_parity
+from black_litterman import black_litterman, market_cap_weights
+from cvar_optimizer import minimize_cvar, portfolio_var_cvar
+from rebalancing import transaction_cost_table, optimize_rebalance
+from cardinality import cardinality_constrained
+from resampling import resampled_weights
+from factor_model import FactorRiskModel
+from universe_artifacts import load_universe_artifacts
+from portfolio import Portfolio
+from random_streams import generator, seed_sequence
+from scenarios import ScenarioGenerator, simulate_scenarios, history_returns
 from styles_enhanced import apply_main_styles, render_header, render_footer
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -111,60 +125,15 @@ if "optimization_objective" not in st.session_state:
     st.session_state.optimization_objective = "Maximize Sharpe Ratio"
 if "run_optimization" not in st.session_state:
     st.session_state.run_optimization = False
+if "risk_contributions" not in st.session_state:
+    st.session_state.risk_contributions = {}
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ASSET DATA
 # ═══════════════════════════════════════════════════════════════════════════════
 
-ASSET_DATA = {
-    # Tech Giants
-    "AAPL": {"return": 28.5, "volatility": 32.1}, "MSFT": {"return": 26.3, "volatility": 28.9},
-    "GOOGL": {"return": 24.7, "volatility": 30.2}, "AMZN": {"return": 22.1, "volatility": 34.5},
-    "NVDA": {"return": 35.2, "volatility": 45.8}, "META": {"return": 25.8, "volatility": 38.4},
-    "INTC": {"return": 18.9, "volatility": 31.5}, "AMD": {"return": 22.4, "volatility": 42.1},
-    
-    # Financial Services
-    "JPM": {"return": 15.3, "volatility": 25.6}, "BAC": {"return": 12.5, "volatility": 28.3},
-    "WFC": {"return": 11.8, "volatility": 27.5}, "GS": {"return": 14.2, "volatility": 29.8},
-    "V": {"return": 19.5, "volatility": 24.3}, "MA": {"return": 20.1, "volatility": 25.6},
-    "PYPL": {"return": 16.8, "volatility": 38.2},
-    
-    # Healthcare & Pharma
-    "JNJ": {"return": 10.2, "volatility": 18.4}, "UNH": {"return": 17.6, "volatility": 22.1},
-    "PFE": {"return": 8.9, "volatility": 21.3}, "LLY": {"return": 14.3, "volatility": 20.2},
-    "ABBV": {"return": 12.7, "volatility": 19.8},
-    
-    # Consumer & Retail
-    "PG": {"return": 9.7, "volatility": 16.8}, "KO": {"return": 7.3, "volatility": 18.2},
-    "PEP": {"return": 8.5, "volatility": 17.3}, "HD": {"return": 13.2, "volatility": 21.5},
-    "MCD": {"return": 10.8, "volatility": 19.2}, "COST": {"return": 11.5, "volatility": 20.1},
-    "WMT": {"return": 9.3, "volatility": 17.8},
-    
-    # Energy & Utilities
-    "XOM": {"return": 8.9, "volatility": 22.4}, "CVX": {"return": 8.2, "volatility": 23.1},
-    "SO": {"return": 6.5, "volatility": 14.2},
-    
-    # Media & Entertainment
-    "NFLX": {"return": 20.3, "volatility": 42.8}, "DIS": {"return": 12.4, "volatility": 26.3},
-    
-    # Transportation & Other
-    "TSLA": {"return": 32.1, "volatility": 58.3}, "BA": {"return": 9.8, "volatility": 29.4},
-    
-    # Bonds
-    "BND": {"return": 4.2, "volatility": 6.3}, "AGG": {"return": 4.5, "volatility": 6.8},
-    "LQD": {"return": 5.1, "volatility": 7.4}, "TLT": {"return": 3.8, "volatility": 8.9},
-    "SHV": {"return": 3.2, "volatility": 2.1},
-    
-    # Commodities
-    "GLD": {"return": 6.5, "volatility": 14.2}, "SLV": {"return": 5.8, "volatility": 18.6},
-    "USO": {"return": 3.2, "volatility": 22.1}, "DBC": {"return": 2.1, "volatility": 19.8},
-    "UUP": {"return": 1.5, "volatility": 8.3},
-    
-    # Cryptocurrencies
-    "BTC": {"return": 65.3, "volatility": 78.5}, "ETH": {"return": 58.2, "volatility": 82.3},
-    "BNB": {"return": 52.1, "volatility": 88.2}, "ADA": {"return": 45.3, "volatility": 92.4},
-    "SOL": {"return": 48.9, "volatility": 95.1},
-}
+# Shared, read-only market data; each rerun gets its own top-level dict
+ASSET_DATA = session_asset_data()
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PAGE TITLE
@@ -182,6 +151,33 @@ if not st.session_state.selected_assets:
     st.error("⚠️ No assets selected! Please go back and select assets first.")
     st.stop()
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# BLACK-LITTERMAN EXPECTED RETURNS (OPTIONAL)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Replace the static return/volatility estimates of the selected assets with
+# the Black-Litterman posterior so every branch and metric below uses them
+if st.session_state.get("use_black_litterman", False):
+    bl_assets = [asset for asset in st.session_state.selected_assets if asset in ASSET_DATA]
+    bl_cov = build_covariance_matrix([ASSET_DATA[asset]["volatility"] / 100 for asset in bl_assets])
+    bl_rf = st.session_state.risk_free_rate / 100
+    
+    # Views are entered as total returns; the model works in excess returns
+    bl_views = [
+        {**view, "return": view["return"] - bl_rf}
+        for view in st.session_state.get("bl_views", [])
+        if all(asset in bl_assets for asset in view["weights"])
+    ]
+    bl_market = market_cap_weights(bl_assets, [st.session_state.selected_assets[asset] for asset in bl_assets])
+    bl_result = black_litterman(bl_assets, bl_cov, market_weights=bl_market, views=bl_views,
+                                tau=st.session_state.get("bl_tau", 0.05))
+    
+    st.session_state.bl_asset_data = {
+        asset: {"return": (mu + bl_rf) * 100, "volatility": np.sqrt(var) * 100}
+        for asset, mu, var in zip(bl_assets, bl_result["posterior_returns"], np.diag(bl_result["posterior_covariance"]))
+    }
+    ASSET_DATA.update(st.session_state.bl_asset_data)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # OPTIMIZATION EXECUTION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -196,6 +192,8 @@ col1, col2, col3 = st.columns(3)
 
 with col1:
     st.metric("📊 Objective", st.session_state.optimization_objective)
+    if st.session_state.get("use_black_litterman", False):
+        st.caption("🔭 Expected returns: Black-Litterman posterior")
 
 with col2:
     st.metric("🎯 Assets", len(st.session_state.selected_assets))
@@ -232,55 +230,168 @@ if st.session_state.get("run_optimization", False):
     selected_assets_list = list(st.session_state.selected_assets.keys())
     current_weights = list(st.session_state.selected_assets.values())
 
+    # One-factor form of the assumed-correlation covariance: O(n) portfolio volatility
+    risk_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+    factor_risk = FactorRiskModel.constant_correlation([ASSET_DATA[asset]["volatility"] for asset in risk_assets])
+
+    # Per-asset Sharpe ratios, inverse volatilities and return ranking as vectors
+    risk_mu = np.array([ASSET_DATA[asset]["return"] for asset in risk_assets], dtype=float)
+    risk_vols = np.array([ASSET_DATA[asset]["volatility"] for asset in risk_assets], dtype=float)
+    asset_sharpes = np.divide(risk_mu - st.session_state.risk_free_rate, risk_vols,
+                              out=np.zeros_like(risk_mu), where=risk_vols > 0)
+    inverse_vols = np.divide(1.0, risk_vols, out=np.zeros_like(risk_vols), where=risk_vols > 0)
+
+    # Annual return scenarios from the chosen model, shared by the CVaR optimizer and the VaR analysis
+    scenario_history = history_returns(get_registry().current().returns, risk_assets)
+    scenario_model = st.session_state.get("scenario_model", SCENARIO_SETTINGS["model"])
+    if scenario_model == "bootstrap" and scenario_history is None:
+        scenario_model = SCENARIO_SETTINGS["model"]
+    scenario_generator = ScenarioGenerator(
+        scenario_model,
+        [ASSET_DATA[asset]["return"] / 100 for asset in risk_assets],
+        factor_risk.covariance() / 10000,
+        dof=st.session_state.get("scenario_dof", SCENARIO_SETTINGS["dof"]),
+        history=scenario_history,
+    )
+    risk_scenarios = simulate_scenarios(scenario_generator)
+
     # Calculate metrics for current portfolio
     current_return = sum(current_weights[i] * ASSET_DATA[asset]["return"] 
                          for i, asset in enumerate(selected_assets_list) if asset in ASSET_DATA)
-    current_vol = np.sqrt(sum((current_weights[i] ** 2) * (ASSET_DATA[asset]["volatility"] ** 2) 
-                               for i, asset in enumerate(selected_assets_list) if asset in ASSET_DATA))
+    current_vol = factor_risk.portfolio_volatility([st.session_state.selected_assets[asset] for asset in risk_assets])
     current_sharpe = (current_return - st.session_state.risk_free_rate) / current_vol if current_vol > 0 else 0
 
     # Optimization
     if st.session_state.optimization_objective == "Maximize Sharpe Ratio":
         # Allocate more to high sharpe ratio assets
-        sharpe_ratios = {}
-        for asset in selected_assets_list:
-            if asset in ASSET_DATA:
-                sharpe = (ASSET_DATA[asset]["return"] - st.session_state.risk_free_rate) / ASSET_DATA[asset]["volatility"]
-                sharpe_ratios[asset] = max(sharpe, 0)
+        sharpe_ratios = dict(zip(risk_assets, np.maximum(asset_sharpes, 0)))
         
         total_sharpe = sum(sharpe_ratios.values())
         if total_sharpe > 0:
-            optimized_weights = {asset: sharpe_ratios[asset] / total_sharpe for asset in selected_assets_list}
+            optimized_weights = {asset: sharpe_ratios.get(asset, 0.0) / total_sharpe for asset in selected_assets_list}
         else:
             optimized_weights = {asset: 1.0 / len(selected_assets_list) for asset in selected_assets_list}
 
     elif st.session_state.optimization_objective == "Minimize Risk":
         # Allocate inversely to volatility
-        inv_vols = {}
-        for asset in selected_assets_list:
-            if asset in ASSET_DATA:
-                inv_vols[asset] = 1.0 / ASSET_DATA[asset]["volatility"]
+        inv_vols = dict(zip(risk_assets, inverse_vols))
         
         total_inv_vol = sum(inv_vols.values())
-        optimized_weights = {asset: inv_vols[asset] / total_inv_vol for asset in selected_assets_list}
+        optimized_weights = {asset: inv_vols.get(asset, 0.0) / total_inv_vol for asset in selected_assets_list}
 
     elif st.session_state.optimization_objective == "Maximize Return":
         # Allocate 100% to highest return asset
-        max_asset = max(selected_assets_list, 
-                        key=lambda x: ASSET_DATA[x]["return"] if x in ASSET_DATA else 0)
+        max_asset = risk_assets[int(np.argmax(risk_mu))] if risk_assets else selected_assets_list[0]
         optimized_weights = {asset: (1.0 if asset == max_asset else 0.0) for asset in selected_assets_list}
 
+    elif st.session_state.optimization_objective == "Risk Parity":
+        # Equalize each asset's contribution to portfolio risk (correlation-aware)
+        rp_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+        rp_cov = build_covariance_matrix([ASSET_DATA[asset]["volatility"] for asset in rp_assets])
+        
+        # Warm start from the previous risk parity solution when the universe is unchanged
+        previous = st.session_state.risk_contributions
+        x0 = [st.session_state.optimized_weights.get(asset, 0.0) for asset in rp_assets] if set(previous) == set(rp_assets) else None
+        
+        rp_result = equal_risk_contribution(rp_cov, x0=x0)
+        optimized_weights = {asset: 0.0 for asset in selected_assets_list}
+        optimized_weights.update(zip(rp_assets, rp_result["weights"]))
+        st.session_state.risk_contributions = dict(zip(rp_assets, rp_result["risk_contributions"]))
+
+    elif st.session_state.optimization_objective == "Hierarchical Risk Parity":
+        # Cluster by correlation, then split capital top-down by cluster risk
+        hrp_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+        hrp_cov = build_covariance_matrix([ASSET_DATA[asset]["volatility"] for asset in hrp_assets])
+        hrp_result = hierarchical_risk_parity(hrp_cov)
+        optimized_weights = {asset: 0.0 for asset in selected_assets_list}
+        optimized_weights.update(zip(hrp_assets, hrp_result["weights"]))
+
+    elif st.session_state.optimization_objective == "Minimize CVaR":
+        # Rockafellar-Uryasev LP over simulated annual return scenarios
+        cvar_assets = risk_assets
+        cvar_scenarios = risk_scenarios
+        
+        cvar_result = minimize_cvar(cvar_scenarios, alpha=0.95, max_scenarios=5000,
+                                    seed=generator(RANDOM_SEED, "cvar_subsample"))
+        if cvar_result["weights"] is None:
+            st.error(f"⚠️ CVaR optimization failed: {cvar_result['message']}")
+            st.stop()
+        
+        optimized_weights = {asset: 0.0 for asset in selected_assets_list}
+        optimized_weights.update(zip(cvar_assets, cvar_result["weights"]))
+        
+        # Report both portfolios on the full scenario set
+        current_cvar_weights = [st.session_state.selected_assets.get(asset, 0.0) for asset in cvar_assets]
+        st.session_state.cvar_summary = {
+            "current": portfolio_var_cvar(current_cvar_weights, cvar_scenarios, alpha=0.95),
+            "optimized": portfolio_var_cvar(cvar_result["weights"], cvar_scenarios, alpha=0.95),
+        }
+
+    elif st.session_state.optimization_objective == "Cost-Aware Rebalance":
+        # Mean-variance QP on trades from the current holdings, net of costs
+        rebal_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+        rebal_mu = [ASSET_DATA[asset]["return"] / 100 for asset in rebal_assets]
+        rebal_cov = build_covariance_matrix([ASSET_DATA[asset]["volatility"] / 100 for asset in rebal_assets])
+        rebal_costs = transaction_cost_table(rebal_assets, st.session_state.get("transaction_costs", {}))
+        
+        rebal_result = optimize_rebalance(
+            [st.session_state.selected_assets[asset] for asset in rebal_assets],
+            rebal_mu,
+            rebal_cov,
+            costs_bps=[rebal_costs[asset] for asset in rebal_assets],
+            turnover_penalty=st.session_state.get("turnover_penalty_bps", 0.0) / 10_000,
+            max_turnover=st.session_state.get("max_turnover", 0.25),
+        )
+        optimized_weights = {asset: 0.0 for asset in selected_assets_list}
+        optimized_weights.update(zip(rebal_assets, rebal_result["weights"]))
+        st.session_state.rebalance_summary = {
+            "turnover": rebal_result["turnover"],
+            "cost": rebal_result["cost"],
+            "trades": dict(zip(rebal_assets, rebal_result["buys"] - rebal_result["sells"])),
+        }
+
+    elif st.session_state.optimization_objective == "Cardinality Constrained":
+        # Best K holdings with minimum lots (greedy selection + swap search, time-limited)
+        card_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+        card_mu = [ASSET_DATA[asset]["return"] / 100 for asset in card_assets]
+        card_cov = build_covariance_matrix([ASSET_DATA[asset]["volatility"] / 100 for asset in card_assets])
+        
+        card_result = cardinality_constrained(
+            card_mu,
+            card_cov,
+            st.session_state.get("max_holdings", len(card_assets)),
+            min_weight=st.session_state.get("min_lot", 0.0),
+            lot_size=0.01,
+            time_limit=2.0,
+        )
+        optimized_weights = {asset: 0.0 for asset in selected_assets_list}
+        optimized_weights.update(zip(card_assets, card_result["weights"]))
+
+    elif st.session_state.optimization_objective == "Resampled Efficient Frontier":
+        # Average mean-variance weights over resampled estimates (process pool)
+        rs_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+        rs_mu = [ASSET_DATA[asset]["return"] / 100 for asset in rs_assets]
+        rs_cov = build_covariance_matrix([ASSET_DATA[asset]["volatility"] / 100 for asset in rs_assets])
+        
+        with st.spinner("Solving 500 resampled optimizations..."):
+            rs_result = resampled_weights(rs_mu, rs_cov, n_resamples=500,
+                                          seed=seed_sequence(RANDOM_SEED, "resampled_frontier"))
+        optimized_weights = {asset: 0.0 for asset in selected_assets_list}
+        optimized_weights.update(zip(rs_assets, rs_result["weights"]))
+        st.session_state.weight_bands = {
+            asset: (lower, upper) for asset, lower, upper in zip(rs_assets, rs_result["lower"], rs_result["upper"])
+        }
+
     else:  # Equal Weight
         optimized_weights = {asset: 1.0 / len(selected_assets_list) for asset in selected_assets_list}
 
     # Calculate optimized metrics
     opt_return = sum(optimized_weights[asset] * ASSET_DATA[asset]["return"] 
                      for asset in selected_assets_list if asset in ASSET_DATA)
-    opt_vol = np.sqrt(sum((optimized_weights[asset] ** 2) * (ASSET_DATA[asset]["volatility"] ** 2) 
-                           for asset in selected_assets_list if asset in ASSET_DATA))
+    opt_vol = factor_risk.portfolio_volatility([optimized_weights[asset] for asset in risk_assets])
     opt_sharpe = (opt_return - st.session_state.risk_free_rate) / opt_vol if opt_vol > 0 else 0
 
-    st.session_state.optimized_weights = optimized_weights
+    st.session_state.optimized_weights = Portfolio.from_dict(optimized_weights)
 
     # Display success message
     st.success("""
@@ -325,6 +436,83 @@ if st.session_state.get("run_optimization", False):
             delta=f"{opt_sharpe - current_sharpe:.3f}"
         )
 
+    # ═══════════════════════════════════════════════════════════════════════════════
+    # RISK CONTRIBUTIONS (RISK PARITY ONLY)
+    # ═══════════════════════════════════════════════════════════════════════════════
+
+    if st.session_state.optimization_objective == "Risk Parity":
+        st.markdown("""
+            <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+                <h2 style='color: #FFD700; margin-top: 0;'>🧮 RISK CONTRIBUTIONS</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        rc_df = pd.DataFrame({
+            "Asset": list(st.session_state.risk_contributions.keys()),
+            "Weight": [f"{optimized_weights[asset]*100:.2f}%" for asset in st.session_state.risk_contributions],
+            "Risk Contribution": [f"{rc*100:.2f}%" for rc in st.session_state.risk_contributions.values()],
+        })
+        st.dataframe(rc_df, use_container_width=True, hide_index=True)
+
+    # ═══════════════════════════════════════════════════════════════════════════════
+    # CONDITIONAL VALUE AT RISK (CVAR ONLY)
+    # ═══════════════════════════════════════════════════════════════════════════════
+
+    if st.session_state.optimization_objective == "Minimize CVaR":
+        st.markdown("""
+            <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+                <h2 style='color: #FFD700; margin-top: 0;'>📉 CONDITIONAL VALUE AT RISK (CVaR @ 95%)</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        current_sim_var, current_cvar = st.session_state.cvar_summary["current"]
+        opt_sim_var, opt_cvar = st.session_state.cvar_summary["optimized"]
+
+        cvar_col1, cvar_col2, cvar_col3 = st.columns(3)
+
+        with cvar_col1:
+            st.metric("Optimized Portfolio CVaR", f"-{opt_cvar*100:.2f}%",
+                      delta=f"Avg loss in worst 5% of years", delta_color="off")
+
+        with cvar_col2:
+            st.metric("Current Portfolio CVaR", f"-{current_cvar*100:.2f}%",
+                      delta=f"Avg loss in worst 5% of years", delta_color="off")
+
+        with cvar_col3:
+            st.metric("Simulated VaR (Optimized)", f"-{opt_sim_var*100:.2f}%",
+                      delta=f"{(opt_sim_var - current_sim_var)*100:+.2f}% vs current", delta_color="inverse")
+
+    # ═══════════════════════════════════════════════════════════════════════════════
+    # REBALANCING TRADES (COST-AWARE REBALANCE ONLY)
+    # ═══════════════════════════════════════════════════════════════════════════════
+
+    if st.session_state.optimization_objective == "Cost-Aware Rebalance":
+        st.markdown("""
+            <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+                <h2 style='color: #FFD700; margin-top: 0;'>🔁 REBALANCING TRADES</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        rebal_summary = st.session_state.rebalance_summary
+
+        rebal_col1, rebal_col2 = st.columns(2)
+
+        with rebal_col1:
+            st.metric("Turnover", f"{rebal_summary['turnover']*100:.2f}%",
+                      delta=f"Limit {st.session_state.get('max_turnover', 0.25)*100:.0f}%", delta_color="off")
+
+        with rebal_col2:
+            st.metric("Estimated Trading Cost", f"{rebal_summary['cost']*10_000:.1f} bps",
+                      delta="Of portfolio value", delta_color="off")
+
+        trades_df = pd.DataFrame({
+            "Asset": list(rebal_summary["trades"].keys()),
+            "Current": [f"{st.session_state.selected_assets[asset]*100:.2f}%" for asset in rebal_summary["trades"]],
+            "Target": [f"{optimized_weights[asset]*100:.2f}%" for asset in rebal_summary["trades"]],
+            "Trade": [f"{trade*100:+.2f}%" if abs(trade) >= 1e-4 else "Hold" for trade in rebal_summary["trades"].values()],
+        })
+        st.dataframe(trades_df, use_container_width=True, hide_index=True)
+
     # ═══════════════════════════════════════════════════════════════════════════════
     # VALUE AT RISK (VAR) ANALYSIS - 95% CONFIDENCE LEVEL
     # ═══════════════════════════════════════════════════════════════════════════════
@@ -335,13 +523,13 @@ if st.session_state.get("run_optimization", False):
         </div>
         """, unsafe_allow_html=True)
 
-    # VAR calculation at 95% confidence level
-    # Z-score for 95% confidence level (one-tailed) = 1.645
-    z_score_95 = 1.645
-    
-    # Calculate VAR for optimized portfolio
-    opt_var_95 = opt_vol * z_score_95
-    current_var_95 = current_vol * z_score_95
+    # VAR at 95% confidence level from the simulated annual return scenarios
+    current_sim_returns = risk_scenarios @ np.array([st.session_state.selected_assets[asset] for asset in risk_assets]) * 100
+    opt_sim_returns = risk_scenarios @ np.array([optimized_weights[asset] for asset in risk_assets]) * 100
+    current_var_95 = -np.percentile(current_sim_returns, 5)
+    opt_var_95 = -np.percentile(opt_sim_returns, 5)
+    st.caption(f"🎲 Simulated with the {scenario_generator.label} model "
+               f"({len(risk_scenarios):,} annual scenarios)")
     
     # VAR improvement (lower VAR is better)
     var_improvement = ((current_var_95 - opt_var_95) / current_var_95 * 100) if current_var_95 != 0 else 0
@@ -442,31 +630,36 @@ if st.session_state.get("run_optimization", False):
     var_viz_col1, var_viz_col2 = st.columns(2)
     
     # ═════════════════════════════════════════════════════════════════════════════
-    # VISUALIZATION 1: NORMAL DISTRIBUTION WITH VAR THRESHOLD
+    # VISUALIZATION 1: SIMULATED RETURN DISTRIBUTION WITH VAR THRESHOLD
     # ═════════════════════════════════════════════════════════════════════════════
     
     with var_viz_col1:
         fig_dist, ax_dist = plt.subplots(figsize=(10, 6))
         
-        # Generate normal distribution data
-        x = np.linspace(-6, 4, 1000)
-        y = (1/np.sqrt(2*np.pi)) * np.exp(-0.5*x**2)
+        # Simulated distribution of the optimized portfolio's annual return
+        lo, hi = np.percentile(opt_sim_returns, [0.1, 99.9])
+        counts, edges = np.histogram(opt_sim_returns, bins=80, range=(lo, hi), density=True)
+        centers = (edges[:-1] + edges[1:]) / 2
+        ax_dist.fill_between(centers, counts, step='mid', alpha=0.3, color='#FFD700')
+        ax_dist.step(centers, counts, where='mid', color='#FFD700', linewidth=2.5,
+                     label=f'Simulated ({scenario_generator.label})')
         
-        # Plot normal distribution
-        ax_dist.plot(x, y, color='#FFD700', linewidth=2.5, label='Normal Distribution')
-        ax_dist.fill_between(x, y, alpha=0.3, color='#FFD700')
+        # Normal density with the same mean and volatility, for comparison
+        x = np.linspace(lo, hi, 400)
+        sim_mean, sim_std = opt_sim_returns.mean(), opt_sim_returns.std()
+        y = np.exp(-0.5 * ((x - sim_mean) / sim_std) ** 2) / (sim_std * np.sqrt(2 * np.pi))
+        ax_dist.plot(x, y, color='white', linewidth=1.5, linestyle=':', label='Normal (same mean/vol)')
         
-        # Mark VAR threshold (at -1.645 for 95% confidence)
-        var_z_score = -1.645
-        ax_dist.axvline(var_z_score, color='#E74C3C', linestyle='--', linewidth=2.5, label='VAR @ 95% Confidence')
+        # Mark VAR threshold (5th percentile of simulated returns)
+        var_threshold = -opt_var_95
+        ax_dist.axvline(var_threshold, color='#E74C3C', linestyle='--', linewidth=2.5, label='VAR @ 95% Confidence')
         
         # Shade the tail (5% area)
-        x_tail = x[x <= var_z_score]
-        y_tail = y[:len(x_tail)]
-        ax_dist.fill_between(x_tail, y_tail, alpha=0.7, color='#E74C3C', label='5% Tail Risk')
+        tail = centers <= var_threshold
+        ax_dist.fill_between(centers[tail], counts[tail], step='mid', alpha=0.7, color='#E74C3C', label='5% Tail Risk')
         
         # Formatting
-        ax_dist.set_xlabel('Standard Deviations (σ)', fontsize=11, color='white', fontweight='bold')
+        ax_dist.set_xlabel('Annual Return (%)', fontsize=11, color='white', fontweight='bold')
         ax_dist.set_ylabel('Probability Density', fontsize=11, color='white', fontweight='bold')
         ax_dist.set_title('Portfolio Return Distribution @ 95% Confidence', 
                          fontsize=12, color='#FFD700', fontweight='bold', pad=15)
@@ -477,8 +670,8 @@ if st.session_state.get("run_optimization", False):
         ax_dist.tick_params(colors='white', labelsize=10)
         
         # Add text annotation
-        ax_dist.text(var_z_score - 0.5, max(y) * 0.7, f'VAR = {opt_var_95:.2f}%\n(Max Loss)', 
-                    fontsize=10, color='white', bbox=dict(boxstyle='round', 
+        ax_dist.text(var_threshold, counts.max() * 0.7, f'VAR = {opt_var_95:.2f}%\n(Max Loss)', 
+                    ha='right', fontsize=10, color='white', bbox=dict(boxstyle='round', 
                     facecolor='#E74C3C', alpha=0.8, edgecolor='#FFD700', linewidth=2))
         
         # Set spine colors
@@ -617,75 +810,123 @@ if st.session_state.get("run_optimization", False):
         </div>
         """, unsafe_allow_html=True)
 
-    # Generate efficient frontier by simulating random portfolios
-    np.random.seed(42)
-    num_simulations = 5000
+    # Progressive frontier: the exact long-only frontier through the corner portfolios and a
+    # coarse sample are drawn first, then the chart's data is replaced in place as chunks are
+    # added; the browser draws each frame, so the server only sends the points
+    num_simulations = FRONTIER_CHART["n_portfolios"]
     selected_assets_list = list(st.session_state.selected_assets.keys())
     num_assets = len(selected_assets_list)
 
-    # Store simulation results
-    frontier_returns = []
-    frontier_vols = []
-    frontier_sharpes = []
-
-    for _ in range(num_simulations):
-        # Random weights
-        weights = np.random.random(num_assets)
-        weights /= np.sum(weights)
-        
-        # Calculate portfolio metrics
-        port_return = sum(weights[i] * ASSET_DATA[selected_assets_list[i]]["return"] 
-                          for i in range(num_assets) if selected_assets_list[i] in ASSET_DATA)
-        port_vol = np.sqrt(sum((weights[i] ** 2) * (ASSET_DATA[selected_assets_list[i]]["volatility"] ** 2) 
-                                for i in range(num_assets) if selected_assets_list[i] in ASSET_DATA))
-        port_sharpe = (port_return - st.session_state.risk_free_rate) / port_vol if port_vol > 0 else 0
-        
-        frontier_returns.append(port_return)
-        frontier_vols.append(port_vol)
-        frontier_sharpes.append(port_sharpe)
-
-    # Create Efficient Frontier plot
-    fig, ax = plt.subplots(figsize=(12, 7))
-
-    # Plot all simulated portfolios
-    scatter = ax.scatter(frontier_vols, frontier_returns, c=frontier_sharpes, 
-                         cmap='viridis', alpha=0.5, s=30, label='Simulated Portfolios')
-
-    # Plot current portfolio
-    ax.scatter(current_vol, current_return, color='orange', s=200, marker='o', 
-              edgecolors='black', linewidth=2, label='Current Portfolio', zorder=5)
-
-    # Plot optimized portfolio
-    ax.scatter(opt_vol, opt_return, color='lime', s=200, marker='*', 
-              edgecolors='black', linewidth=2, label='Optimized Portfolio', zorder=5)
-
-    # Plot Capital Allocation Line (CAL)
-    max_vol_for_cal = max(frontier_vols) * 1.2
-    cal_vols = np.linspace(0, max_vol_for_cal, 100)
+    # Random weights are drawn chunk by chunk from one stream: the same cloud as a single draw
+    frontier_rng = generator(RANDOM_SEED, "optimize_frontier")
+    known = [i for i, asset in enumerate(selected_assets_list) if asset in ASSET_DATA]
+    known_returns = np.array([ASSET_DATA[selected_assets_list[i]]["return"] for i in known])
+
+    # Long-only frontier corner portfolios, kept in memory per universe; weights
+    # move linearly between consecutive corners, volatility does not
+    corners = load_universe_artifacts(
+        risk_assets,
+        risk_mu / 100,
+        risk_vols / 100,
+        st.session_state.risk_free_rate / 100,
+    )["corner_weights"]
+    steps = np.linspace(0.0, 1.0, FRONTIER_CHART["points_per_segment"])[:, None]
+    frontier_path = np.vstack([corners[:1]] + [(1 - steps[1:]) * a + steps[1:] * b for a, b in zip(corners[:-1], corners[1:])])
+    path_returns = frontier_path @ known_returns
+    path_vols = factor_risk.portfolio_volatility(frontier_path)
+
+    frontier_returns = np.empty(num_simulations)
+    frontier_vols = np.empty(num_simulations)
+    frontier_sharpes = np.empty(num_simulations)
+    coarse = min(FRONTIER_CHART["coarse_portfolios"], num_simulations)
+    bounds = [0] + list(range(coarse, num_simulations, FRONTIER_CHART["chunk_size"])) + [num_simulations]
     risk_free_rate = st.session_state.risk_free_rate
 
-    if opt_sharpe > 0:
-        cal_returns = risk_free_rate + opt_sharpe * cal_vols
-        ax.plot(cal_vols, cal_returns, 'r--', linewidth=2, label='Capital Allocation Line', zorder=4)
-
-    # Risk-free rate point
-    ax.scatter(0, risk_free_rate, color='red', s=150, marker='D', 
-              edgecolors='black', linewidth=2, label='Risk-Free Rate', zorder=5)
-
-    # Formatting
-    ax.set_xlabel('Portfolio Volatility (Risk) %', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Expected Return %', fontsize=12, fontweight='bold')
-    ax.set_title('Efficient Frontier - Portfolio Optimization', fontsize=14, fontweight='bold', color='#003366')
-    ax.legend(loc='upper left', fontsize=10)
-    ax.grid(True, alpha=0.3)
-    ax.set_facecolor('#f8f9fa')
-    fig.patch.set_facecolor('white')
-
-    # Add colorbar
-    cbar = plt.colorbar(scatter, ax=ax)
-    cbar.set_label('Sharpe Ratio', fontweight='bold')
-
-    st.pyplot(fig)
+    # Efficient Frontier chart (Vega-Lite): simulated cloud colored by Sharpe ratio, the frontier
+    # and Capital Allocation Line, and the current, optimized and risk-free portfolios
+    axes = {
+        "x": {"field": "volatility", "type": "quantitative", "title": "Portfolio Volatility (Risk) %"},
+        "y": {"field": "return", "type": "quantitative", "title": "Expected Return %"},
+    }
+    marker_names = ["Current Portfolio", "Optimized Portfolio", "Risk-Free Rate"]
+    star = "M0,-1L0.22,-0.31L0.95,-0.31L0.36,0.12L0.59,0.81L0,0.38L-0.59,0.81L-0.36,0.12L-0.95,-0.31L-0.22,-0.31Z"
+    frontier_spec = {
+        "title": {"text": "Efficient Frontier - Portfolio Optimization", "color": "#003366", "fontSize": 16},
+        "height": 500,
+        "background": "white",
+        "layer": [
+            {
+                "data": {"name": "simulated"},
+                "mark": {"type": "circle", "size": 30, "opacity": 0.5},
+                "encoding": {**axes, "color": {"field": "sharpe", "type": "quantitative", "title": "Sharpe Ratio",
+                                               "scale": {"scheme": "viridis"}}},
+            },
+            {
+                "data": {"name": "lines"},
+                "mark": {"type": "line", "strokeWidth": 2.5},
+                "encoding": {
+                    **axes,
+                    "order": {"field": "step", "type": "quantitative"},
+                    "color": {"field": "line", "type": "nominal", "title": None,
+                              "scale": {"domain": ["Efficient Frontier", "Capital Allocation Line"],
+                                        "range": ["#003366", "red"]}},
+                    "strokeDash": {"field": "line", "type": "nominal", "legend": None,
+                                   "scale": {"domain": ["Efficient Frontier", "Capital Allocation Line"],
+                                             "range": [[1, 0], [6, 4]]}},
+                },
+            },
+            {
+                "data": {"name": "markers"},
+                "mark": {"type": "point", "filled": True, "size": 200, "stroke": "black", "strokeWidth": 2,
+                         "opacity": 1},
+                "encoding": {
+                    **axes,
+                    "color": {"field": "portfolio", "type": "nominal", "title": None,
+                              "scale": {"domain": marker_names, "range": ["orange", "lime", "red"]}},
+                    "shape": {"field": "portfolio", "type": "nominal", "title": None,
+                              "scale": {"domain": marker_names, "range": ["circle", star, "diamond"]}},
+                },
+            },
+        ],
+        "resolve": {"scale": {"color": "independent", "strokeDash": "independent"}},
+    }
+    frontier_markers = pd.DataFrame({
+        "volatility": [current_vol, opt_vol, 0.0],
+        "return": [current_return, opt_return, risk_free_rate],
+        "portfolio": marker_names,
+    })
+    frontier_line = pd.DataFrame({"volatility": path_vols, "return": path_returns,
+                                  "line": "Efficient Frontier", "step": np.arange(len(path_vols))})
+
+    frontier_chart = st.empty()
+    frontier_status = st.empty()
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        # Random weights and portfolio metrics for this chunk (one row per portfolio)
+        weights = frontier_rng.random((hi - lo, num_assets))
+        weights /= weights.sum(axis=1, keepdims=True)
+        chunk = weights[:, known]
+        frontier_returns[lo:hi] = chunk @ known_returns
+        frontier_vols[lo:hi] = factor_risk.portfolio_volatility(chunk)
+        frontier_sharpes[lo:hi] = np.divide(frontier_returns[lo:hi] - risk_free_rate, frontier_vols[lo:hi],
+                                            out=np.zeros(hi - lo), where=frontier_vols[lo:hi] > 0)
+
+        # Capital Allocation Line, extended as the cloud grows
+        lines = [frontier_line]
+        if opt_sharpe > 0:
+            cal_vols = np.linspace(0, max(frontier_vols[:hi].max(), path_vols.max()) * 1.2, 100)
+            lines.append(pd.DataFrame({"volatility": cal_vols, "return": risk_free_rate + opt_sharpe * cal_vols,
+                                       "line": "Capital Allocation Line", "step": np.arange(len(cal_vols))}))
+
+        frontier_chart.vega_lite_chart({**frontier_spec, "datasets": {
+            "simulated": pd.DataFrame({"volatility": frontier_vols[:hi], "return": frontier_returns[:hi],
+                                       "sharpe": frontier_sharpes[:hi]}),
+            "lines": pd.concat(lines, ignore_index=True),
+            "markers": frontier_markers,
+        }}, use_container_width=True)
+        if hi < num_simulations:
+            frontier_status.caption(f"⏳ Refining: {hi:,} of {num_simulations:,} simulated portfolios")
+        else:
+            frontier_status.caption(f"✅ {num_simulations:,} simulated portfolios")
 
     # Add explanation
     st.markdown("""
@@ -694,6 +935,7 @@ if st.session_state.get("run_optimization", False):
     - **Orange Circle (●)** = Your current portfolio allocation
     - **Green Star (★)** = Your optimized portfolio (based on selected objective)
     - **Red Diamond (◆)** = Risk-free rate (4.5% with zero volatility)
+    - **Dark Blue Line** = Long-only efficient frontier (through the corner portfolios)
     - **Colored Dots** = Other possible portfolio allocations (simulated)
     - **Red Dashed Line** = Capital Allocation Line (optimal risk-return trade-off)
 
@@ -13,7 +13,15 @@ Prof. V. Ravichandran
 import streamlit as st
 import pandas as pd
 import numpy as np
-from config_enhanced import PAGE_CONFIG
+import matplotlib.pyplot as plt
+from config_enhanced import PAGE_CONFIG, ASSET_CLASSES, STRESS_SCENARIOS, RANDOM_SEED, SCENARIO_MODELS, SCENARIO_SETTINGS, BOOTSTRAP
+from bootstrap import BOOTSTRAP_OBJECTIVES, cached_bootstrap_intervals
+from market_data import get_registry, session_asset_data
+from factor_model import FactorRiskModel
+from risk_attribution import risk_attribution, aggregate_by_class
+from stress_testing import custom_scenario, scenario_matrix, stress_pnl
+from projection import project_wealth
+from scenarios import history_returns
 from styles_enhanced import apply_main_styles, render_header, render_footer
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -41,55 +49,12 @@ if "optimization_objective" not in st.session_state:
 # ASSET DATA
 # ═══════════════════════════════════════════════════════════════════════════════
 
-ASSET_DATA = {
-    # Tech Giants
-    "AAPL": {"return": 28.5, "volatility": 32.1}, "MSFT": {"return": 26.3, "volatility": 28.9},
-    "GOOGL": {"return": 24.7, "volatility": 30.2}, "AMZN": {"return": 22.1, "volatility": 34.5},
-    "NVDA": {"return": 35.2, "volatility": 45.8}, "META": {"return": 25.8, "volatility": 38.4},
-    "INTC": {"return": 18.9, "volatility": 31.5}, "AMD": {"return": 22.4, "volatility": 42.1},
-    
-    # Financial Services
-    "JPM": {"return": 15.3, "volatility": 25.6}, "BAC": {"return": 12.5, "volatility": 28.3},
-    "WFC": {"return": 11.8, "volatility": 27.5}, "GS": {"return": 14.2, "volatility": 29.8},
-    "V": {"return": 19.5, "volatility": 24.3}, "MA": {"return": 20.1, "volatility": 25.6},
-    "PYPL": {"return": 16.8, "volatility": 38.2},
-    
-    # Healthcare & Pharma
-    "JNJ": {"return": 10.2, "volatility": 18.4}, "UNH": {"return": 17.6, "volatility": 22.1},
-    "PFE": {"return": 8.9, "volatility": 21.3}, "LLY": {"return": 14.3, "volatility": 20.2},
-    "ABBV": {"return": 12.7, "volatility": 19.8},
-    
-    # Consumer & Retail
-    "PG": {"return": 9.7, "volatility": 16.8}, "KO": {"return": 7.3, "volatility": 18.2},
-    "PEP": {"return": 8.5, "volatility": 17.3}, "HD": {"return": 13.2, "volatility": 21.5},
-    "MCD": {"return": 10.8, "volatility": 19.2}, "COST": {"return": 11.5, "volatility": 20.1},
-    "WMT": {"return": 9.3, "volatility": 17.8},
-    
-    # Energy & Utilities
-    "XOM": {"return": 8.9, "volatility": 22.4}, "CVX": {"return": 8.2, "volatility": 23.1},
-    "SO": {"return": 6.5, "volatility": 14.2},
-    
-    # Media & Entertainment
-    "NFLX": {"return": 20.3, "volatility": 42.8}, "DIS": {"return": 12.4, "volatility": 26.3},
-    
-    # Transportation & Other
-    "TSLA": {"return": 32.1, "volatility": 58.3}, "BA": {"return": 9.8, "volatility": 29.4},
-    
-    # Bonds
-    "BND": {"return": 4.2, "volatility": 6.3}, "AGG": {"return": 4.5, "volatility": 6.8},
-    "LQD": {"return": 5.1, "volatility": 7.4}, "TLT": {"return": 3.8, "volatility": 8.9},
-    "SHV": {"return": 3.2, "volatility": 2.1},
-    
-    # Commodities
-    "GLD": {"return": 6.5, "volatility": 14.2}, "SLV": {"return": 5.8, "volatility": 18.6},
-    "USO": {"return": 3.2, "volatility": 22.1}, "DBC": {"return": 2.1, "volatility": 19.8},
-    "UUP": {"return": 1.5, "volatility": 8.3},
-    
-    # Cryptocurrencies
-    "BTC": {"return": 65.3, "volatility": 78.5}, "ETH": {"return": 58.2, "volatility": 82.3},
-    "BNB": {"return": 52.1, "volatility": 88.2}, "ADA": {"return": 45.3, "volatility": 92.4},
-    "SOL": {"return": 48.9, "volatility": 95.1},
-}
+# Shared, read-only market data; each rerun gets its own top-level dict
+ASSET_DATA = session_asset_data()
+
+# Use the Black-Litterman posterior estimates the optimizer ran with
+if st.session_state.get("use_black_litterman", False) and st.session_state.get("bl_asset_data"):
+    ASSET_DATA.update(st.session_state.bl_asset_data)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PAGE TITLE
@@ -115,18 +80,20 @@ selected_assets_list = list(st.session_state.selected_assets.keys())
 current_weights = st.session_state.selected_assets
 optimized_weights = st.session_state.optimized_weights
 
+# One-factor form of the assumed-correlation covariance: O(n) portfolio volatility
+risk_assets = [asset for asset in selected_assets_list if asset in ASSET_DATA]
+factor_risk = FactorRiskModel.constant_correlation([ASSET_DATA[asset]["volatility"] for asset in risk_assets])
+
 # Current portfolio metrics
 current_return = sum(current_weights[asset] * ASSET_DATA[asset]["return"] 
                      for asset in selected_assets_list if asset in ASSET_DATA)
-current_vol = np.sqrt(sum((current_weights[asset] ** 2) * (ASSET_DATA[asset]["volatility"] ** 2) 
-                           for asset in selected_assets_list if asset in ASSET_DATA))
+current_vol = factor_risk.portfolio_volatility([current_weights[asset] for asset in risk_assets])
 current_sharpe = (current_return - st.session_state.risk_free_rate) / current_vol if current_vol > 0 else 0
 
 # Optimized portfolio metrics
 opt_return = sum(optimized_weights[asset] * ASSET_DATA[asset]["return"] 
                  for asset in selected_assets_list if asset in ASSET_DATA)
-opt_vol = np.sqrt(sum((optimized_weights[asset] ** 2) * (ASSET_DATA[asset]["volatility"] ** 2) 
-                       for asset in selected_assets_list if asset in ASSET_DATA))
+opt_vol = factor_risk.portfolio_volatility([optimized_weights[asset] for asset in risk_assets])
 opt_sharpe = (opt_return - st.session_state.risk_free_rate) / opt_vol if opt_vol > 0 else 0
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -224,6 +191,260 @@ st.dataframe(
     }
 )
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# WEIGHT CONFIDENCE BANDS (RESAMPLED EFFICIENT FRONTIER ONLY)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+weight_bands = st.session_state.get("weight_bands", {})
+if st.session_state.optimization_objective == "Resampled Efficient Frontier" and weight_bands:
+    st.markdown("""
+        <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+            <h2 style='color: #FFD700; margin-top: 0;'>🎰 WEIGHT CONFIDENCE BANDS (5%-95%)</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+    band_assets = [asset for asset in selected_assets_list if asset in weight_bands]
+    band_weights = np.array([optimized_weights.get(asset, 0) * 100 for asset in band_assets])
+    band_lower = np.array([weight_bands[asset][0] * 100 for asset in band_assets])
+    band_upper = np.array([weight_bands[asset][1] * 100 for asset in band_assets])
+
+    fig_bands, ax_bands = plt.subplots(figsize=(12, 6))
+    ax_bands.bar(band_assets, band_weights, color='#2ECC71', alpha=0.8, edgecolor='#FFD700', linewidth=1.5,
+                 label='Resampled Weight')
+    ax_bands.errorbar(band_assets, band_weights,
+                      yerr=[np.clip(band_weights - band_lower, 0, None), np.clip(band_upper - band_weights, 0, None)],
+                      fmt='none', ecolor='white', elinewidth=2, capsize=6, label='5%-95% Band')
+    ax_bands.set_ylabel('Weight (%)', fontsize=11, color='white', fontweight='bold')
+    ax_bands.set_title('Resampled Weights with Confidence Bands', fontsize=12, color='#FFD700', fontweight='bold', pad=15)
+    ax_bands.legend(loc='upper right', fontsize=10, facecolor='#003366',
+                    edgecolor='#FFD700', labelcolor='white', framealpha=0.95)
+    ax_bands.set_facecolor('#003366')
+    ax_bands.grid(True, alpha=0.2, axis='y', color='white')
+    ax_bands.tick_params(colors='white', labelsize=10)
+    for spine in ax_bands.spines.values():
+        spine.set_color('#FFD700')
+        spine.set_linewidth(1.5)
+
+    st.pyplot(fig_bands)
+    st.markdown("""
+    <p style='color: white; font-size: 0.9rem; text-align: center; margin-top: -10px;'>
+    <strong style='color: #FFD700;'>Note:</strong> Bands show the range of optimal weights across 90% of the resampled
+    estimates. Wide bands mean the allocation to that asset is sensitive to estimation error.
+    </p>
+    """, unsafe_allow_html=True)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RISK ATTRIBUTION - CURRENT VS OPTIMIZED
+# ═══════════════════════════════════════════════════════════════════════════════
+
+st.markdown("""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🧩 RISK ATTRIBUTION</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+# Both portfolios decomposed in one batched call (row 0: current, row 1: optimized)
+attribution_weights = np.array([
+    [current_weights[asset] for asset in risk_assets],
+    [optimized_weights.get(asset, 0) for asset in risk_assets],
+])
+attribution = risk_attribution(attribution_weights, factor_risk,
+                               expected_returns=[ASSET_DATA[asset]["return"] for asset in risk_assets])
+
+attr_col1, attr_col2 = st.columns([3, 2])
+
+with attr_col1:
+    df_risk = pd.DataFrame({
+        "Asset": risk_assets,
+        "Current % of Risk": attribution["percent_risk"][0] * 100,
+        "Optimized % of Risk": attribution["percent_risk"][1] * 100,
+        "Optimized Component VaR": attribution["component_var"][1],
+        "Optimized Component CVaR": attribution["component_cvar"][1],
+    })
+    st.dataframe(
+        df_risk,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Asset": st.column_config.TextColumn("Asset", width="small"),
+            "Current % of Risk": st.column_config.NumberColumn("Current % of Risk", format="%.1f%%"),
+            "Optimized % of Risk": st.column_config.NumberColumn("Optimized % of Risk", format="%.1f%%"),
+            "Optimized Component VaR": st.column_config.NumberColumn("Component VaR", format="%.2f%%"),
+            "Optimized Component CVaR": st.column_config.NumberColumn("Component CVaR", format="%.2f%%"),
+        }
+    )
+
+with attr_col2:
+    df_class_risk = aggregate_by_class(attribution["percent_risk"] * 100, risk_assets)
+    df_class_risk.columns = ["Current", "Optimized"]
+    st.dataframe(
+        df_class_risk,
+        use_container_width=True,
+        column_config={
+            "Current": st.column_config.NumberColumn("Current % of Risk", format="%.1f%%"),
+            "Optimized": st.column_config.NumberColumn("Optimized % of Risk", format="%.1f%%"),
+        }
+    )
+    st.info(f"""
+    **VaR (95%):** {attribution['var'][0]:.2f}% → {attribution['var'][1]:.2f}%
+    
+    **CVaR (95%):** {attribution['cvar'][0]:.2f}% → {attribution['cvar'][1]:.2f}%
+    """)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STRESS TESTS - HISTORICAL AND CUSTOM SHOCKS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+st.markdown("""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🌪️ STRESS TESTS</h2>
+        <p style='color: #90EE90; margin: 0.5rem 0 0 0;'>Portfolio P&L if a historical crisis (or your own shock) repeated today</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+with st.expander("⚙️ Custom Scenario - Shock by Asset Class"):
+    shock_cols = st.columns(len(ASSET_CLASSES))
+    class_shocks = {}
+    for col, asset_class in zip(shock_cols, ASSET_CLASSES):
+        with col:
+            class_shocks[asset_class] = st.slider(
+                f"{ASSET_CLASSES[asset_class]['emoji']} {asset_class} (%)",
+                min_value=-90, max_value=50, value=0, step=5,
+                key=f"stress_{asset_class}",
+            ) / 100
+
+stress_scenarios = dict(STRESS_SCENARIOS)
+if any(class_shocks.values()):
+    stress_scenarios["Custom Scenario"] = custom_scenario(class_shocks)
+
+# Both portfolios against every scenario in one matrix product (rows: current, optimized)
+scenario_names, shocks = scenario_matrix(risk_assets, stress_scenarios)
+stress = stress_pnl(attribution_weights, shocks) * 100
+
+stress_col1, stress_col2 = st.columns([2, 3])
+
+with stress_col1:
+    df_stress = pd.DataFrame({
+        "Scenario": scenario_names,
+        "Current P&L": stress[0],
+        "Optimized P&L": stress[1],
+        "Difference": stress[1] - stress[0],
+    })
+    st.dataframe(
+        df_stress,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Scenario": st.column_config.TextColumn("Scenario", width="medium"),
+            "Current P&L": st.column_config.NumberColumn("Current P&L", format="%.2f%%"),
+            "Optimized P&L": st.column_config.NumberColumn("Optimized P&L", format="%.2f%%"),
+            "Difference": st.column_config.NumberColumn("Difference", format="%+.2f%%"),
+        }
+    )
+
+with stress_col2:
+    fig_stress, ax_stress = plt.subplots(figsize=(10, 5))
+    positions = np.arange(len(scenario_names))
+    ax_stress.bar(positions - 0.2, stress[0], 0.4, color='#FF6B6B', alpha=0.8, edgecolor='#FFD700', label='Current')
+    ax_stress.bar(positions + 0.2, stress[1], 0.4, color='#2ECC71', alpha=0.8, edgecolor='#FFD700', label='Optimized')
+    ax_stress.axhline(0, color='white', linewidth=1)
+    ax_stress.set_xticks(positions)
+    ax_stress.set_xticklabels(scenario_names, fontsize=9)
+    ax_stress.set_ylabel('P&L (%)', fontsize=11, color='white', fontweight='bold')
+    ax_stress.set_title('Scenario P&L', fontsize=12, color='#FFD700', fontweight='bold', pad=15)
+    ax_stress.legend(loc='lower right', fontsize=10, facecolor='#003366',
+                     edgecolor='#FFD700', labelcolor='white', framealpha=0.95)
+    ax_stress.set_facecolor('#003366')
+    ax_stress.grid(True, alpha=0.2, axis='y', color='white')
+    ax_stress.tick_params(colors='white', labelsize=10)
+    for spine in ax_stress.spines.values():
+        spine.set_color('#FFD700')
+        spine.set_linewidth(1.5)
+    st.pyplot(fig_stress)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WEALTH PROJECTION - MONTE CARLO FAN CHART
+# ═══════════════════════════════════════════════════════════════════════════════
+
+investment_period = st.session_state.get("investment_period", 5)
+
+st.markdown(f"""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🔮 WEALTH PROJECTION ({investment_period} YEARS)</h2>
+        <p style='color: #90EE90; margin: 0.5rem 0 0 0;'>Simulated monthly wealth paths for both portfolios on the same market scenarios</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+proj_col1, proj_col2, proj_col3 = st.columns(3)
+
+with proj_col1:
+    initial_investment = st.number_input("💵 Initial Investment ($)", min_value=1000, value=100000, step=1000)
+
+with proj_col2:
+    wealth_goal = st.number_input("🎯 Wealth Goal ($)", min_value=1000, value=int(initial_investment * 1.5), step=1000)
+
+with proj_col3:
+    n_paths = st.selectbox("🎲 Simulated Paths", [10000, 50000, 100000], index=0)
+
+# Fall back to the default model when the bootstrap has no history for these assets
+projection_history = history_returns(get_registry().current().returns, risk_assets)
+projection_model = st.session_state.get("scenario_model", SCENARIO_SETTINGS["model"])
+if projection_model == "bootstrap" and projection_history is None:
+    projection_model = SCENARIO_SETTINGS["model"]
+st.caption(f"🎲 Monthly returns drawn from the {SCENARIO_MODELS[projection_model]} model")
+
+projection = project_wealth(
+    attribution_weights,
+    [ASSET_DATA[asset]["return"] / 100 for asset in risk_assets],
+    factor_risk.covariance() / 10000,
+    investment_period,
+    initial_wealth=initial_investment,
+    goal=wealth_goal,
+    n_paths=n_paths,
+    model=projection_model,
+    dof=st.session_state.get("scenario_dof", SCENARIO_SETTINGS["dof"]),
+    history=projection_history,
+    seed=RANDOM_SEED,
+)
+
+fig_proj, ax_proj = plt.subplots(figsize=(12, 6))
+levels = projection["percentile_levels"]
+mid = levels.index(50)
+for row, (label, color) in enumerate([("Current", '#FF6B6B'), ("Optimized", '#2ECC71')]):
+    bands = projection["percentiles"][row]
+    ax_proj.fill_between(projection["times"], bands[:, 0], bands[:, -1], color=color, alpha=0.15,
+                         label=f'{label} {levels[0]}%-{levels[-1]}%')
+    ax_proj.fill_between(projection["times"], bands[:, 1], bands[:, -2], color=color, alpha=0.3,
+                         label=f'{label} {levels[1]}%-{levels[-2]}%')
+    ax_proj.plot(projection["times"], bands[:, mid], color=color, linewidth=2.5, label=f'{label} Median')
+ax_proj.axhline(wealth_goal, color='#FFD700', linestyle='--', linewidth=1.5, label='Goal')
+ax_proj.set_xlabel('Years', fontsize=11, color='white', fontweight='bold')
+ax_proj.set_ylabel('Wealth ($)', fontsize=11, color='white', fontweight='bold')
+ax_proj.set_title('Projected Wealth - Percentile Fan Chart', fontsize=12, color='#FFD700', fontweight='bold', pad=15)
+ax_proj.legend(loc='upper left', fontsize=9, facecolor='#003366',
+               edgecolor='#FFD700', labelcolor='white', framealpha=0.95)
+ax_proj.set_facecolor('#003366')
+ax_proj.grid(True, alpha=0.2, color='white')
+ax_proj.tick_params(colors='white', labelsize=10)
+for spine in ax_proj.spines.values():
+    spine.set_color('#FFD700')
+    spine.set_linewidth(1.5)
+st.pyplot(fig_proj)
+
+goal_col1, goal_col2, goal_col3 = st.columns(3)
+
+with goal_col1:
+    st.metric("🎯 Goal Probability (Optimized)", f"{projection['goal_probability'][1] * 100:.1f}%",
+              delta=f"{(projection['goal_probability'][1] - projection['goal_probability'][0]) * 100:+.1f} pts vs current")
+
+with goal_col2:
+    st.metric("📊 Median Final Wealth (Optimized)", f"${projection['percentiles'][1, -1, mid]:,.0f}",
+              delta=f"${projection['percentiles'][1, -1, mid] - projection['percentiles'][0, -1, mid]:,.0f} vs current")
+
+with goal_col3:
+    st.metric(f"⚠️ {levels[0]}th Percentile (Optimized)", f"${projection['percentiles'][1, -1, 0]:,.0f}",
+              delta=f"${projection['percentiles'][1, -1, 0] - projection['percentiles'][0, -1, 0]:,.0f} vs current")
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PERFORMANCE METRICS - DETAILED TABLE
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -250,21 +471,21 @@ metrics_data = {
     "Current": [
         f"{current_return:.2f}%",
         f"{current_vol:.2f}%",
-        f"{current_sharpe:.4f}",
+        f"{current_sharpe:.3f}",
         f"{st.session_state.risk_free_rate:.2f}%",
         f"{current_return - st.session_state.risk_free_rate:.2f}%"
     ],
     "Optimized": [
         f"{opt_return:.2f}%",
         f"{opt_vol:.2f}%",
-        f"{opt_sharpe:.4f}",
+        f"{opt_sharpe:.3f}",
         f"{st.session_state.risk_free_rate:.2f}%",
         f"{opt_return - st.session_state.risk_free_rate:.2f}%"
     ],
     "Change": [
         f"{opt_return - current_return:+.2f}%",
         f"{opt_vol - current_vol:+.2f}%",
-        f"{opt_sharpe - current_sharpe:+.4f}",
+        f"{opt_sharpe - current_sharpe:+.3f}",
         "0.00%",
         f"{(opt_return - st.session_state.risk_free_rate) - (current_return - st.session_state.risk_free_rate):+.2f}%"
     ],
@@ -291,6 +512,63 @@ st.dataframe(
     }
 )
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIDENCE INTERVALS (BOOTSTRAP)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+st.markdown("""
+    <div style='background-color: #003366; padding: 1.5rem; border-radius: 0.5rem; margin: 2rem 0 1rem 0;'>
+        <h2 style='color: #FFD700; margin-top: 0;'>🎯 CONFIDENCE INTERVALS (BOOTSTRAP)</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+if projection_history is None or len(projection_history) < 2 * BOOTSTRAP["mean_block"]:
+    st.info("ℹ️ Confidence intervals need a stored return history covering every selected asset.")
+else:
+    # Replicates are reused across reruns until the market data, portfolios or objective change
+    bootstrap_objective = st.session_state.optimization_objective
+    ci = cached_bootstrap_intervals(
+        get_registry().current().version,
+        risk_assets,
+        projection_history,
+        attribution_weights,
+        objective=bootstrap_objective if bootstrap_objective in BOOTSTRAP_OBJECTIVES else None,
+        risk_free_rate=st.session_state.risk_free_rate / 100,
+    )
+    level = f"{BOOTSTRAP['confidence'] * 100:.0f}%"
+    st.caption(f"🔁 Historical ratios of the stored returns ({len(projection_history)} periods) with {level} intervals "
+               f"from {ci['n_replicates']:,} stationary block bootstrap replicates "
+               f"(mean block {BOOTSTRAP['mean_block']} periods)")
+
+    # "point [lower, upper]" per ratio, one entry per portfolio (0: current, 1: optimized)
+    interval = {stat: [f"{ci[stat]['point'][row]:.2f} [{ci[stat]['lower'][row]:.2f}, {ci[stat]['upper'][row]:.2f}]"
+                       for row in range(2)] for stat in ("sharpe", "sortino")}
+
+    ci_col1, ci_col2, ci_col3 = st.columns(3)
+    with ci_col1:
+        st.metric("📊 Sharpe Ratio (Current)", interval["sharpe"][0])
+        st.metric("📉 Sortino Ratio (Current)", interval["sortino"][0])
+    with ci_col2:
+        st.metric("📊 Sharpe Ratio (Optimized)", interval["sharpe"][1])
+        st.metric("📉 Sortino Ratio (Optimized)", interval["sortino"][1])
+    with ci_col3:
+        samples = ci["sharpe_samples"]
+        st.metric("🏆 P(Optimized Sharpe > Current)", f"{(samples[:, 1] > samples[:, 0]).mean() * 100:.1f}%")
+
+    if ci["weights"] is not None:
+        st.markdown(f"**Weight intervals of {bootstrap_objective} re-optimized on each replicate**")
+        st.dataframe(
+            pd.DataFrame({
+                "Asset": risk_assets,
+                "Optimized Weight": [f"{optimized_weights.get(asset, 0) * 100:.1f}%" for asset in risk_assets],
+                "Historical Estimate": [f"{w * 100:.1f}%" for w in ci["weights"]["point"]],
+                f"{level} Interval": [f"[{lo * 100:.1f}%, {hi * 100:.1f}%]"
+                                      for lo, hi in zip(ci["weights"]["lower"], ci["weights"]["upper"])],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # IMPROVEMENT SUMMARY
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -351,7 +629,7 @@ with col3:
         <div style='background-color: #004d80; padding: 1.5rem; border-radius: 0.5rem; text-align: center;'>
             <p style='color: white; margin: 0;'>{color} Sharpe Ratio {direction}</p>
             <h2 style='color: #FFD700; margin: 0.5rem 0;'>{improvement_sharpe_pct:+.2f}%</h2>
-            <p style='color: #90EE90; margin: 0;'>{sharpe_improvement:+.4f} absolute</p>
+            <p style='color: #90EE90; margin: 0;'>{sharpe_improvement:+.3f} absolute</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -0,0 +1,164 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - PORTFOLIO
+Compact, Immutable, Array-Backed Portfolio Weights for Session State
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import sys
+import threading
+import weakref
+from collections.abc import Mapping
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INTERNED TICKER INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TickerIndex:
+    """
+    Ordered tickers with their positions, shared by every portfolio over
+    the same tickers
+
+    Obtain instances through TickerIndex.intern(); there is one instance
+    per distinct ticker tuple in the process, so thousands of sessions
+    holding the same universe share one index, and equal indices can be
+    compared by identity. The registry holds weak references, so an index
+    is dropped once no portfolio uses it.
+    """
+
+    __slots__ = ("tickers", "positions", "__weakref__")
+
+    _interned = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, tickers):
+        self.tickers = tuple(sys.intern(str(ticker)) for ticker in tickers)
+        self.positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        if len(self.positions) != len(self.tickers):
+            raise ValueError("Duplicate tickers in portfolio")
+
+    @classmethod
+    def intern(cls, tickers):
+        tickers = tuple(tickers)
+        with cls._lock:
+            index = cls._interned.get(tickers)
+            if index is None:
+                index = cls(tickers)
+                cls._interned[tickers] = index
+        return index
+
+    def __len__(self):
+        return len(self.tickers)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PORTFOLIO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Portfolio(Mapping):
+    """
+    Immutable ticker -> weight mapping backed by a float64 array
+
+    Behaves as a read-only dictionary (keys(), values(), items(), get(),
+    [ticker], len, in), so page code written against the old
+    {ticker: weight} dictionaries keeps working. Weights live in one
+    contiguous read-only array; the hash is computed once, so a portfolio
+    can be used directly as a cache key.
+
+    Args:
+        tickers: Sequence of tickers
+        weights: Sequence of weights (fractions), same order as tickers
+    """
+
+    __slots__ = ("index", "weights", "_hash")
+
+    def __init__(self, tickers, weights):
+        self.index = tickers if isinstance(tickers, TickerIndex) else TickerIndex.intern(tickers)
+        weights = np.array(weights, dtype=np.float64) + 0.0  # -0.0 -> 0.0, so equal weights hash equal
+        if weights.shape != (len(self.index),):
+            raise ValueError("weights must have one entry per ticker")
+        weights.setflags(write=False)
+        self.weights = weights
+        self._hash = None
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # CONSTRUCTORS AND CONVERSION
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_dict(cls, weights):
+        """Portfolio from a {ticker: weight} mapping (a Portfolio is returned as is)"""
+        if isinstance(weights, Portfolio):
+            return weights
+        return cls(tuple(weights), list(weights.values()))
+
+    @classmethod
+    def equal_weight(cls, tickers):
+        tickers = tuple(tickers)
+        return cls(tickers, np.full(len(tickers), 1.0 / len(tickers)) if tickers else [])
+
+    def to_dict(self):
+        """Plain {ticker: float} dictionary; round-trips exactly through from_dict()"""
+        return dict(zip(self.index.tickers, self.weights.tolist()))
+
+    def with_weight(self, ticker, weight):
+        """New portfolio with one weight changed (the ticker index is shared)"""
+        weights = self.weights.copy()
+        weights[self.index.positions[ticker]] = weight
+        return Portfolio(self.index, weights)
+
+    def normalized(self):
+        """New portfolio scaled to sum to one"""
+        total = self.weights.sum()
+        return Portfolio(self.index, self.weights / total) if total > 0 else self
+
+    def __reduce__(self):
+        # Re-intern the ticker index when unpickled in another process
+        return (Portfolio, (self.index.tickers, self.weights.tolist()))
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # MAPPING PROTOCOL
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @property
+    def tickers(self):
+        return self.index.tickers
+
+    def __getitem__(self, ticker):
+        return float(self.weights[self.index.positions[ticker]])
+
+    def __iter__(self):
+        return iter(self.index.tickers)
+
+    def __len__(self):
+        return len(self.index.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self.index.positions
+
+    def values(self):
+        return self.weights.tolist()
+
+    def items(self):
+        return list(zip(self.index.tickers, self.weights.tolist()))
+
+    def copy(self):
+        """Mutable dictionary copy, for code that edits weights in place"""
+        return self.to_dict()
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.index.tickers, self.weights.tobytes()))
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, Portfolio):
+            # Order-sensitive, like the hash: same interned index and same weights
+            return self.index is other.index and bool(np.array_equal(self.weights, other.weights))
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Portfolio({self.to_dict()!r})"
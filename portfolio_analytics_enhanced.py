@@ -10,7 +10,16 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from config_enhanced import ASSET_STATS, RISK_FREE_RATE
+from config_enhanced import ASSET_STATS, RANDOM_SEED, RISK_FREE_RATE, SCENARIO_SETTINGS
+from risk_model import build_covariance_matrix
+from risk_parity import equal_risk_contribution
+from hierarchical_risk_parity import hierarchical_risk_parity
+from cvar_optimizer import minimize_cvar
+from rebalancing import transaction_cost_table, optimize_rebalance
+from cardinality import cardinality_constrained
+from resampling import resampled_weights
+from random_streams import generator, seed_sequence
+from scenarios import ScenarioGenerator, simulate_scenarios
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PORTFOLIO METRICS CALCULATION
@@ -88,7 +97,11 @@ def calculate_portfolio_metrics(assets, weights, risk_free_rate=None):
 # OPTIMIZE PORTFOLIO
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def optimize_portfolio(assets, initial_weights, objective="Maximize Sharpe Ratio"):
+def optimize_portfolio(assets, initial_weights, objective="Maximize Sharpe Ratio", risk_budgets=None,
+                       expected_returns=None, covariance=None, transaction_costs=None,
+                       max_turnover=None, turnover_penalty=0.0, max_assets=None,
+                       min_weight=0.0, time_limit=2.0, scenario_model=SCENARIO_SETTINGS["model"],
+                       scenario_history=None):
     """
     Optimize portfolio based on selected objective
     
@@ -96,6 +109,24 @@ def optimize_portfolio(assets, initial_weights, objective="Maximize Sharpe Ratio
         assets: List of asset tickers
         initial_weights: Dictionary with ticker: weight mappings
         objective: Optimization objective
+        risk_budgets: Optional dictionary with ticker: risk budget (Risk Parity only);
+            must give a positive budget for every asset with statistics
+        expected_returns: Optional dictionary with ticker: expected return (decimal),
+            e.g. Black-Litterman posterior returns. Defaults to ASSET_STATS.
+        covariance: Optional DataFrame covariance indexed by ticker (decimal units),
+            e.g. the Black-Litterman posterior covariance. Defaults to ASSET_STATS
+            volatilities with the assumed correlation.
+        transaction_costs: Optional dictionary with ticker: one-way cost in bps
+            (Cost-Aware Rebalance only). Defaults to the asset class costs.
+        max_turnover: Optional one-way turnover limit as a fraction (Cost-Aware Rebalance only)
+        turnover_penalty: Extra L1 penalty per unit traded (Cost-Aware Rebalance only)
+        max_assets: Maximum number of holdings (Cardinality Constrained only)
+        min_weight: Minimum position size as a fraction (Cardinality Constrained only)
+        time_limit: Search time budget in seconds (Cardinality Constrained only)
+        scenario_model: Scenario model key from SCENARIO_MODELS (Minimize CVaR only)
+        scenario_history: Optional per-period return history (T x n) of the assets
+            with statistics, for the bootstrap and empirical copula marginals
+            (Minimize CVaR only)
         
     Returns:
         Dictionary with optimized portfolio details
@@ -103,17 +134,30 @@ def optimize_portfolio(assets, initial_weights, objective="Maximize Sharpe Ratio
     # Generate random portfolio variations
     optimized_weights = initial_weights.copy()
     
+    # Inputs: model-supplied estimates take precedence over the static table
+    expected_returns = expected_returns or {}
+    known_assets = [
+        asset for asset in assets
+        if asset in ASSET_STATS or (asset in expected_returns and covariance is not None and asset in covariance.index)
+    ]
+    asset_returns = {asset: expected_returns.get(asset, ASSET_STATS.get(asset, {}).get('return')) for asset in known_assets}
+    
+    mu = np.array([asset_returns[asset] for asset in known_assets], dtype=float)
+    if covariance is not None:
+        cov = covariance.loc[known_assets, known_assets].to_numpy(dtype=float)
+    else:
+        cov = build_covariance_matrix([ASSET_STATS[asset]['volatility'] for asset in known_assets])
+    vols = np.sqrt(np.diag(cov))
+    rank_return, rank_volatility = np.argsort(-mu, kind="stable"), np.argsort(vols, kind="stable")
+    asset_vols = dict(zip(known_assets, vols))
+    
     if objective == "Maximize Returns":
         # Give more weight to high-return assets
-        high_return_assets = sorted(
-            [(asset, ASSET_STATS[asset]['return']) for asset in assets if asset in ASSET_STATS],
-            key=lambda x: x[1],
-            reverse=True
-        )
+        high_return_assets = [known_assets[i] for i in rank_return]
         
         # Reweight toward high return assets
         new_weights = {asset: 0 for asset in assets}
-        for i, (asset, _) in enumerate(high_return_assets):
+        for i, asset in enumerate(high_return_assets):
             new_weights[asset] = (len(high_return_assets) - i) / len(high_return_assets) * 100
         
         total = sum(new_weights.values())
@@ -121,27 +165,102 @@ def optimize_portfolio(assets, initial_weights, objective="Maximize Sharpe Ratio
     
     elif objective == "Minimize Risk":
         # Give more weight to low-volatility assets
-        low_vol_assets = sorted(
-            [(asset, ASSET_STATS[asset]['volatility']) for asset in assets if asset in ASSET_STATS],
-            key=lambda x: x[1]
-        )
+        low_vol_assets = [known_assets[i] for i in rank_volatility]
         
         new_weights = {asset: 0 for asset in assets}
-        for i, (asset, _) in enumerate(low_vol_assets):
+        for i, asset in enumerate(low_vol_assets):
             new_weights[asset] = (len(low_vol_assets) - i) / len(low_vol_assets) * 100
         
         total = sum(new_weights.values())
         optimized_weights = {asset: weight / total * 100 for asset, weight in new_weights.items()}
     
+    elif objective == "Risk Parity":
+        # Equalize (or budget) each asset's contribution to portfolio variance
+        budgets = None
+        if risk_budgets:
+            missing = [asset for asset in known_assets if asset not in risk_budgets]
+            if missing:
+                raise ValueError(f"Risk budgets must cover every asset; missing: {', '.join(missing)}")
+            budgets = [risk_budgets[asset] for asset in known_assets]
+        
+        # Warm start from the current holdings
+        x0 = [initial_weights.get(asset, 0) for asset in known_assets]
+        result = equal_risk_contribution(cov, budgets=budgets, x0=x0 if sum(x0) > 0 else None)
+        
+        optimized_weights = {asset: 0 for asset in assets}
+        for asset, weight in zip(known_assets, result["weights"]):
+            optimized_weights[asset] = float(weight) * 100
+    
+    elif objective == "Hierarchical Risk Parity":
+        # Cluster by correlation and split risk top-down (no covariance inversion)
+        result = hierarchical_risk_parity(cov)
+        
+        optimized_weights = {asset: 0 for asset in assets}
+        for asset, weight in zip(known_assets, result["weights"]):
+            optimized_weights[asset] = float(weight) * 100
+    
+    elif objective == "Minimize CVaR":
+        # Minimize expected loss in the worst 5% of simulated years
+        if scenario_model == "bootstrap" and scenario_history is None:
+            scenario_model = "normal"
+        scenario_generator = ScenarioGenerator(scenario_model, mu, cov, history=scenario_history)
+        scenarios = simulate_scenarios(scenario_generator, 10000, seed=seed_sequence(RANDOM_SEED, "cvar_scenarios"))
+        result = minimize_cvar(scenarios, alpha=0.95, max_scenarios=5000,
+                               seed=generator(RANDOM_SEED, "cvar_subsample"))
+        if result["weights"] is None:
+            raise ValueError(f"CVaR optimization failed: {result['message']}")
+        
+        optimized_weights = {asset: 0 for asset in assets}
+        for asset, weight in zip(known_assets, result["weights"]):
+            optimized_weights[asset] = float(weight) * 100
+    
+    elif objective == "Cost-Aware Rebalance":
+        # Trade away from the current holdings only where it pays for its costs
+        costs = transaction_cost_table(known_assets, transaction_costs)
+        result = optimize_rebalance(
+            [initial_weights.get(asset, 0) for asset in known_assets],
+            [asset_returns[asset] for asset in known_assets],
+            cov,
+            costs_bps=[costs[asset] for asset in known_assets],
+            turnover_penalty=turnover_penalty,
+            max_turnover=max_turnover,
+        )
+        
+        optimized_weights = {asset: 0 for asset in assets}
+        for asset, weight in zip(known_assets, result["weights"]):
+            optimized_weights[asset] = float(weight) * 100
+    
+    elif objective == "Cardinality Constrained":
+        # Best K assets with minimum lots; returns the best portfolio found within the time limit
+        result = cardinality_constrained(
+            [asset_returns[asset] for asset in known_assets],
+            cov,
+            max_assets or len(known_assets),
+            min_weight=min_weight,
+            time_limit=time_limit,
+        )
+        
+        optimized_weights = {asset: 0 for asset in assets}
+        for asset, weight in zip(known_assets, result["weights"]):
+            optimized_weights[asset] = float(weight) * 100
+    
+    elif objective == "Resampled Efficient Frontier":
+        # Michaud resampling: average the optimal weights over re-estimated inputs
+        result = resampled_weights([asset_returns[asset] for asset in known_assets], cov,
+                                   seed=seed_sequence(RANDOM_SEED, "resampled_frontier"))
+        
+        optimized_weights = {asset: 0 for asset in assets}
+        for asset, weight in zip(known_assets, result["weights"]):
+            optimized_weights[asset] = float(weight) * 100
+    
     else:  # Maximize Sharpe Ratio (default)
         # Optimize for risk-adjusted returns
         sharpe_ratios = {}
-        for asset in assets:
-            if asset in ASSET_STATS:
-                ret = ASSET_STATS[asset]['return']
-                vol = ASSET_STATS[asset]['volatility']
-                sharpe = (ret - RISK_FREE_RATE) / vol if vol > 0 else 0
-                sharpe_ratios[asset] = sharpe
+        for asset in known_assets:
+            ret = asset_returns[asset]
+            vol = asset_vols[asset]
+            sharpe = (ret - RISK_FREE_RATE) / vol if vol > 0 else 0
+            sharpe_ratios[asset] = sharpe
         
         sorted_assets = sorted(sharpe_ratios.items(), key=lambda x: x[1], reverse=True)
         new_weights = {asset: 0 for asset in assets}
@@ -159,22 +278,22 @@ def optimize_portfolio(assets, initial_weights, objective="Maximize Sharpe Ratio
 # GENERATE EFFICIENT FRONTIER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def generate_efficient_frontier(assets, num_portfolios=1000):
+def generate_efficient_frontier(assets, num_portfolios=1000, seed=RANDOM_SEED):
     """
     Generate random portfolios for efficient frontier visualization
     
     Args:
         assets: List of asset tickers
         num_portfolios: Number of random portfolios to generate
+        seed: Seed for the random weights (same seed, same cloud)
         
     Returns:
         DataFrame with portfolio returns, volatilities, and sharpe ratios
     """
     frontier_data = []
+    random_weights = generator(seed, "efficient_frontier").dirichlet(np.ones(len(assets)), num_portfolios)
     
-    for _ in range(num_portfolios):
-        # Generate random weights
-        weights = np.random.dirichlet(np.ones(len(assets)), 1)[0]
+    for weights in random_weights:
         weight_dict = {asset: weight * 100 for asset, weight in zip(assets, weights)}
         
         # Calculate metrics
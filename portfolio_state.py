@@ -0,0 +1,156 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - PORTFOLIO STATE
+Incremental O(n) Metric Updates When Individual Weights Change
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+
+# Full recomputation after this many incremental updates, to bound float drift
+REFRESH_EVERY = 1000
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PORTFOLIO STATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PortfolioState:
+    """
+    Portfolio weights with cached Sigma w, return and variance
+
+    Changing weight i by d only needs column i of Sigma:
+        Sigma w  += d * Sigma[:, i]
+        variance += 2 d (Sigma w)_i + d^2 Sigma_ii
+        return   += d * mu_i
+    so a single edit costs O(n) with a dense covariance (O(nk) with a
+    FactorRiskModel) instead of a full O(n^2) recomputation. Risk
+    contributions w * Sigma w are then read off the cached vector.
+
+    Units follow the inputs (the pages use percent returns and volatilities).
+
+    Args:
+        assets: List of tickers
+        expected_returns: Expected returns (n,)
+        cov: Covariance matrix (n x n) or a FactorRiskModel
+        weights: Initial weights (n,), as fractions
+        key: Optional identifier of the market inputs, compared by sync_portfolio_state()
+    """
+
+    def __init__(self, assets, expected_returns, cov, weights=None, key=None):
+        self.assets = list(assets)
+        self.index = {asset: i for i, asset in enumerate(self.assets)}
+        self.mu = np.asarray(expected_returns, dtype=float)
+        self.cov = cov
+        self.key = key
+        self.weights = np.zeros(len(self.assets)) if weights is None else np.array(weights, dtype=float)
+        self.refresh()
+
+    def _column(self, i):
+        if hasattr(self.cov, "column"):
+            return self.cov.column(i)
+        return np.asarray(self.cov[:, i], dtype=float)
+
+    def refresh(self):
+        """Recompute the cached quantities from scratch (O(n^2) dense, O(nk) factor)"""
+        self.sigma_w = np.asarray(self.cov @ self.weights, dtype=float)
+        self._variance = float(self.weights @ self.sigma_w)
+        self._return = float(self.mu @ self.weights)
+        self.updates = 0
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # UPDATES
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def update(self, asset, weight):
+        """
+        Set one asset's weight in O(n)
+
+        Args:
+            asset: Ticker or position index
+            weight: New weight (fraction)
+        """
+        i = self.index[asset] if isinstance(asset, str) else int(asset)
+        delta = float(weight) - self.weights[i]
+        if delta == 0.0:
+            return
+
+        column = self._column(i)
+        self._variance += 2.0 * delta * self.sigma_w[i] + delta * delta * column[i]
+        self._return += delta * self.mu[i]
+        self.sigma_w += delta * column
+        self.weights[i] = weight
+
+        self.updates += 1
+        if self.updates >= REFRESH_EVERY:
+            self.refresh()
+
+    def set_weights(self, weights):
+        """
+        Apply a {ticker: weight} mapping, updating only the entries that changed
+
+        Returns:
+            Number of weights that changed
+        """
+        changed = 0
+        for asset, weight in weights.items():
+            i = self.index.get(asset)
+            if i is not None and self.weights[i] != weight:
+                self.update(i, weight)
+                changed += 1
+        return changed
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # METRICS
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @property
+    def expected_return(self):
+        return self._return
+
+    @property
+    def variance(self):
+        return max(self._variance, 0.0)
+
+    @property
+    def volatility(self):
+        return float(np.sqrt(self.variance))
+
+    def sharpe_ratio(self, risk_free_rate):
+        """(Return - risk-free rate) / volatility, with the rate in the same units"""
+        vol = self.volatility
+        return (self._return - risk_free_rate * self.weights.sum()) / vol if vol > 0 else 0.0
+
+    def risk_contributions(self):
+        """Fraction of portfolio variance from each asset, from the cached Sigma w"""
+        contributions = self.weights * self.sigma_w
+        total = contributions.sum()
+        return contributions / total if total > 0 else contributions
+
+    def weights_dict(self):
+        return dict(zip(self.assets, self.weights.tolist()))
+
+
+def sync_portfolio_state(state, assets, expected_returns, cov, weights, key=None):
+    """
+    Reuse a session's PortfolioState across reruns
+
+    The existing state is kept when it was built for the same assets and
+    market inputs (same key); only the weights that differ are updated.
+    Otherwise a new state is built.
+
+    Args:
+        state: Existing PortfolioState or None
+        assets: List of tickers
+        expected_returns: Expected returns (n,)
+        cov: Covariance matrix or FactorRiskModel for the assets
+        weights: Dictionary with ticker: weight (fractions)
+        key: Identifier of the market inputs (e.g. tuple of returns and volatilities)
+
+    Returns:
+        Up-to-date PortfolioState
+    """
+    if state is None or state.assets != list(assets) or state.key != key:
+        return PortfolioState(assets, expected_returns, cov, [weights.get(asset, 0.0) for asset in assets], key=key)
+    state.set_weights(weights)
+    return state
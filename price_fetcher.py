@@ -0,0 +1,258 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - PRICE FETCHER
+Batched, Rate-Limited, Concurrent Price Downloads with a Local Cache
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from config_enhanced import PRICE_CACHE_DIR, PRICE_FETCH
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROVIDERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _date_slice(frame, start=None, end=None):
+    """Rows with start <= date < end; end is exclusive, as for the providers"""
+    index = frame.index
+    lo = 0 if start is None else index.searchsorted(pd.Timestamp(start), side="left")
+    hi = len(index) if end is None else index.searchsorted(pd.Timestamp(end), side="left")
+    return frame.iloc[lo:hi]
+
+
+class YFinanceProvider:
+    """Adjusted close prices from Yahoo Finance, many tickers per request"""
+
+    def download(self, tickers, start=None, end=None):
+        """
+        Args:
+            tickers: List of tickers for one request
+            start, end: Optional date bounds
+
+        Returns:
+            DataFrame of prices (dates x tickers)
+        """
+        import yfinance as yf
+
+        data = yf.download(list(tickers), start=start, end=end, auto_adjust=True,
+                           progress=False, group_by="column", threads=False)
+        if data.empty:
+            return pd.DataFrame(columns=list(tickers))
+        prices = data["Close"]
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame(name=tickers[0])
+        return prices
+
+
+class FixtureProvider:
+    """
+    Offline provider serving prices from a DataFrame (tests and demos)
+
+    Args:
+        prices: DataFrame of prices (dates x tickers)
+        latency: Simulated seconds per request
+        failures: Number of initial requests that raise, to exercise retries
+    """
+
+    def __init__(self, prices, latency=0.0, failures=0):
+        self.prices = prices
+        self.latency = latency
+        self.failures = failures
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def download(self, tickers, start=None, end=None):
+        with self._lock:
+            self.requests += 1
+            fail = self.failures > 0
+            self.failures -= fail
+        time.sleep(self.latency)
+        if fail:
+            raise ConnectionError("Simulated provider failure")
+        available = [ticker for ticker in tickers if ticker in self.prices.columns]
+        return _date_slice(self.prices, start, end)[available]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RATE LIMITER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RateLimiter:
+    """Thread-safe limiter spacing requests at most requests_per_second apart"""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        time.sleep(max(slot - now, 0.0))
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOCAL PRICE CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PriceCache:
+    """
+    One CSV of prices per ticker under a cache directory
+
+    Writes go to a temporary file and are renamed into place, so
+    concurrent readers never see a partial file. The directory is created
+    on the first write.
+
+    Args:
+        directory: Cache directory
+        max_age_hours: Entries older than this are treated as missing
+    """
+
+    def __init__(self, directory=PRICE_CACHE_DIR, max_age_hours=PRICE_FETCH["cache_max_age_hours"]):
+        self.directory = directory
+        self.max_age = max_age_hours * 3600 if max_age_hours is not None else None
+
+    def _path(self, ticker):
+        return os.path.join(self.directory, f"{ticker.replace('/', '_')}.csv")
+
+    def is_fresh(self, ticker, start=None, end=None):
+        """True if the ticker is cached, recent enough and covers [start, end]"""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return False
+        if self.max_age is not None and time.time() - os.path.getmtime(path) >= self.max_age:
+            return False
+        if start is None and end is None:
+            return True
+        first, last = self._date_range(path)
+        if first is None:
+            return False
+        if start is not None and first > pd.Timestamp(start):
+            return False
+        # end is exclusive for the providers and may fall on a non-trading day
+        return end is None or last >= pd.Timestamp(end) - pd.offsets.BDay(1)
+
+    @staticmethod
+    def _date_range(path):
+        """First and last dates of a cached file without parsing it (rows are sorted by date)"""
+        with open(path, "rb") as f:
+            f.readline()
+            first = f.readline().split(b",", 1)[0].decode()
+            if not first:
+                return None, None
+            f.seek(max(os.path.getsize(path) - 256, 0))
+            last = f.read().strip().splitlines()[-1].split(b",", 1)[0].decode()
+        return pd.Timestamp(first), pd.Timestamp(last)
+
+    def stamp(self, ticker):
+        """(mtime_ns, size) of the cached file, or None; changes whenever it is rewritten"""
+        try:
+            stat = os.stat(self._path(ticker))
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self, ticker):
+        """Cached price series of one ticker, or None"""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path, index_col=0, parse_dates=True).iloc[:, 0].rename(ticker)
+
+    def write(self, ticker, prices):
+        """Merge prices into the cached series (new values win) and replace the file"""
+        path = self._path(ticker)
+        prices = prices.dropna().rename(ticker)
+        cached = self.read(ticker)
+        if cached is not None:
+            prices = prices.combine_first(cached).sort_index()
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        prices.to_frame().to_csv(tmp)
+        os.replace(tmp, path)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BATCHED FETCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _download_with_retry(provider, batch, start, end, limiter, max_retries, backoff_seconds):
+    """One batch request with exponential backoff and jitter between attempts"""
+    for attempt in range(max_retries + 1):
+        limiter.wait()
+        try:
+            return provider.download(batch, start, end)
+        except Exception:
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff_seconds * (2 ** attempt) * (0.5 + random.random()))
+
+
+def fetch_prices(tickers, start=None, end=None, provider=None, cache=None, refresh=False,
+                 batch_size=PRICE_FETCH["batch_size"], max_workers=PRICE_FETCH["max_workers"],
+                 max_retries=PRICE_FETCH["max_retries"], backoff_seconds=PRICE_FETCH["backoff_seconds"],
+                 requests_per_second=PRICE_FETCH["requests_per_second"]):
+    """
+    Prices for many tickers, served from the local cache where fresh
+
+    Missing or stale tickers are grouped into multi-ticker requests that
+    run on a bounded thread pool under a shared rate limit. Each batch is
+    retried with exponential backoff, and its prices are written to the
+    cache as soon as it arrives, so an interrupted refresh keeps its
+    progress.
+
+    Args:
+        tickers: List of tickers
+        start, end: Optional date bounds
+        provider: Object with download(tickers, start, end); defaults to Yahoo Finance
+        cache: PriceCache; defaults to the configured cache directory
+        refresh: Ignore cached prices and download everything
+        batch_size: Tickers per request
+        max_workers: Maximum concurrent requests
+        max_retries: Retries per batch after the first attempt
+        backoff_seconds: Initial retry delay
+        requests_per_second: Shared request rate limit (None for no limit)
+
+    Returns:
+        Tuple of (DataFrame of prices (dates x tickers), list of failed tickers)
+    """
+    provider = provider or YFinanceProvider()
+    cache = cache or PriceCache()
+    tickers = list(dict.fromkeys(tickers))
+
+    to_fetch = tickers if refresh else [ticker for ticker in tickers if not cache.is_fresh(ticker, start, end)]
+    batches = [to_fetch[i:i + batch_size] for i in range(0, len(to_fetch), batch_size)]
+    limiter = RateLimiter(requests_per_second)
+    failed = []
+
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            futures = {
+                pool.submit(_download_with_retry, provider, batch, start, end, limiter, max_retries, backoff_seconds): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    prices = future.result()
+                except Exception:
+                    failed.extend(batch)
+                    continue
+                for ticker in batch:
+                    if ticker in prices.columns and prices[ticker].notna().any():
+                        cache.write(ticker, prices[ticker])
+                    else:
+                        failed.append(ticker)
+
+    series = [cache.read(ticker) for ticker in tickers if ticker not in failed]
+    prices = pd.concat([s for s in series if s is not None], axis=1, sort=True) if series else pd.DataFrame()
+    if not prices.empty:
+        prices = _date_slice(prices.sort_index(), start, end)
+    return prices, failed
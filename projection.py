@@ -0,0 +1,136 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - WEALTH PROJECTION
+Monte Carlo Wealth Paths in Fixed-Size Blocks with Online Percentiles
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config_enhanced import PROJECTION, RANDOM_SEED, RETURN_STORE_PERIODS_PER_YEAR, SCENARIO_SETTINGS
+from random_streams import block_seeds, generator
+from scenarios import ScenarioGenerator
+from streaming_stats import Histogram, Moments
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SIMULATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _simulate_block(W, scenario_generator, n_steps, m, log_edges, log_goal, seed):
+    """
+    Simulate one block of m paths on its own random stream
+
+    Returns:
+        Tuple of (log-wealth Histogram, final-wealth Moments, goal hits (P,))
+    """
+    rng = generator(seed)
+    histograms = Histogram(log_edges, shape=(len(W), n_steps + 1))
+    final_wealth = Moments(shape=(len(W),))
+
+    log_wealth = np.zeros((m, len(W)))
+    histograms.add(log_wealth, (slice(None), 0))
+    for step in range(1, n_steps + 1):
+        asset_returns = scenario_generator.sample(rng, m)
+        portfolio_returns = np.maximum(asset_returns @ W.T, -0.99)
+        log_wealth += np.log1p(portfolio_returns)
+        histograms.add(log_wealth, (slice(None), step))
+    final_wealth.add(np.exp(log_wealth))
+    goal_hits = (log_wealth >= log_goal).sum(axis=0) if log_goal is not None else np.zeros(len(W))
+    return histograms, final_wealth, goal_hits
+
+
+def _merge_blocks(blocks):
+    """Fold block results together in block order"""
+    histograms, final_wealth, goal_hits = next(blocks)
+    for block_histograms, block_wealth, block_hits in blocks:
+        histograms.merge(block_histograms)
+        final_wealth.merge(block_wealth)
+        goal_hits = goal_hits + block_hits
+    return histograms, final_wealth, goal_hits
+
+
+def project_wealth(weights, expected_returns, cov, years, initial_wealth=1.0, goal=None,
+                   n_paths=PROJECTION["n_paths"], block_size=PROJECTION["block_size"],
+                   steps_per_year=PROJECTION["steps_per_year"], percentiles=PROJECTION["percentiles"],
+                   model="normal", dof=SCENARIO_SETTINGS["dof"], history=None, seed=RANDOM_SEED, n_jobs=1):
+    """
+    Simulate correlated wealth paths for one or more portfolios
+
+    Asset returns are drawn per step from a scenario model (scenarios.py)
+    with the annual estimates scaled to the step, and every portfolio is
+    applied to the same draws (rebalanced to its weights each step), so
+    differences between portfolios are not simulation noise. Paths are generated in
+    blocks of block_size and folded into streaming accumulators (log-wealth
+    histograms at every step, moments of final wealth), so memory is
+    bounded by the accumulators, not by n_paths.
+
+    Block i always draws from child stream i of the seed and blocks are
+    merged in block order, so the result is bit-identical for any n_jobs.
+
+    Args:
+        weights: Weights (n,) or (P x n) as fractions
+        expected_returns: Annual expected returns (n,), decimal
+        cov: Annual covariance matrix (n x n), decimal
+        years: Horizon in years
+        initial_wealth: Starting wealth
+        goal: Optional target wealth for the attainment probability
+        n_paths: Number of simulated paths
+        block_size: Paths generated per block
+        steps_per_year: Time steps per year (12 = monthly)
+        percentiles: Percentiles for the fan chart
+        model: Scenario model key (SCENARIO_MODELS)
+        dof: Degrees of freedom of the Student-t models
+        history: Optional per-period return history (T x n) for the
+            bootstrap and empirical copula marginals
+        seed: Root seed (None is not reproducible)
+        n_jobs: Worker processes for the blocks. None uses every core; 1 runs in-process.
+
+    Returns:
+        Dictionary with times (years), percentiles (P x steps+1 x q) in
+        wealth units, mean_final (P,), goal_probability (P,) or None, and
+        the number of paths
+    """
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+    scenario_generator = ScenarioGenerator(
+        model,
+        np.asarray(expected_returns, dtype=float) / steps_per_year,
+        np.asarray(cov, dtype=float) / steps_per_year,
+        dof=dof,
+        history=history,
+        horizon=max(1, round(RETURN_STORE_PERIODS_PER_YEAR / steps_per_year)),
+    )
+    n_steps = int(round(years * steps_per_year))
+
+    # Log wealth per (portfolio, step) on a fixed grid; counts add up across blocks.
+    # The grid covers the configured range, widened for volatile portfolios and
+    # long horizons to the lognormal drift +/- range_sigmas standard deviations.
+    variance = np.einsum("pi,ij,pj->p", W, np.asarray(cov, dtype=float), W)
+    drift = (W @ np.asarray(expected_returns, dtype=float) - variance / 2) * years
+    spread = PROJECTION["range_sigmas"] * np.sqrt(variance * years)
+    log_lo = min(PROJECTION["log_range"][0], (drift - spread).min())
+    log_hi = max(PROJECTION["log_range"][1], (drift + spread).max())
+    log_edges = np.linspace(log_lo, log_hi, PROJECTION["bins"] + 1)
+    log_goal = np.log(goal / initial_wealth) if goal else None
+
+    n_blocks = int(np.ceil(n_paths / block_size))
+    sizes = [min(block_size, n_paths - b * block_size) for b in range(n_blocks)]
+    jobs = [(W, scenario_generator, n_steps, m, log_edges, log_goal, s)
+            for m, s in zip(sizes, block_seeds(seed, n_blocks, "projection"))]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or n_blocks == 1:
+        histograms, final_wealth, goal_hits = _merge_blocks(_simulate_block(*job) for job in jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_blocks)) as pool:
+            histograms, final_wealth, goal_hits = _merge_blocks(pool.map(_simulate_block, *zip(*jobs)))
+
+    return {
+        "times": np.arange(n_steps + 1) / steps_per_year,
+        "percentile_levels": list(percentiles),
+        "percentiles": np.exp(histograms.quantiles(np.asarray(percentiles) / 100)) * initial_wealth,
+        "mean_final": final_wealth.mean * initial_wealth,
+        "goal_probability": goal_hits / n_paths if log_goal is not None else None,
+        "n_paths": n_paths,
+    }
@@ -0,0 +1,90 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RANDOM STREAMS
+Independent, Reproducible numpy Generators per Job and per Chunk
+═══════════════════════════════════════════════════════════════════════════════
+
+Nothing here touches numpy's global random state, so concurrent Streamlit
+sessions and worker processes never disturb each other. A stream is fully
+determined by (seed, key...), and chunk i of a job always gets the same
+child stream whichever worker runs it, so parallel results are
+bit-reproducible regardless of the worker count and can be cached by seed.
+"""
+
+import zlib
+import numpy as np
+from config_enhanced import RANDOM_SEED
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SEED SEQUENCES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _key_word(part):
+    """Stable 32-bit word for a key part (ints as is, strings by CRC32)"""
+    if isinstance(part, (int, np.integer)) and part >= 0:
+        return int(part)
+    return zlib.crc32(str(part).encode())
+
+
+def seed_sequence(seed=RANDOM_SEED, *key):
+    """
+    SeedSequence for a named stream
+
+    Args:
+        seed: Root seed (None draws fresh OS entropy, i.e. not reproducible)
+            or a SeedSequence to derive the stream from
+        key: Stream name parts, e.g. ("efficient_frontier",) or ("projection", 3)
+
+    Returns:
+        np.random.SeedSequence
+    """
+    words = tuple(_key_word(part) for part in key)
+    if isinstance(seed, np.random.SeedSequence):
+        # Built directly rather than with spawn(), which advances the parent's
+        # child counter and would give a different stream on every call
+        return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + words, pool_size=seed.pool_size)
+    return np.random.SeedSequence(seed, spawn_key=words)
+
+
+def generator(seed=RANDOM_SEED, *key):
+    """
+    Generator for a named stream
+
+    An existing Generator is passed through unchanged, so functions can
+    accept either a seed or a caller-managed Generator.
+
+    Returns:
+        np.random.Generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.Generator(np.random.PCG64(seed_sequence(seed, *key)))
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-CHUNK STREAMS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def block_seeds(seed, n_blocks, *key):
+    """
+    One independent child SeedSequence per chunk of a job
+
+    Child i depends only on (seed, key, i), so chunks can be handed to any
+    worker in any order and repeated calls give the same children.
+    SeedSequences pickle cheaply for process pools.
+
+    Args:
+        seed: Root seed or SeedSequence
+        n_blocks: Number of chunks
+        key: Stream name parts
+
+    Returns:
+        List of np.random.SeedSequence
+    """
+    parent = seed_sequence(seed, *key)
+    return [seed_sequence(parent, i) for i in range(n_blocks)]
+
+
+def block_generators(seed, n_blocks, *key):
+    """One independent Generator per chunk of a job (see block_seeds)"""
+    return [np.random.Generator(np.random.PCG64(child)) for child in block_seeds(seed, n_blocks, *key)]
@@ -0,0 +1,135 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - COST-AWARE REBALANCING
+Mean-Variance Rebalancing with Turnover Penalties and Transaction Costs
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+from scipy.optimize import minimize
+from config_enhanced import (
+    RISK_AVERSION,
+    TICKER_CLASS,
+    TRANSACTION_COST_BPS,
+    DEFAULT_TRANSACTION_COST_BPS,
+)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COST TABLE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def transaction_cost_table(assets, overrides=None):
+    """
+    One-way transaction costs per asset, in basis points
+
+    Costs come from the asset class of each ticker (TRANSACTION_COST_BPS),
+    falling back to DEFAULT_TRANSACTION_COST_BPS for unknown tickers.
+
+    Args:
+        assets: List of asset tickers
+        overrides: Optional {ticker: bps} taking precedence over the class costs
+
+    Returns:
+        Dictionary {ticker: bps}
+    """
+    overrides = overrides or {}
+    table = {}
+    for asset in assets:
+        if asset in overrides:
+            table[asset] = float(overrides[asset])
+        else:
+            asset_class = TICKER_CLASS.get(asset)
+            table[asset] = float(TRANSACTION_COST_BPS.get(asset_class, DEFAULT_TRANSACTION_COST_BPS))
+    return table
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REBALANCING OPTIMIZER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def optimize_rebalance(current_weights, expected_returns, cov, costs_bps=None,
+                       risk_aversion=RISK_AVERSION, turnover_penalty=0.0,
+                       max_turnover=None, max_weight=1.0, tol=1e-10, max_iter=500):
+    """
+    Long-only rebalance from current holdings, net of trading costs
+
+    The trade is split into buys b and sells s (both >= 0) so that
+    w = w0 + b - s and the L1 trade size |w - w0| becomes the linear term
+    sum(b + s). The problem
+
+        min   -mu'w + (delta / 2) w'Sigma w + sum((c_i + lambda) (b_i + s_i))
+        s.t.  sum(b) = sum(s),  0 <= w0 + b - s <= max_weight
+              sum(b + s) / 2 <= max_turnover (optional)
+
+    is a convex QP, solved with SLSQP from b = s = 0, i.e. warm-started at
+    the current holdings. A trade only happens where its expected utility
+    gain exceeds its cost, so small reallocations are left alone.
+
+    Args:
+        current_weights: Current portfolio weights (n,), summing to 1
+        expected_returns: Expected returns (n,), decimal units
+        cov: Covariance matrix (n x n), decimal units
+        costs_bps: One-way transaction costs per asset in basis points (n,)
+        risk_aversion: Risk aversion coefficient (delta)
+        turnover_penalty: Extra L1 penalty (lambda) per unit traded
+        max_turnover: Optional one-way turnover limit (fraction of the portfolio)
+        max_weight: Upper bound per asset
+        tol: Solver tolerance
+        max_iter: Maximum number of SLSQP iterations
+
+    Returns:
+        Dictionary with weights, buys, sells, turnover, cost, converged and message
+    """
+    w0 = np.asarray(current_weights, dtype=float)
+    w0 = w0 / w0.sum()
+    mu = np.asarray(expected_returns, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(w0)
+
+    costs = np.zeros(n) if costs_bps is None else np.asarray(costs_bps, dtype=float) / 10_000
+    trade_costs = np.concatenate([costs, costs]) + turnover_penalty
+
+    def split(x):
+        return x[:n], x[n:]
+
+    def objective(x):
+        buys, sells = split(x)
+        w = w0 + buys - sells
+        return -mu @ w + 0.5 * risk_aversion * (w @ cov @ w) + trade_costs @ x
+
+    def gradient(x):
+        buys, sells = split(x)
+        grad_w = -mu + risk_aversion * (cov @ (w0 + buys - sells))
+        return np.concatenate([grad_w, -grad_w]) + trade_costs
+
+    trade = np.hstack([np.eye(n), -np.eye(n)])
+    constraints = [
+        {"type": "eq", "fun": lambda x: x[:n].sum() - x[n:].sum(),
+         "jac": lambda x: np.concatenate([np.ones(n), -np.ones(n)])},
+        {"type": "ineq", "fun": lambda x: w0 + trade @ x, "jac": lambda x: trade},
+        {"type": "ineq", "fun": lambda x: max_weight - (w0 + trade @ x), "jac": lambda x: -trade},
+    ]
+    if max_turnover is not None:
+        constraints.append({"type": "ineq", "fun": lambda x: max_turnover - 0.5 * x.sum(),
+                            "jac": lambda x: -0.5 * np.ones(2 * n)})
+
+    result = minimize(objective, np.zeros(2 * n), jac=gradient, method="SLSQP",
+                      bounds=[(0.0, None)] * (2 * n), constraints=constraints,
+                      options={"ftol": tol, "maxiter": max_iter})
+
+    buys, sells = split(np.clip(result.x, 0.0, None))
+    # Net out round trips left by the solver within tolerance
+    net = buys - sells
+    buys, sells = np.clip(net, 0.0, None), np.clip(-net, 0.0, None)
+    weights = np.clip(w0 + net, 0.0, None)
+    weights /= weights.sum()
+
+    return {
+        "weights": weights,
+        "buys": buys,
+        "sells": sells,
+        "turnover": 0.5 * (buys.sum() + sells.sum()),
+        "cost": costs @ (buys + sells),
+        "converged": bool(result.success),
+        "message": result.message,
+    }
@@ -0,0 +1,140 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RESAMPLED OPTIMIZATION
+Michaud Resampled Mean-Variance Weights with Confidence Bands
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import minimize
+from config_enhanced import RISK_AVERSION
+from random_streams import block_seeds, generator
+
+DEFAULT_BATCH_SIZE = 50
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SINGLE SOLVE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def mean_variance_weights(mu, cov, risk_aversion=RISK_AVERSION, max_weight=1.0, x0=None):
+    """
+    Long-only mean-variance weights (max mu'w - (delta / 2) w'Sigma w)
+
+    Args:
+        mu: Expected returns (n,), decimal units
+        cov: Covariance matrix (n x n), decimal units
+        risk_aversion: Risk aversion coefficient (delta)
+        max_weight: Upper bound per asset
+        x0: Optional starting weights (warm start)
+
+    Returns:
+        Numpy array of weights summing to 1
+    """
+    n = len(mu)
+    x0 = np.full(n, 1.0 / n) if x0 is None else x0
+
+    def objective(w):
+        return -(mu @ w) + 0.5 * risk_aversion * (w @ cov @ w)
+
+    def gradient(w):
+        return -mu + risk_aversion * (cov @ w)
+
+    result = minimize(objective, x0, jac=gradient, method="SLSQP",
+                      bounds=[(0.0, max_weight)] * n,
+                      constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: np.ones(n)}],
+                      options={"ftol": 1e-10, "maxiter": 200})
+    weights = np.clip(result.x, 0.0, None)
+    return weights / weights.sum()
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BATCHED RESAMPLING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _resample_batch(mu, cov, n_draws, n_obs, periods_per_year, risk_aversion, max_weight, x0, seed):
+    """
+    Solve one batch of resampled problems
+
+    All draws of the batch are simulated in one call and their sample
+    moments computed with a single einsum; each solve is warm-started from
+    the previous solution in the batch.
+
+    Returns:
+        Array of weights (n_draws x n)
+    """
+    rng = generator(seed)
+    n = len(mu)
+    chol = np.linalg.cholesky(cov / periods_per_year)
+
+    samples = mu / periods_per_year + rng.standard_normal((n_draws, n_obs, n)) @ chol.T
+    sample_mu = samples.mean(axis=1)
+    centered = samples - sample_mu[:, None, :]
+    sample_cov = np.einsum("dti,dtj->dij", centered, centered) / (n_obs - 1)
+
+    weights = np.empty((n_draws, n))
+    previous = x0
+    for d in range(n_draws):
+        previous = mean_variance_weights(sample_mu[d] * periods_per_year, sample_cov[d] * periods_per_year,
+                                         risk_aversion, max_weight, x0=previous)
+        weights[d] = previous
+    return weights
+
+
+def resampled_weights(mu, cov, n_resamples=500, n_obs=60, periods_per_year=12,
+                      risk_aversion=RISK_AVERSION, max_weight=1.0, band=(5, 95),
+                      batch_size=DEFAULT_BATCH_SIZE, n_jobs=None, seed=None):
+    """
+    Michaud resampled weights: average of optimal weights over simulated histories
+
+    Each resample draws n_obs periods of returns from N(mu, Sigma), re-estimates
+    mu and Sigma from them and solves the mean-variance problem. Resamples are
+    split into batches that run in parallel across a process pool.
+
+    Args:
+        mu: Expected returns (n,), decimal units
+        cov: Covariance matrix (n x n), decimal units
+        n_resamples: Number of resampled problems
+        n_obs: Simulated history length per resample (estimation window)
+        periods_per_year: Frequency of the simulated history
+        risk_aversion: Risk aversion coefficient (delta)
+        max_weight: Upper bound per asset
+        band: Lower and upper percentiles of the weight confidence bands
+        batch_size: Resamples per batch (unit of work sent to a process)
+        n_jobs: Worker processes. None uses every core; 1 runs in-process.
+        seed: Root seed or SeedSequence for reproducible resampling
+
+    Returns:
+        Dictionary with weights (resampled average), point_weights (single
+        solve on mu and Sigma), lower, upper and samples (n_resamples x n)
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+
+    point = mean_variance_weights(mu, cov, risk_aversion, max_weight)
+
+    n_batches = int(np.ceil(n_resamples / batch_size))
+    sizes = [min(batch_size, n_resamples - b * batch_size) for b in range(n_batches)]
+    seeds = block_seeds(seed, n_batches)
+    jobs = [(mu, cov, size, n_obs, periods_per_year, risk_aversion, max_weight, point, s)
+            for size, s in zip(sizes, seeds)]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or n_batches == 1:
+        batches = [_resample_batch(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_batches)) as pool:
+            batches = list(pool.map(_resample_batch, *zip(*jobs)))
+
+    samples = np.vstack(batches)
+    average = samples.mean(axis=0)
+    lower, upper = np.percentile(samples, band, axis=0)
+
+    return {
+        "weights": average / average.sum(),
+        "point_weights": point,
+        "lower": lower,
+        "upper": upper,
+        "samples": samples,
+    }
@@ -0,0 +1,245 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RETURN STORE
+Memory-Mapped Return Matrix with Ticker/Date Sidecar (Zero-Copy Reads)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import glob
+import json
+import os
+import threading
+import uuid
+import numpy as np
+from config_enhanced import RETURN_STORE_PATH
+
+FORMAT_VERSION = 2
+DATA_FILE = "returns.dat"          # Data file of format 1 stores (one fixed name)
+DATA_PATTERN = "returns-*.dat"     # Format 2: one uniquely named data file per write
+INDEX_FILE = "index.json"
+OPEN_ATTEMPTS = 3
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WRITING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def write_return_store(returns, tickers, dates, path=RETURN_STORE_PATH, dtype=np.float64):
+    """
+    Write a (dates x tickers) return matrix as a memory-mappable store
+
+    The matrix is stored column-major, so each ticker's full history is one
+    contiguous block and column reads are plain views into the mapping.
+    Each write creates a new uniquely named data file; the index names the
+    data file it describes and is the single file swapped into place, so
+    a reader always gets a matching (index, data) pair.
+
+    Args:
+        returns: Return matrix (T x n); NaN marks missing observations
+        tickers: List of n tickers (column order)
+        dates: Sequence of T dates (anything with an ISO string form)
+        path: Store directory
+        dtype: np.float32 or np.float64
+    """
+    returns = np.asarray(returns)
+    dates = [str(np.datetime64(date, "D")) for date in dates]
+    if returns.shape != (len(dates), len(tickers)):
+        raise ValueError("returns shape must be (len(dates), len(tickers))")
+
+    os.makedirs(path, exist_ok=True)
+    data_file = DATA_PATTERN.replace("*", uuid.uuid4().hex[:12])
+    index_tmp = os.path.join(path, f"{INDEX_FILE}.{data_file}.tmp")
+
+    matrix = np.memmap(os.path.join(path, data_file), dtype=dtype, mode="w+", shape=returns.shape, order="F")
+    matrix[:] = returns
+    matrix.flush()
+    del matrix
+
+    with open(index_tmp, "w") as f:
+        json.dump({
+            "format_version": FORMAT_VERSION,
+            "data_file": data_file,
+            "dtype": np.dtype(dtype).name,
+            "shape": list(returns.shape),
+            "order": "F",
+            "tickers": list(tickers),
+            "dates": dates,
+        }, f)
+    os.replace(index_tmp, os.path.join(path, INDEX_FILE))
+
+    # Remove data files the index no longer names (a concurrent writer may have
+    # swapped in its own). Open mappings keep their data on POSIX; a reader that
+    # has not opened its file yet retries with the new index (see ReturnStore).
+    with open(os.path.join(path, INDEX_FILE)) as f:
+        current = json.load(f).get("data_file", DATA_FILE)
+    for old in glob.glob(os.path.join(path, DATA_PATTERN)) + [os.path.join(path, DATA_FILE)]:
+        if os.path.basename(old) != current:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# READING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _map_data(data_path, index):
+    """Read-only mapping of a data file, checked against the size the index describes"""
+    shape = tuple(index["shape"])
+    expected = int(np.prod(shape)) * np.dtype(index["dtype"]).itemsize
+    actual = os.path.getsize(data_path)
+    if actual != expected:
+        raise ValueError(f"Return store data file has {actual} bytes, index describes {expected}")
+    return np.memmap(data_path, dtype=index["dtype"], mode="r", shape=shape, order=index["order"])
+
+
+class ReturnStore:
+    """
+    Read-only view of a return store
+
+    The matrix is opened with np.memmap in read-only mode; every session
+    and worker process mapping the same file shares the OS page cache, so
+    the data is held in memory once per machine.
+
+    Args:
+        path: Store directory
+    """
+
+    def __init__(self, path=RETURN_STORE_PATH):
+        self.path = path
+        for attempt in range(OPEN_ATTEMPTS):
+            with open(os.path.join(path, INDEX_FILE)) as f:
+                index = json.load(f)
+            if index["format_version"] not in (1, FORMAT_VERSION):
+                raise ValueError(f"Unsupported return store format: {index['format_version']}")
+            try:
+                self.matrix = _map_data(os.path.join(path, index.get("data_file", DATA_FILE)), index)
+                break
+            except FileNotFoundError:
+                # A concurrent write replaced the store after the index was read
+                if attempt == OPEN_ATTEMPTS - 1:
+                    raise
+
+        self.tickers = index["tickers"]
+        self.dates = np.array(index["dates"], dtype="datetime64[D]")
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def __contains__(self, ticker):
+        return ticker in self._columns
+
+    def _rows(self, start=None, end=None):
+        """Row slice covering [start, end] (dates are sorted)"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        return slice(lo, hi)
+
+    def column(self, ticker, start=None, end=None):
+        """Return history of one ticker as a zero-copy view"""
+        return self.matrix[self._rows(start, end), self._columns[ticker]]
+
+    def columns(self, tickers, start=None, end=None):
+        """List of zero-copy column views, one per ticker"""
+        rows = self._rows(start, end)
+        return [self.matrix[rows, self._columns[ticker]] for ticker in tickers]
+
+    def block(self, tickers, start=None, end=None):
+        """
+        (T x k) matrix for the tickers
+
+        A view when the tickers are adjacent columns in store order, a copy
+        of just those columns otherwise.
+        """
+        rows = self._rows(start, end)
+        cols = [self._columns[ticker] for ticker in tickers]
+        if not cols:
+            return np.empty((rows.stop - rows.start, 0), dtype=self.matrix.dtype)
+        if cols == list(range(cols[0], cols[0] + len(cols))):
+            return self.matrix[rows, cols[0]:cols[0] + len(cols)]
+        return self.matrix[rows][:, cols]
+
+    def date_range(self, start=None, end=None):
+        """Dates covered by [start, end]"""
+        return self.dates[self._rows(start, end)]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROCESS-WIDE HANDLES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_open_stores = {}
+_open_lock = threading.Lock()
+
+
+def open_return_store(path=RETURN_STORE_PATH):
+    """
+    Shared ReturnStore handle for this process
+
+    Handles are reused until the index file changes on disk (a rewrite),
+    at which point the new version is mapped.
+    """
+    stamp = os.stat(os.path.join(path, INDEX_FILE)).st_mtime_ns
+    with _open_lock:
+        cached = _open_stores.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, ReturnStore(path))
+            _open_stores[path] = cached
+        return cached[1]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ANALYTICS ON STORE COLUMNS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def portfolio_returns(store, weights, start=None, end=None):
+    """
+    Historical portfolio return series, accumulated column by column
+
+    Only the (T,) result is allocated; the asset histories are read as
+    views. Missing observations count as zero return.
+
+    Args:
+        store: ReturnStore
+        weights: Dictionary with ticker: weight (fractions)
+        start, end: Optional date bounds
+
+    Returns:
+        Numpy array of portfolio returns (T,)
+    """
+    rows = store._rows(start, end)
+    total = np.zeros(rows.stop - rows.start)
+    for ticker, weight in weights.items():
+        column = store.column(ticker, start, end)
+        total += weight * np.nan_to_num(column, nan=0.0)
+    return total
+
+
+def store_covariance(store, tickers, start=None, end=None, chunk_rows=2520):
+    """
+    Sample covariance of the tickers, streamed over row chunks
+
+    Memory stays O(chunk_rows * k + k^2) regardless of history length.
+    Rows with any missing value among the tickers are skipped.
+
+    Returns:
+        Covariance matrix (k x k) in per-period units
+    """
+    rows = store._rows(start, end)
+    k = len(tickers)
+    count = 0
+    total = np.zeros(k)
+    cross = np.zeros((k, k))
+
+    for lo in range(rows.start, rows.stop, chunk_rows):
+        hi = min(lo + chunk_rows, rows.stop)
+        chunk = np.column_stack([store.matrix[lo:hi, store._columns[ticker]] for ticker in tickers]).astype(float)
+        chunk = chunk[~np.isnan(chunk).any(axis=1)]
+        count += len(chunk)
+        total += chunk.sum(axis=0)
+        cross += chunk.T @ chunk
+
+    if count < 2:
+        raise ValueError("Not enough complete observations for a covariance")
+    mean = total / count
+    return (cross - count * np.outer(mean, mean)) / (count - 1)
@@ -0,0 +1,108 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RISK ATTRIBUTION
+Marginal and Component Risk, VaR and CVaR per Asset and Asset Class
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from config_enhanced import TICKER_CLASS
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RISK DECOMPOSITION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def risk_attribution(weights, cov, expected_returns=None, alpha=0.95):
+    """
+    Euler decomposition of volatility, parametric VaR and CVaR
+
+    Everything derives from the single product Sigma w, so a batch of m
+    portfolios costs one (m x n) @ (n x n) product. Component figures sum
+    to the portfolio figure: sum_i w_i * dRisk/dw_i = Risk.
+
+    Args:
+        weights: Portfolio weights (n,) or a batch of portfolios (m x n)
+        cov: Covariance matrix (n x n) or a FactorRiskModel
+        expected_returns: Optional expected returns (n,); VaR/CVaR are
+            measured net of the expected return when given
+        alpha: VaR/CVaR confidence level
+
+    Returns:
+        Dictionary of arrays, each (n,) / scalar for one portfolio or
+        (m x n) / (m,) for a batch:
+            volatility, marginal_risk, component_risk, percent_risk,
+            var, component_var, cvar, component_cvar
+    """
+    weights = np.asarray(weights, dtype=float)
+    single = weights.ndim == 1
+    W = np.atleast_2d(weights)
+    mu = np.zeros(W.shape[1]) if expected_returns is None else np.asarray(expected_returns, dtype=float)
+
+    sigma_w = W @ cov
+    variance = np.einsum("ij,ij->i", W, sigma_w)
+    volatility = np.sqrt(np.maximum(variance, 0.0))
+    safe_vol = np.where(volatility > 0, volatility, 1.0)[:, None]
+
+    marginal = sigma_w / safe_vol
+    component = W * marginal
+    percent = component / np.where(volatility > 0, volatility, 1.0)[:, None]
+
+    # Normal quantile and tail-mean multipliers for loss = -return
+    z = norm.ppf(alpha)
+    es = norm.pdf(z) / (1.0 - alpha)
+    component_var = W * (z * marginal - mu)
+    component_cvar = W * (es * marginal - mu)
+
+    result = {
+        "volatility": volatility,
+        "marginal_risk": marginal,
+        "component_risk": component,
+        "percent_risk": percent,
+        "var": component_var.sum(axis=1),
+        "component_var": component_var,
+        "cvar": component_cvar.sum(axis=1),
+        "component_cvar": component_cvar,
+    }
+    if single:
+        result = {key: value[0] for key, value in result.items()}
+    return result
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ASSET CLASS AGGREGATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def class_membership(assets, class_map=None):
+    """
+    One-hot asset-to-class matrix
+
+    Args:
+        assets: List of asset tickers
+        class_map: Optional {ticker: class}; defaults to the configured asset classes
+
+    Returns:
+        Tuple of (class names, membership matrix G (n x c))
+    """
+    class_map = TICKER_CLASS if class_map is None else class_map
+    labels = pd.Series(assets).map(class_map).fillna("Other").to_numpy()
+    classes, index = np.unique(labels, return_inverse=True)
+    return list(classes), np.eye(len(classes))[index]
+
+
+def aggregate_by_class(values, assets, class_map=None):
+    """
+    Sum per-asset figures into per-class figures with one matrix product
+
+    Args:
+        values: Per-asset values (n,) or (m x n), e.g. component_risk
+        assets: List of asset tickers (column order of values)
+        class_map: Optional {ticker: class}
+
+    Returns:
+        DataFrame indexed by class, one column per portfolio
+    """
+    classes, membership = class_membership(assets, class_map)
+    totals = np.atleast_2d(values) @ membership
+    return pd.DataFrame(totals.T, index=classes)
@@ -0,0 +1,95 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RISK MODEL
+Covariance Construction Shared by the Optimizers and Analytics Pages
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from config_enhanced import ASSUMED_CORRELATION
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COVARIANCE CONSTRUCTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_covariance_matrix(volatilities, correlation=None):
+    """
+    Build a covariance matrix from per-asset volatilities
+
+    Args:
+        volatilities: Sequence of annualized volatilities (any consistent unit)
+        correlation: Constant pairwise correlation or a full correlation matrix.
+            If None, uses ASSUMED_CORRELATION.
+
+    Returns:
+        2D numpy array (n x n)
+    """
+    vols = np.asarray(volatilities, dtype=float)
+
+    if correlation is None:
+        correlation = ASSUMED_CORRELATION
+
+    if np.ndim(correlation) == 0:
+        corr = np.full((len(vols), len(vols)), float(correlation))
+        np.fill_diagonal(corr, 1.0)
+    else:
+        corr = np.asarray(correlation, dtype=float)
+
+    return corr * np.outer(vols, vols)
+
+
+def covariance_fingerprint(cov):
+    """
+    Stable short hash of a covariance matrix, used as a cache key
+
+    Args:
+        cov: 2D array-like covariance matrix
+
+    Returns:
+        Hex string fingerprint
+    """
+    arr = np.ascontiguousarray(cov, dtype=np.float64)
+    digest = hashlib.sha1(str(arr.shape).encode())
+    digest.update(arr.tobytes())
+    return digest.hexdigest()[:16]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESULT CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache for fingerprint-keyed results"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
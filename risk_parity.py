@@ -0,0 +1,143 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RISK PARITY
+Equal / Budgeted Risk Contribution Portfolios (Newton and CCD Solvers)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RISK CONTRIBUTIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def risk_contributions(weights, cov):
+    """
+    Fraction of portfolio variance contributed by each asset
+
+    Args:
+        weights: Array of portfolio weights
+        cov: Covariance matrix (n x n)
+
+    Returns:
+        Array of contributions summing to 1
+    """
+    w = np.asarray(weights, dtype=float)
+    sigma_w = np.asarray(cov, dtype=float) @ w
+    variance = w @ sigma_w
+    if variance <= 0:
+        return np.zeros_like(w)
+    return w * sigma_w / variance
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SOLVERS
+# ═══════════════════════════════════════════════════════════════════════════════
+#
+# Both solvers work on the unnormalized problem
+#
+#     min_y  0.5 * y'Σy - Σ b_i log(y_i),   y > 0
+#
+# whose optimum satisfies y_i (Σy)_i = b_i, i.e. risk contributions equal to
+# the budgets. Normalizing y to sum to one gives the risk parity weights.
+
+def _initial_point(cov, budgets, x0):
+    """Scale a starting point so that y'Σy equals the total budget"""
+    if x0 is None:
+        y = budgets.copy()
+    else:
+        y = np.asarray(x0, dtype=float).copy()
+        # A zero weight is never optimal for a positive budget
+        y = np.where(y > 0, y, budgets)
+    return y * np.sqrt(budgets.sum() / (y @ cov @ y))
+
+
+def _solve_newton(cov, budgets, y, tol, max_iter):
+    """Damped Newton method (Spinu, 2013); quadratic convergence near the optimum"""
+    for iteration in range(1, max_iter + 1):
+        gradient = cov @ y - budgets / y
+        if np.max(np.abs(gradient * y)) < tol:
+            return y, iteration - 1, True
+
+        hessian = cov + np.diag(budgets / y ** 2)
+        step = cho_solve(cho_factor(hessian), gradient)
+
+        # Newton decrement controls damping and keeps y strictly positive
+        decrement = np.sqrt(gradient @ step)
+        if decrement > 0.25:
+            y = y - step / (1.0 + decrement)
+        else:
+            y = y - step
+
+    converged = np.max(np.abs((cov @ y - budgets / y) * y)) < tol
+    return y, max_iter, converged
+
+
+def _solve_ccd(cov, budgets, y, tol, max_iter):
+    """Cyclical coordinate descent with an incrementally maintained Σy"""
+    diag = np.diag(cov).copy()
+    sigma_y = cov @ y
+
+    for iteration in range(1, max_iter + 1):
+        for i in range(len(y)):
+            # Closed-form minimizer along coordinate i
+            c = sigma_y[i] - diag[i] * y[i]
+            y_new = (-c + np.sqrt(c * c + 4.0 * diag[i] * budgets[i])) / (2.0 * diag[i])
+            sigma_y += cov[:, i] * (y_new - y[i])
+            y[i] = y_new
+
+        if np.max(np.abs(sigma_y * y - budgets)) < tol:
+            return y, iteration, True
+
+    return y, max_iter, False
+
+
+SOLVERS = {
+    "newton": _solve_newton,
+    "ccd": _solve_ccd,
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EQUAL RISK CONTRIBUTION PORTFOLIO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def equal_risk_contribution(cov, budgets=None, x0=None, method="newton", tol=1e-10, max_iter=200):
+    """
+    Long-only portfolio whose risk contributions match the given budgets
+
+    Args:
+        cov: Covariance matrix (n x n), positive definite
+        budgets: Risk budget per asset (normalized to 1). If None, equal budgets.
+        x0: Optional warm start weights, e.g. the previous solution
+        method: "newton" (default) or "ccd"
+        tol: Tolerance on the largest risk contribution error
+        max_iter: Maximum Newton iterations / CCD sweeps
+
+    Returns:
+        Dictionary with weights, risk_contributions, iterations and converged flag
+    """
+    cov = np.asarray(cov, dtype=float)
+    n = cov.shape[0]
+
+    if budgets is None:
+        budgets = np.full(n, 1.0 / n)
+    else:
+        budgets = np.asarray(budgets, dtype=float)
+        if budgets.shape != (n,) or np.any(budgets <= 0):
+            raise ValueError("Risk budgets must be positive, one per asset")
+        budgets = budgets / budgets.sum()
+
+    if method not in SOLVERS:
+        raise ValueError(f"Unknown risk parity method: {method}")
+
+    y = _initial_point(cov, budgets, x0)
+    y, iterations, converged = SOLVERS[method](cov, budgets, y, tol, max_iter)
+
+    weights = y / y.sum()
+    return {
+        "weights": weights,
+        "risk_contributions": risk_contributions(weights, cov),
+        "iterations": iterations,
+        "converged": converged,
+    }
@@ -0,0 +1,184 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - RETURN SCENARIOS
+Normal, Student-t, Copula and Block-Bootstrap Scenario Matrices in Chunks
+═══════════════════════════════════════════════════════════════════════════════
+
+Every model is a ScenarioGenerator with one method, sample(rng, rows),
+returning a (rows x n) matrix of joint asset returns. VaR/CVaR and the CVaR
+optimizer take the assembled scenario matrix; the wealth projection draws
+each time step from the same generator.
+"""
+
+import numpy as np
+from scipy.special import ndtr, stdtr, stdtrit
+from config_enhanced import RANDOM_SEED, RETURN_STORE_PERIODS_PER_YEAR, SCENARIO_MODELS, SCENARIO_SETTINGS
+from random_streams import block_generators
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCENARIO GENERATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ScenarioGenerator:
+    """
+    Joint asset return scenarios for one model
+
+    Models (keys of SCENARIO_MODELS):
+        normal: Multivariate normal N(mu, Sigma)
+        student_t: Multivariate Student-t scaled so its covariance is Sigma;
+            all assets share one chi-square draw, so crashes are joint
+        gaussian_copula / t_copula: Dependence from the correlation of
+            Sigma (t copula adds tail dependence). Marginals are the
+            empirical distributions of the standardized history when given,
+            Student-t otherwise, shifted and scaled to mu and the volatilities
+        bootstrap: Circular block bootstrap of the history, compounding
+            `horizon` periods per scenario; mu and Sigma are not used
+
+    Args:
+        model: Scenario model key
+        mu: Expected returns (n,) over the scenario horizon, decimal
+        cov: Covariance matrix (n x n) over the scenario horizon, decimal
+        dof: Degrees of freedom (> 2) of the Student-t parts
+        history: Optional per-period returns (T x n), complete rows
+        horizon: History periods per scenario (bootstrap)
+        block_length: Bootstrap block length in periods
+    """
+
+    def __init__(self, model, mu=None, cov=None, dof=SCENARIO_SETTINGS["dof"], history=None,
+                 horizon=RETURN_STORE_PERIODS_PER_YEAR, block_length=SCENARIO_SETTINGS["block_length"]):
+        if model not in SCENARIO_MODELS:
+            raise ValueError(f"Unknown scenario model: {model}")
+        if dof <= 2:
+            raise ValueError("dof must be above 2 for a finite covariance")
+        self.model = model
+        self.dof = dof
+
+        if model == "bootstrap":
+            if history is None or len(history) == 0:
+                raise ValueError("The bootstrap needs a return history")
+            self.log_history = np.log1p(np.asarray(history, dtype=float))
+            self.horizon = int(horizon)
+            self.block_length = int(min(block_length, len(history)))
+            self.n_assets = self.log_history.shape[1]
+            return
+
+        self.mu = np.asarray(mu, dtype=float)
+        cov = np.asarray(cov, dtype=float)
+        self.n_assets = len(self.mu)
+        jitter = 1e-12 * np.eye(self.n_assets)
+
+        if model in ("normal", "student_t"):
+            self.chol = np.linalg.cholesky(cov + jitter)
+        else:
+            self.volatility = np.sqrt(np.diag(cov))
+            correlation = cov / np.outer(self.volatility, self.volatility)
+            self.chol = np.linalg.cholesky(correlation + jitter)
+            self.sorted_history = None
+            if history is not None:
+                history = np.asarray(history, dtype=float)
+                self.sorted_history = np.sort((history - history.mean(axis=0)) / history.std(axis=0, ddof=1), axis=0)
+
+    @property
+    def label(self):
+        return SCENARIO_MODELS[self.model]
+
+    def sample(self, rng, rows):
+        """
+        Draw scenarios
+
+        Args:
+            rng: numpy Generator
+            rows: Number of scenarios
+
+        Returns:
+            Asset returns (rows x n), decimal
+        """
+        if self.model == "bootstrap":
+            return self._bootstrap(rng, rows)
+
+        z = rng.standard_normal((rows, self.n_assets)) @ self.chol.T
+        if self.model == "normal":
+            return self.mu + z
+        if self.model == "student_t":
+            return self.mu + z * np.sqrt((self.dof - 2) / rng.chisquare(self.dof, rows))[:, None]
+
+        # Copulas: uniforms carrying the dependence, then marginal quantiles
+        if self.model == "gaussian_copula":
+            u = ndtr(z)
+        else:
+            u = stdtr(self.dof, z * np.sqrt(self.dof / rng.chisquare(self.dof, rows))[:, None])
+        return self.mu + self.volatility * self._marginal_quantiles(u)
+
+    def _marginal_quantiles(self, u):
+        """Standardized (mean 0, variance ~1) marginal quantiles at u (rows x n)"""
+        if self.sorted_history is None:
+            return stdtrit(self.dof, u) * np.sqrt((self.dof - 2) / self.dof)
+
+        # Linear interpolation in each asset's sorted history, all assets at once
+        n_obs = len(self.sorted_history)
+        position = np.clip(u, 0.0, 1.0) * (n_obs - 1)
+        lo = np.minimum(position.astype(np.intp), n_obs - 2)
+        fraction = position - lo
+        columns = np.arange(self.n_assets)
+        below = self.sorted_history[lo, columns]
+        above = self.sorted_history[lo + 1, columns]
+        return below + fraction * (above - below)
+
+    def _bootstrap(self, rng, rows):
+        n_obs = len(self.log_history)
+        n_blocks = -(-self.horizon // self.block_length)
+        starts = rng.integers(0, n_obs, (rows, n_blocks))
+        periods = ((starts[:, :, None] + np.arange(self.block_length)) % n_obs).reshape(rows, -1)[:, :self.horizon]
+
+        # Accumulate log returns one period at a time: memory O(rows x n)
+        log_growth = np.zeros((rows, self.n_assets))
+        for t in range(self.horizon):
+            log_growth += self.log_history[periods[:, t]]
+        return np.expm1(log_growth)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCENARIO MATRICES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def iter_scenarios(generator, n_scenarios, chunk_size=SCENARIO_SETTINGS["chunk_size"], seed=RANDOM_SEED):
+    """
+    Scenarios in fixed-size chunks, chunk i on child stream i of the seed
+
+    Yields:
+        Arrays of shape (rows, n)
+    """
+    n_chunks = -(-n_scenarios // chunk_size)
+    for i, rng in enumerate(block_generators(seed, n_chunks, "scenarios", generator.model)):
+        yield generator.sample(rng, min(chunk_size, n_scenarios - i * chunk_size))
+
+
+def simulate_scenarios(generator, n_scenarios=SCENARIO_SETTINGS["n_scenarios"],
+                       chunk_size=SCENARIO_SETTINGS["chunk_size"], seed=RANDOM_SEED):
+    """
+    Scenario matrix assembled from chunks into a preallocated array
+
+    Returns:
+        Array of shape (n_scenarios, n)
+    """
+    scenarios = np.empty((n_scenarios, generator.n_assets))
+    start = 0
+    for chunk in iter_scenarios(generator, n_scenarios, chunk_size, seed):
+        scenarios[start:start + len(chunk)] = chunk
+        start += len(chunk)
+    return scenarios
+
+
+def history_returns(store, tickers, start=None, end=None):
+    """
+    Complete-row return history of the tickers from a ReturnStore
+
+    Returns:
+        Array (T x k) without missing values, or None when there is no
+        store, a ticker is missing or fewer than two complete rows remain
+    """
+    if store is None or not tickers or any(ticker not in store for ticker in tickers):
+        return None
+    block = np.asarray(store.block(tickers, start, end), dtype=float)
+    block = block[~np.isnan(block).any(axis=1)]
+    return block if len(block) >= 2 else None
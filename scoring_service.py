@@ -0,0 +1,363 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - SCORING SERVICE
+Batch Portfolio Scoring over HTTP/JSON (Metrics, Optimized Weights, VaR/CVaR)
+═══════════════════════════════════════════════════════════════════════════════
+
+Run locally:
+    python scoring_service.py --port 8765 --workers 4
+
+Endpoints:
+    POST /score    {"portfolios": [{"weights": {"AAPL": 60, "BND": 40},
+                                    "objective": "Minimize Risk",
+                                    "risk_free_rate": 4.5}, ...]}
+    GET  /health
+    GET  /stats
+"""
+
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from config_enhanced import ASSET_STATS, RISK_FREE_RATE, SCORING_SERVICE
+from factor_model import FactorRiskModel
+from portfolio_analytics_enhanced import calculate_portfolio_metrics, optimize_portfolio
+from risk_attribution import risk_attribution
+from risk_model import LRUCache
+
+OBJECTIVES = (
+    "Maximize Sharpe Ratio", "Maximize Returns", "Minimize Risk", "Risk Parity",
+    "Hierarchical Risk Parity", "Minimize CVaR", "Cost-Aware Rebalance",
+    "Cardinality Constrained", "Resampled Efficient Frontier",
+)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REQUEST VALIDATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def normalize_request(portfolio):
+    """
+    Validate one portfolio request and put it in canonical form
+
+    The canonical form (sorted weights, explicit defaults) is hashable and
+    doubles as the cache key, so equivalent requests share one result.
+
+    Args:
+        portfolio: {"weights": {ticker: weight}, "objective": optional name,
+            "risk_free_rate": optional rate in percent}
+
+    Returns:
+        Tuple of (weights items, objective or None, risk-free rate in percent)
+    """
+    if not isinstance(portfolio, dict) or not isinstance(portfolio.get("weights"), dict):
+        raise ValueError("Each portfolio needs a 'weights' object of ticker: weight")
+
+    weights = portfolio["weights"]
+    unknown = [ticker for ticker in weights if ticker not in ASSET_STATS]
+    if unknown:
+        raise ValueError(f"Unknown tickers: {', '.join(map(str, unknown))}")
+    try:
+        items = tuple(sorted((ticker, float(weight)) for ticker, weight in weights.items()))
+    except (TypeError, ValueError):
+        raise ValueError("Weights must be numbers")
+    if not all(math.isfinite(weight) for _, weight in items):
+        raise ValueError("Weights must be finite numbers")
+    if not items or sum(weight for _, weight in items) <= 0:
+        raise ValueError("Weights must sum to a positive total")
+
+    objective = portfolio.get("objective")
+    if objective is not None and objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+
+    try:
+        risk_free_rate = float(portfolio.get("risk_free_rate", RISK_FREE_RATE * 100))
+    except (TypeError, ValueError):
+        raise ValueError("risk_free_rate must be a number")
+    if not math.isfinite(risk_free_rate):
+        raise ValueError("risk_free_rate must be a finite number")
+    return items, objective, risk_free_rate
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCORING (RUNS IN WORKER PROCESSES)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _metrics(assets, weights, risk_free_rate):
+    metrics = calculate_portfolio_metrics(assets, weights, risk_free_rate)
+    metrics["weights"] = {asset: float(weight) for asset, weight in metrics["weights"].items()}
+    return {key: value if isinstance(value, dict) else float(value) for key, value in metrics.items()}
+
+
+def score_chunk(requests):
+    """
+    Score a chunk of canonical requests
+
+    Metrics and optimized weights are per portfolio; the parametric 95%
+    VaR and CVaR of every current and optimized portfolio in the chunk
+    come from a single batched risk_attribution call over the union of
+    their assets.
+
+    Args:
+        requests: List of canonical requests from normalize_request()
+
+    Returns:
+        List of result dictionaries (decimal units, weights in percent)
+    """
+    results = []
+    rows = []
+    for items, objective, risk_free_rate in requests:
+        weights = dict(items)
+        assets = list(weights)
+        result = {"metrics": _metrics(assets, weights, risk_free_rate)}
+        rows.append(weights)
+        if objective is not None:
+            optimized = optimize_portfolio(assets, weights, objective)
+            result["objective"] = objective
+            result["optimized_weights"] = {asset: float(weight) for asset, weight in optimized.items()}
+            result["optimized_metrics"] = _metrics(assets, optimized, risk_free_rate)
+            rows.append(optimized)
+        results.append(result)
+
+    universe = sorted({asset for row in rows for asset in row})
+    index = {asset: i for i, asset in enumerate(universe)}
+    W = np.zeros((len(rows), len(universe)))
+    for r, row in enumerate(rows):
+        total = sum(row.values())
+        for asset, weight in row.items():
+            W[r, index[asset]] = weight / total
+
+    risk = FactorRiskModel.constant_correlation([ASSET_STATS[asset]["volatility"] for asset in universe])
+    attribution = risk_attribution(W, risk)
+
+    r = 0
+    for result in results:
+        result["var_95"], result["cvar_95"] = float(attribution["var"][r]), float(attribution["cvar"][r])
+        r += 1
+        if "optimized_weights" in result:
+            result["optimized_var_95"] = float(attribution["var"][r])
+            result["optimized_cvar_95"] = float(attribution["cvar"][r])
+            r += 1
+    return results
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERVICE: CACHE + WORKER POOL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ScoringService:
+    """
+    Cached, parallel batch scorer
+
+    Cache hits are answered directly; duplicate misses within a batch are
+    scored once; the remaining requests are split into chunks and fanned
+    out over a process pool.
+
+    Args:
+        workers: Worker processes (1 scores in the calling process)
+        chunk_size: Requests per worker task
+        cache_size: Maximum cached results
+    """
+
+    def __init__(self, workers=SCORING_SERVICE["workers"], chunk_size=SCORING_SERVICE["chunk_size"],
+                 cache_size=SCORING_SERVICE["cache_size"]):
+        self.chunk_size = chunk_size
+        self.cache = LRUCache(maxsize=cache_size)
+        self._pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._stats_lock = threading.Lock()
+        self.stats = {"portfolios": 0, "cache_hits": 0, "scored": 0, "batches": 0}
+
+    def score(self, requests):
+        """
+        Args:
+            requests: List of canonical requests from normalize_request()
+
+        Returns:
+            List of result dictionaries in request order
+        """
+        results = [self.cache.get(request) for request in requests]
+        hits = sum(1 for result in results if result is not None)
+        misses = list(dict.fromkeys(request for request, result in zip(requests, results) if result is None))
+
+        if misses:
+            chunks = [misses[i:i + self.chunk_size] for i in range(0, len(misses), self.chunk_size)]
+            if self._pool is None:
+                scored = [score_chunk(chunk) for chunk in chunks]
+            else:
+                scored = list(self._pool.map(score_chunk, chunks))
+            fresh = {}
+            for chunk, chunk_results in zip(chunks, scored):
+                for request, result in zip(chunk, chunk_results):
+                    self.cache.put(request, result)
+                    fresh[request] = result
+            results = [fresh[request] if result is None else result for request, result in zip(requests, results)]
+
+        with self._stats_lock:
+            self.stats["portfolios"] += len(requests)
+            self.stats["cache_hits"] += hits
+            self.stats["scored"] += len(misses)
+            self.stats["batches"] += 1
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REQUEST BATCHING ACROSS CONCURRENT CLIENTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class MicroBatcher:
+    """
+    Coalesce portfolios from concurrent HTTP requests into shared batches
+
+    Handler threads enqueue their portfolios and wait; one dispatcher
+    thread collects up to max_batch portfolios (or whatever arrived within
+    max_wait_ms of the first) and scores them in one ScoringService call,
+    so many small requests still fill the worker pool efficiently.
+
+    Args:
+        service: ScoringService
+        max_batch: Maximum portfolios per dispatch
+        max_wait_ms: Time to wait for more requests after the first
+    """
+
+    def __init__(self, service, max_batch=SCORING_SERVICE["max_batch"], max_wait_ms=SCORING_SERVICE["max_wait_ms"]):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def score(self, requests):
+        """Score canonical requests (blocks until their batch is done)"""
+        future = Future()
+        self._queue.put((requests, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            try:
+                results = self.service.score([request for requests, _ in pending for request in requests])
+            except Exception as exc:
+                if len(pending) == 1:
+                    pending[0][1].set_exception(exc)
+                    continue
+                # Retry each client's requests alone so only the failing one gets the error
+                for requests, future in pending:
+                    try:
+                        future.set_result(self.service.score(requests))
+                    except Exception as single_exc:
+                        future.set_exception(single_exc)
+                continue
+            offset = 0
+            for requests, future in pending:
+                future.set_result(results[offset:offset + len(requests)])
+                offset += len(requests)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HTTP SERVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _Handler(BaseHTTPRequestHandler):
+    batcher = None
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send(200, self.batcher.service.stats)
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            portfolios = payload.get("portfolios") if isinstance(payload, dict) else None
+            if not isinstance(portfolios, list) or not portfolios:
+                raise ValueError("Body must be {'portfolios': [...]} with at least one portfolio")
+            requests = [normalize_request(portfolio) for portfolio in portfolios]
+        except ValueError as exc:  # includes JSON decode errors
+            self._send(400, {"error": str(exc)})
+            return
+
+        try:
+            results = self.batcher.score(requests)
+        except Exception as exc:
+            self._send(500, {"error": f"Scoring failed: {exc}"})
+            return
+        self._send(200, {"results": results})
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Listen backlog; the default of 5 drops connections under bursts
+
+
+def create_server(host=SCORING_SERVICE["host"], port=SCORING_SERVICE["port"], workers=SCORING_SERVICE["workers"]):
+    """
+    Build (but do not start) a scoring server
+
+    Returns:
+        ThreadingHTTPServer; call serve_forever(), and shutdown() plus
+        server.batcher.service.close() to stop it
+    """
+    service = ScoringService(workers=workers)
+    batcher = MicroBatcher(service)
+    handler = type("ScoringHandler", (_Handler,), {"batcher": batcher})
+    server = _Server((host, port), handler)
+    server.batcher = batcher
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch portfolio scoring service")
+    parser.add_argument("--host", default=SCORING_SERVICE["host"])
+    parser.add_argument("--port", type=int, default=SCORING_SERVICE["port"])
+    parser.add_argument("--workers", type=int, default=SCORING_SERVICE["workers"])
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.workers)
+    print(f"Scoring service on http://{args.host}:{server.server_port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.service.close()
+
+
+if __name__ == "__main__":
+    main()
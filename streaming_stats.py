@@ -0,0 +1,298 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - STREAMING STATISTICS
+Mergeable Moment, Histogram and Quantile Accumulators for Chunked Simulations
+═══════════════════════════════════════════════════════════════════════════════
+
+Every accumulator takes data chunk by chunk (add) and combines with another
+accumulator of the same kind (merge), so simulations can run in blocks or in
+worker processes and memory never scales with the number of samples. All of
+them pickle, so worker results can be sent back and merged.
+"""
+
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MOMENTS (WELFORD / CHAN)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Moments:
+    """
+    Running count, mean, variance, min and max
+
+    Chunks are combined with the Chan et al. update, the batched form of
+    Welford's algorithm, which stays accurate where the naive sum of
+    squares cancels catastrophically.
+
+    Args:
+        shape: Shape of one observation, e.g. () for scalars or (P,) for
+            one value per portfolio
+    """
+
+    def __init__(self, shape=()):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    def add(self, values):
+        """Add a chunk of observations, shape (m,) + shape"""
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        self._combine(n, mean, m2, values.min(axis=0), values.max(axis=0))
+
+    def merge(self, other):
+        """Fold in another Moments accumulator"""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, n, mean, m2, lo, hi):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+        self.min = np.minimum(self.min, lo)
+        self.max = np.maximum(self.max, hi)
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.full_like(self.m2, np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIXED-BIN HISTOGRAMS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Histogram:
+    """
+    Grid of histograms on shared fixed bins
+
+    One histogram per cell of `shape` (e.g. (portfolios, time steps)).
+    Counts simply add up across chunks and workers. Quantiles are
+    interpolated linearly inside a bin, so their error is at most one bin
+    width; values outside the edges are clamped into the end bins.
+
+    Args:
+        edges: Bin edges (bins + 1,), increasing
+        shape: Shape of the grid of histograms
+    """
+
+    def __init__(self, edges, shape=()):
+        self.edges = np.asarray(edges, dtype=float)
+        self.shape = tuple(shape)
+        self.counts = np.zeros(self.shape + (len(self.edges) - 1,), dtype=np.int64)
+
+    def add(self, values, index=()):
+        """
+        Add a chunk of observations to the histograms at index
+
+        Args:
+            values: Observations, shape (m,) + the shape of counts[index]
+                without its bin axis
+            index: Index into the grid (e.g. (slice(None), step)); () for all
+        """
+        target = self.counts[index]
+        bins = target.shape[-1]
+        idx = np.clip(np.searchsorted(self.edges, values, side="right") - 1, 0, bins - 1)
+        cells = int(np.prod(target.shape[:-1]))
+        flat = idx.reshape(len(idx), cells) + np.arange(cells) * bins
+        self.counts[index] += np.bincount(flat.ravel(), minlength=cells * bins).reshape(target.shape)
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges) or self.counts.shape != other.counts.shape:
+            raise ValueError("Histograms must share edges and shape to merge")
+        self.counts += other.counts
+
+    @property
+    def total(self):
+        return self.counts.sum(axis=-1)
+
+    def quantiles(self, q):
+        """
+        Quantiles of every histogram
+
+        Args:
+            q: Probabilities in [0, 1]
+
+        Returns:
+            Array of shape + (len(q),)
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        cumulative = np.cumsum(self.counts, axis=-1)
+        targets = q * cumulative[..., -1:]
+        # First bin whose cumulative count reaches each target
+        k = (cumulative[..., None, :] >= targets[..., None]).argmax(axis=-1)
+        before = np.where(k > 0, np.take_along_axis(cumulative, np.maximum(k - 1, 0), axis=-1), 0)
+        inside = np.maximum(np.take_along_axis(self.counts, k, axis=-1), 1)
+        fraction = np.clip((targets - before) / inside, 0.0, 1.0)
+        lo, hi = self.edges[:-1][k], self.edges[1:][k]
+        return lo + fraction * (hi - lo)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# QUANTILE SKETCHES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TDigest:
+    """
+    Merging t-digest for quantiles of an unbounded stream
+
+    Keeps O(compression) weighted centroids, small near the tails and
+    larger in the middle, so extreme quantiles (VaR/CVaR tails) stay
+    accurate without knowing the data range in advance. Each chunk is
+    merged in one sort plus a vectorized regrouping on the k1 scale.
+
+    Args:
+        compression: Accuracy/size trade-off (keeps about half this many centroids)
+    """
+
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def add(self, values, weights=None):
+        """Add a chunk of observations (optionally weighted)"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=float).ravel()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, weights]))
+
+    def merge(self, other):
+        if other.weights.size:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        # k1 scale: centroids spanning less than one unit of k can share a group
+        q = (cumulative - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        group = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        grouped_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / grouped_weights
+        self.weights = grouped_weights
+
+    def quantile(self, q):
+        """
+        Args:
+            q: Probability or array of probabilities in [0, 1]
+
+        Returns:
+            Estimated quantile(s)
+        """
+        q = np.asarray(q, dtype=float)
+        if self.weights.size == 0:
+            return np.full(q.shape, np.nan)
+        cumulative = np.cumsum(self.weights)
+        centers = (cumulative - self.weights / 2) / cumulative[-1]
+        positions = np.r_[0.0, centers, 1.0]
+        values = np.r_[self.min, self.means, self.max]
+        return np.interp(q, positions, values)
+
+    def cdf(self, x):
+        """Estimated fraction of observations <= x"""
+        if self.weights.size == 0:
+            return np.full(np.shape(x), np.nan)
+        cumulative = np.cumsum(self.weights)
+        centers = (cumulative - self.weights / 2) / cumulative[-1]
+        return np.interp(x, np.r_[self.min, self.means, self.max], np.r_[0.0, centers, 1.0])
+
+    def tail_mean(self, q):
+        """
+        Mean of the observations below the q quantile (e.g. CVaR of returns at q=0.05)
+        """
+        cut = self.quantile(q)
+        below = self.means < cut
+        weight = self.weights[below].sum()
+        return float((self.means[below] * self.weights[below]).sum() / weight) if weight else float(cut)
+
+
+class P2Quantile:
+    """
+    P-square estimator of one quantile in O(1) memory (Jain & Chlamtac)
+
+    Five markers track the minimum, the target quantile, two intermediate
+    quantiles and the maximum; each observation moves them with a
+    parabolic correction. Updates are per observation, so it suits modest
+    streams or one-number monitors; use TDigest for large chunks or when
+    results must be merged.
+
+    Args:
+        p: Target probability in (0, 1)
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = np.arange(1.0, 6.0)
+        self.desired = np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5])
+        self.increments = np.array([0, p / 2, p, (1 + p) / 2, 1])
+
+    def add(self, values):
+        for x in np.asarray(values, dtype=float).ravel():
+            self._add_one(float(x))
+
+    def _add_one(self, x):
+        h = self.heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = int(np.searchsorted(h, x, side="right")) - 1
+        self.positions[k + 1:] += 1
+        self.desired += self.increments
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - self.positions[i]
+            n_lo, n, n_hi = self.positions[i - 1], self.positions[i], self.positions[i + 1]
+            if (d >= 1 and n_hi - n > 1) or (d <= -1 and n_lo - n < -1):
+                d = 1.0 if d > 0 else -1.0
+                parabolic = h[i] + d / (n_hi - n_lo) * (
+                    (n - n_lo + d) * (h[i + 1] - h[i]) / (n_hi - n)
+                    + (n_hi - n - d) * (h[i] - h[i - 1]) / (n - n_lo)
+                )
+                if h[i - 1] < parabolic < h[i + 1]:
+                    h[i] = parabolic
+                else:
+                    j = i + int(d)
+                    h[i] = h[i] + d * (h[j] - h[i]) / (self.positions[j] - n)
+                self.positions[i] += d
+
+    @property
+    def value(self):
+        if len(self.heights) < 5:
+            return float(np.percentile(self.heights, self.p * 100)) if self.heights else float("nan")
+        return self.heights[2]
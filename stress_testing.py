@@ -0,0 +1,175 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - STRESS TESTING
+Historical and User-Defined Shocks over Many Portfolios in One Matrix Product
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import numpy as np
+from config_enhanced import STRESS_RESULTS_PATH, STRESS_SCENARIOS, STRESS_TEST
+from risk_attribution import class_membership
+
+PNL_FILE = "pnl.dat"
+INDEX_FILE = "index.json"
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCENARIOS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def custom_scenario(class_shocks, ticker_shocks=None):
+    """
+    User-defined scenario in the same form as STRESS_SCENARIOS
+
+    Args:
+        class_shocks: {asset class: return (decimal)}, e.g. {"Equities": -0.2}
+        ticker_shocks: Optional {ticker: return} overriding the class shock
+
+    Returns:
+        Scenario dictionary
+    """
+    return {"classes": dict(class_shocks), "tickers": dict(ticker_shocks or {})}
+
+
+def scenario_matrix(assets, scenarios=None, class_map=None):
+    """
+    Shock matrix for a universe
+
+    Class shocks are spread to assets with one product against the
+    asset-to-class membership matrix; ticker overrides are then written in.
+    Assets in no shocked class get a zero shock.
+
+    Args:
+        assets: List of tickers
+        scenarios: {name: scenario}; defaults to the historical library
+        class_map: Optional {ticker: class}
+
+    Returns:
+        Tuple of (scenario names, shocks (S x n) as decimal returns)
+    """
+    scenarios = STRESS_SCENARIOS if scenarios is None else scenarios
+    names = list(scenarios)
+    classes, membership = class_membership(assets, class_map)
+
+    class_shocks = np.array([[scenarios[name]["classes"].get(cls, 0.0) for cls in classes] for name in names])
+    shocks = class_shocks.reshape(len(names), len(classes)) @ membership.T
+
+    positions = {asset: i for i, asset in enumerate(assets)}
+    for s, name in enumerate(names):
+        for ticker, shock in scenarios[name].get("tickers", {}).items():
+            if ticker in positions:
+                shocks[s, positions[ticker]] = shock
+    return names, shocks
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EVALUATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def stress_pnl(weights, shocks):
+    """
+    Scenario P&L of one or many portfolios
+
+    Args:
+        weights: Weights (n,) or a book of portfolios (P x n), as fractions of value
+        shocks: Shock matrix (S x n)
+
+    Returns:
+        P&L as a fraction of portfolio value, (S,) or (P x S)
+    """
+    return np.asarray(weights, dtype=float) @ np.asarray(shocks, dtype=float).T
+
+
+def _chunks(book, chunk_size):
+    """Yield (m x n) blocks from an array/memmap or pass through an iterable of blocks"""
+    if hasattr(book, "shape"):
+        for lo in range(0, book.shape[0], chunk_size):
+            yield np.asarray(book[lo:lo + chunk_size], dtype=float)
+    else:
+        for block in book:
+            yield np.atleast_2d(np.asarray(block, dtype=float))
+
+
+def stream_stress_test(book, assets, scenarios=None, path=STRESS_RESULTS_PATH,
+                       chunk_size=STRESS_TEST["chunk_size"], dtype=np.float32):
+    """
+    Stress a large book of portfolios, streaming P&L to disk chunk by chunk
+
+    Each chunk of portfolios is evaluated against every scenario with one
+    matrix product and appended to a (P x S) row-major file, so memory
+    stays O(chunk_size x (n + S)) for any book size. The result can be
+    reopened with load_stress_results() as a memory map. Per-scenario
+    summaries are accumulated on the fly.
+
+    Args:
+        book: Weights (P x n) array or memmap, or an iterable of (m x n) blocks
+        assets: List of n tickers (column order of the book)
+        scenarios: {name: scenario}; defaults to the historical library
+        path: Output directory
+        chunk_size: Portfolios per matrix product (array books only)
+        dtype: Stored P&L precision
+
+    Returns:
+        Dictionary with scenarios, portfolios, worst_pnl, worst_portfolio
+        and mean_pnl per scenario
+    """
+    names, shocks = scenario_matrix(assets, scenarios)
+    n_scenarios = len(names)
+
+    os.makedirs(path, exist_ok=True)
+    data_tmp = os.path.join(path, PNL_FILE + ".tmp")
+    index_tmp = os.path.join(path, INDEX_FILE + ".tmp")
+
+    count = 0
+    total = np.zeros(n_scenarios)
+    worst = np.full(n_scenarios, np.inf)
+    worst_at = np.zeros(n_scenarios, dtype=np.int64)
+
+    with open(data_tmp, "wb") as f:
+        for block in _chunks(book, chunk_size):
+            pnl = stress_pnl(block, shocks)
+            pnl.astype(dtype).tofile(f)
+
+            block_worst = pnl.argmin(axis=0)
+            block_min = pnl[block_worst, np.arange(n_scenarios)]
+            better = block_min < worst
+            worst[better] = block_min[better]
+            worst_at[better] = count + block_worst[better]
+            total += pnl.sum(axis=0)
+            count += len(pnl)
+
+    with open(index_tmp, "w") as f:
+        json.dump({
+            "dtype": np.dtype(dtype).name,
+            "shape": [count, n_scenarios],
+            "scenarios": names,
+            "assets": list(assets),
+        }, f)
+    os.replace(data_tmp, os.path.join(path, PNL_FILE))
+    os.replace(index_tmp, os.path.join(path, INDEX_FILE))
+
+    return {
+        "scenarios": names,
+        "portfolios": count,
+        "worst_pnl": worst if count else np.full(n_scenarios, np.nan),
+        "worst_portfolio": worst_at,
+        "mean_pnl": total / count if count else np.full(n_scenarios, np.nan),
+    }
+
+
+def load_stress_results(path=STRESS_RESULTS_PATH):
+    """
+    Reopen streamed results
+
+    Returns:
+        Tuple of (scenario names, read-only memmap of P&L (P x S); an empty
+        array when the book had no portfolios)
+    """
+    with open(os.path.join(path, INDEX_FILE)) as f:
+        index = json.load(f)
+    if index["shape"][0] == 0:
+        # numpy cannot map an empty file
+        return index["scenarios"], np.zeros(index["shape"], dtype=index["dtype"])
+    pnl = np.memmap(os.path.join(path, PNL_FILE), dtype=index["dtype"], mode="r", shape=tuple(index["shape"]))
+    return index["scenarios"], pnl
@@ -0,0 +1,11 @@
+"""
+Test setup: import the modules from the repository root and keep every file
+the code writes (return store, caches, artifacts) in a temporary DATA_DIR.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PORTFOLIO_DATA_DIR", tempfile.mkdtemp(prefix="portfolio-tests-"))
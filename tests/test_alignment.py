@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+import alignment
+from alignment import (AlignmentPolicy, align_prices, build_return_store, clear_alignment_cache,
+                       load_aligned_returns, pairwise_covariance)
+from price_fetcher import FixtureProvider, PriceCache
+from return_store import ReturnStore
+
+DAYS = pd.date_range("2024-01-01", periods=28)       # Calendar days (crypto trades every day)
+WEEKDAYS = DAYS[DAYS.dayofweek < 5]
+RNG = np.random.default_rng(1)
+PRICES = {
+    "SPY": pd.Series(100 * np.exp(np.cumsum(RNG.normal(0, 0.01, len(WEEKDAYS)))), index=WEEKDAYS),
+    "BTC": pd.Series(100 * np.exp(np.cumsum(RNG.normal(0, 0.03, len(DAYS)))), index=DAYS),
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_alignment_cache()
+
+
+def test_calendar_policies():
+    assert len(align_prices(PRICES, AlignmentPolicy(calendar="union"))) == len(DAYS)
+    assert len(align_prices(PRICES, AlignmentPolicy(calendar="weekdays"))) == len(WEEKDAYS)
+    intersection = align_prices(PRICES, AlignmentPolicy(calendar="intersection", ffill_limit=0))
+    assert list(intersection.index) == list(WEEKDAYS)
+    with pytest.raises(ValueError):
+        align_prices(PRICES, AlignmentPolicy(calendar="lunar"))
+
+
+def test_pairwise_covariance_matches_pandas():
+    returns = pd.DataFrame(RNG.normal(0, 0.01, (60, 4)), columns=list("ABCD"))
+    returns.iloc[::3, 0] = np.nan
+    returns.iloc[::5, 2] = np.nan
+    cov = pairwise_covariance(returns, make_psd=False)
+    pd.testing.assert_frame_equal(cov, returns.cov())
+
+
+def test_psd_repair_applies_with_missing_pairs():
+    # Pairwise estimates of the first three assets imply an impossible correlation
+    # structure; the fourth (shortest history) shares no dates with the third
+    nan = np.nan
+    returns = np.array([
+        [1, 1, nan, 1], [2, 2, nan, 2], [3, 3, nan, nan], [1, nan, 1, nan], [2, nan, 2, nan],
+        [3, nan, 3, nan], [nan, 1, 3, nan], [nan, 2, 2, nan], [nan, 3, 1, nan],
+    ])
+    raw = pairwise_covariance(returns, make_psd=False)
+    assert np.linalg.eigvalsh(raw[:3, :3]).min() < 0
+
+    cov = pairwise_covariance(returns)
+    assert np.linalg.eigvalsh(cov[:3, :3]).min() >= -1e-12
+    assert np.isnan(cov[3, 2]) and np.isnan(cov[2, 3])
+    np.testing.assert_array_equal(cov[3, [0, 1, 3]], raw[3, [0, 1, 3]])
+
+
+def test_load_uses_file_stamps(tmp_path, monkeypatch):
+    cache = PriceCache(str(tmp_path))
+    for ticker, series in PRICES.items():
+        cache.write(ticker, series)
+    first = load_aligned_returns(["SPY", "BTC", "XYZ"], cache=cache)
+    assert sorted(first.columns) == ["BTC", "SPY"]
+
+    monkeypatch.setattr(cache, "read", lambda ticker: pytest.fail("cache hit should not read prices"))
+    assert load_aligned_returns(["SPY", "BTC"], cache=cache) is first
+
+    monkeypatch.undo()
+    cache.write("SPY", PRICES["SPY"] * 1.5)
+    assert load_aligned_returns(["SPY", "BTC"], cache=cache) is not first
+
+
+def test_build_return_store(tmp_path):
+    prices = pd.concat(PRICES, axis=1, sort=True)
+    returns, failed = build_return_store(["SPY", "BTC", "XYZ"], provider=FixtureProvider(prices),
+                                         cache=PriceCache(str(tmp_path / "prices")), path=str(tmp_path / "returns"))
+    assert failed == ["XYZ"]
+    store = ReturnStore(str(tmp_path / "returns"))
+    assert store.tickers == list(returns.columns)
+    np.testing.assert_allclose(store.block(store.tickers), returns.to_numpy())
+    assert len(store.dates) == len(WEEKDAYS) - 1
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from black_litterman import black_litterman, implied_equilibrium_returns, market_cap_weights
+from risk_model import build_covariance_matrix
+
+ASSETS = ["SPY", "AGG", "GLD"]
+COV = build_covariance_matrix([0.18, 0.05, 0.15])
+
+
+def test_equilibrium_matches_reverse_optimization():
+    weights = market_cap_weights(ASSETS)
+    np.testing.assert_allclose(implied_equilibrium_returns(COV, weights, 2.5), 2.5 * COV @ weights)
+
+
+def test_cached_results_are_not_aliased():
+    views = [{"weights": {"SPY": 1.0}, "return": 0.08, "confidence": 0.6}]
+    first = black_litterman(ASSETS, COV, views=views)
+    expected = first["posterior_returns"].copy()
+    first["posterior_returns"] /= first["posterior_returns"].sum()
+    first["equilibrium_returns"][:] = 0.0
+
+    again = black_litterman(ASSETS, COV, views=views)
+    np.testing.assert_array_equal(again["posterior_returns"], expected)
+    assert np.all(again["equilibrium_returns"] != 0.0)
+
+    pi = implied_equilibrium_returns(COV, market_cap_weights(ASSETS))
+    pi[:] = 0.0
+    assert np.all(implied_equilibrium_returns(COV, market_cap_weights(ASSETS)) != 0.0)
+
+
+def test_full_confidence_view_is_matched():
+    views = [{"weights": {"SPY": 1.0, "AGG": -1.0}, "return": 0.04, "confidence": 1.0}]
+    posterior = black_litterman(ASSETS, COV, views=views)["posterior_returns"]
+    assert posterior[0] - posterior[1] == pytest.approx(0.04, abs=1e-6)
+
+
+def test_no_views_returns_equilibrium():
+    result = black_litterman(ASSETS, COV)
+    np.testing.assert_allclose(result["posterior_returns"], result["equilibrium_returns"])
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from bootstrap import (
+    bootstrap_intervals, cached_bootstrap_intervals, ratio_statistics, replicate_weights, stationary_bootstrap_counts,
+)
+
+RNG = np.random.default_rng(3)
+RETURNS = RNG.normal([0.0005, 0.0002, 0.0003], [0.012, 0.004, 0.009], size=(500, 3))
+WEIGHTS = np.array([[0.6, 0.4, 0.0], [1 / 3, 1 / 3, 1 / 3]])
+
+
+def test_counts_cover_the_history():
+    counts = stationary_bootstrap_counts(np.random.default_rng(0), 50, 200, mean_block=5)
+    assert counts.shape == (200, 50)
+    assert np.all(counts.sum(axis=1) == 50)
+
+    one_block = stationary_bootstrap_counts(np.random.default_rng(0), 50, 10, mean_block=1e12)
+    assert np.all(one_block == 1)
+
+
+def test_ratios_match_the_resampled_history():
+    indices = RNG.integers(0, len(RETURNS), len(RETURNS))
+    counts = np.bincount(indices, minlength=len(RETURNS))[None, :]
+    portfolio = RETURNS @ WEIGHTS.T
+    sharpe, sortino = ratio_statistics(counts, portfolio, risk_free_rate=0.0252, periods_per_year=252)
+
+    excess = portfolio[indices] - 0.0001
+    expected_sharpe = excess.mean(axis=0) / excess.std(axis=0) * np.sqrt(252)
+    expected_sortino = excess.mean(axis=0) / np.sqrt((np.minimum(excess, 0) ** 2).mean(axis=0)) * np.sqrt(252)
+    np.testing.assert_allclose(sharpe[0], expected_sharpe)
+    np.testing.assert_allclose(sortino[0], expected_sortino)
+
+
+def test_replicate_weights_edge_cases():
+    mu, vol = np.array([[0.05, 0.08]]), np.array([[0.1, 0.2]])
+    np.testing.assert_allclose(replicate_weights("Minimize Risk", mu, vol)[0], [2 / 3, 1 / 3])
+    np.testing.assert_allclose(replicate_weights("Maximize Return", mu, vol)[0], [0.0, 1.0])
+    np.testing.assert_allclose(replicate_weights("Maximize Sharpe Ratio", mu, vol, 0.1)[0], [0.5, 0.5])
+    np.testing.assert_allclose(replicate_weights("Risk Parity", mu[:, :1], vol[:, :1]), [[1.0]])
+    with pytest.raises(ValueError):
+        replicate_weights("Guess", mu, vol)
+
+
+def test_intervals_are_reproducible_and_independent_of_workers():
+    options = dict(n_replicates=300, batch_size=100, seed=42)
+    serial = bootstrap_intervals(RETURNS, WEIGHTS, "Minimize Risk", n_jobs=1, **options)
+    again = bootstrap_intervals(RETURNS, WEIGHTS, "Minimize Risk", n_jobs=1, **options)
+    parallel = bootstrap_intervals(RETURNS, WEIGHTS, "Minimize Risk", n_jobs=2, **options)
+    np.testing.assert_array_equal(serial["sharpe_samples"], again["sharpe_samples"])
+    np.testing.assert_array_equal(serial["sharpe_samples"], parallel["sharpe_samples"])
+    np.testing.assert_array_equal(serial["weights"]["upper"], parallel["weights"]["upper"])
+
+    other = bootstrap_intervals(RETURNS, WEIGHTS, n_jobs=1, **{**options, "seed": 43})
+    assert not np.array_equal(other["sharpe_samples"], serial["sharpe_samples"])
+
+
+def test_point_estimates_match_the_full_sample():
+    result = bootstrap_intervals(RETURNS, WEIGHTS[0], "Minimize Risk", n_replicates=200, n_jobs=1)
+    portfolio = RETURNS @ WEIGHTS[0]
+    assert result["sharpe"]["point"][0] == pytest.approx(portfolio.mean() / portfolio.std() * np.sqrt(252))
+    assert result["sharpe"]["lower"][0] < result["sharpe"]["point"][0] < result["sharpe"]["upper"][0]
+    assert result["sharpe_samples"].shape == (200, 1)
+
+    inverse = 1 / RETURNS.std(axis=0)
+    np.testing.assert_allclose(result["weights"]["point"], inverse / inverse.sum())
+    assert np.all(result["weights"]["lower"] <= result["weights"]["upper"])
+
+
+def test_cached_intervals_are_keyed_by_data_version():
+    options = dict(n_replicates=50, n_jobs=1)
+    first = cached_bootstrap_intervals("v1", ["SPY", "AGG", "GLD"], RETURNS, WEIGHTS, **options)
+    assert cached_bootstrap_intervals("v1", ["SPY", "AGG", "GLD"], RETURNS, WEIGHTS, **options) is first
+    assert cached_bootstrap_intervals("v2", ["SPY", "AGG", "GLD"], RETURNS, WEIGHTS, **options) is not first
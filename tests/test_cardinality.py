@@ -0,0 +1,61 @@
+import itertools
+import numpy as np
+import pytest
+from cardinality import cardinality_constrained, round_to_lots
+from risk_model import build_covariance_matrix
+
+MU = np.array([0.08, 0.06, 0.05, 0.07, 0.09, 0.04])
+COV = build_covariance_matrix([0.20, 0.10, 0.12, 0.15, 0.25, 0.05])
+
+
+def test_respects_cardinality_and_bounds():
+    result = cardinality_constrained(MU, COV, max_assets=3, min_weight=0.1, max_weight=0.6)
+    weights = result["weights"]
+    held = weights[weights > 0]
+    assert len(held) <= 3
+    assert weights.sum() == pytest.approx(1.0)
+    assert held.min() >= 0.1 - 1e-9 and held.max() <= 0.6 + 1e-9
+
+
+def test_matches_exhaustive_search():
+    from cardinality import _solve_subset
+    best = max(_solve_subset(MU[list(s)], COV[np.ix_(s, s)], 3.0, 0.0, 1.0)[1]
+               for s in itertools.combinations(range(len(MU)), 2))
+    result = cardinality_constrained(MU, COV, max_assets=2, risk_aversion=3.0)
+    assert result["utility"] == pytest.approx(best, rel=1e-6)
+
+
+def test_single_asset():
+    result = cardinality_constrained(MU[:1], COV[:1, :1], max_assets=3)
+    np.testing.assert_allclose(result["weights"], [1.0])
+
+
+@pytest.mark.parametrize("options", [
+    {"max_assets": 0},
+    {"max_assets": 2, "max_weight": 0.4},
+    {"max_assets": 4, "min_weight": 0.3, "max_weight": 0.3},
+    {"max_assets": 3, "min_weight": 0.5, "max_weight": 0.4},
+])
+def test_infeasible_bounds_raise(options):
+    with pytest.raises(ValueError):
+        cardinality_constrained(MU, COV, **options)
+
+
+def test_lots_sum_exactly_to_one():
+    rounded = round_to_lots([0.5, 0.5], 0.03)
+    assert rounded.sum() == pytest.approx(1.0, abs=1e-12)
+    assert np.all(np.abs(rounded - [0.5, 0.5]) < 0.03)
+
+
+def test_lots_keep_minimum_weight():
+    rounded = round_to_lots([0.999, 0.001], 0.03, min_weight=0.05)
+    assert rounded.min() >= 0.05
+    assert rounded.sum() == pytest.approx(1.0, abs=1e-12)
+
+
+def test_lots_respect_maximum_weight():
+    rounded = round_to_lots([0.05, 0.15, 0.80], 0.05, max_weight=0.5)
+    assert rounded.max() <= 0.5 + 1e-12
+    assert rounded.sum() == pytest.approx(1.0, abs=1e-12)
+    with pytest.raises(ValueError):
+        round_to_lots([0.5, 0.5], 0.25, max_weight=0.3)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from config_enhanced import ASSET_STATS
+from cvar_optimizer import minimize_cvar, portfolio_var_cvar, var_cvar_from_returns
+from portfolio_analytics_enhanced import optimize_portfolio
+
+RNG = np.random.default_rng(3)
+SCENARIOS = RNG.multivariate_normal([0.07, 0.04, 0.05], np.diag([0.18, 0.06, 0.15]) ** 2, 2000)
+
+
+def test_var_cvar_matches_sorted_losses():
+    returns = -np.arange(1, 101) / 100.0
+    var, cvar = var_cvar_from_returns(returns, alpha=0.9)
+    assert var == pytest.approx(np.quantile(-returns, 0.9))
+    assert cvar == pytest.approx((-returns)[-returns >= var].mean())
+
+
+def test_minimize_cvar_beats_feasible_portfolios():
+    result = minimize_cvar(SCENARIOS, alpha=0.95)
+    weights = result["weights"]
+    assert weights.sum() == pytest.approx(1.0) and weights.min() >= -1e-9
+    assert result["cvar"] == pytest.approx(portfolio_var_cvar(weights, SCENARIOS, 0.95)[1], abs=1e-3)
+    for candidate in ([1 / 3] * 3, [0, 1, 0], [0.2, 0.5, 0.3]):
+        assert result["cvar"] <= portfolio_var_cvar(candidate, SCENARIOS, 0.95)[1] + 1e-9
+
+
+def test_target_return_and_single_asset():
+    result = minimize_cvar(SCENARIOS, expected_returns=[0.07, 0.04, 0.05], target_return=0.06)
+    assert result["weights"] @ [0.07, 0.04, 0.05] >= 0.06 - 1e-8
+    np.testing.assert_allclose(minimize_cvar(SCENARIOS[:, :1])["weights"], [1.0])
+
+
+def test_optimizer_objective_uses_the_scenario_model():
+    assets = list(ASSET_STATS)[:4]
+    weights = {asset: 25.0 for asset in assets}
+    normal = optimize_portfolio(assets, weights, "Minimize CVaR", scenario_model="normal")
+    assert normal == optimize_portfolio(assets, weights, "Minimize CVaR", scenario_model="normal")
+    assert sum(normal.values()) == pytest.approx(100.0)
+    student = optimize_portfolio(assets, weights, "Minimize CVaR", scenario_model="student_t")
+    assert student != normal
+    # Without a history the bootstrap falls back to normal scenarios
+    assert optimize_portfolio(assets, weights, "Minimize CVaR", scenario_model="bootstrap") == normal
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from factor_model import FactorRiskModel
+from risk_model import build_covariance_matrix
+
+VOLS = [0.18, 0.05, 0.15, 0.60]
+
+
+def test_constant_correlation_matches_dense_covariance():
+    model = FactorRiskModel.constant_correlation(VOLS, correlation=0.3)
+    np.testing.assert_allclose(model.covariance(), build_covariance_matrix(VOLS, correlation=0.3))
+
+
+def test_negative_correlation_in_range_is_positive_definite():
+    model = FactorRiskModel.constant_correlation(VOLS, correlation=-0.2)
+    covariance = model.covariance()
+    assert np.all(np.isfinite(covariance))
+    vols = np.array(VOLS)
+    np.testing.assert_allclose(covariance, -0.2 * np.outer(vols, vols) + np.diag(1.2 * vols ** 2))
+    assert np.linalg.eigvalsh(covariance).min() > 0
+
+
+@pytest.mark.parametrize("correlation", [-1.0 / 3, -0.5, 1.0, 1.5])
+def test_correlation_outside_range_raises(correlation):
+    with pytest.raises(ValueError):
+        FactorRiskModel.constant_correlation(VOLS, correlation=correlation)
+
+
+def test_portfolio_variance_agrees_with_covariance():
+    model = FactorRiskModel.constant_correlation(VOLS)
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    assert model.portfolio_variance(weights) == pytest.approx(weights @ model.covariance() @ weights)
+
+
+def test_products_match_the_dense_matrix():
+    returns = np.random.default_rng(5).normal(0, 0.01, (200, 6))
+    model = FactorRiskModel.from_pca(returns, n_factors=2)
+    dense = model.covariance()
+    weights = np.random.default_rng(6).dirichlet(np.ones(6), 4)
+
+    np.testing.assert_allclose(np.diag(dense), returns.var(axis=0, ddof=1))
+    np.testing.assert_allclose(model @ weights[0], dense @ weights[0])
+    np.testing.assert_allclose(weights @ model, weights @ dense)
+    np.testing.assert_allclose(model.portfolio_variance(weights), np.einsum("mi,ij,mj->m", weights, dense, weights))
+    np.testing.assert_allclose(model.column(3), dense[:, 3])
+    np.testing.assert_allclose(model.risk_contributions(weights[0]).sum(), 1.0)
+    np.testing.assert_allclose(model.subset([1, 4]).covariance(), dense[np.ix_([1, 4], [1, 4])])
+
+
+def test_full_rank_pca_reproduces_the_sample_covariance():
+    returns = np.random.default_rng(7).normal(0, 0.01, (100, 4))
+    model = FactorRiskModel.from_pca(returns, n_factors=4)
+    np.testing.assert_allclose(model.covariance(), np.cov(returns, rowvar=False), atol=1e-12)
+
+
+def test_single_asset():
+    model = FactorRiskModel.constant_correlation([0.2])
+    assert model.portfolio_volatility([1.0]) == pytest.approx(0.2)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from hierarchical_risk_parity import cluster_assets, clear_cluster_cache, hierarchical_risk_parity
+from risk_model import build_covariance_matrix
+
+VOLS = np.array([0.18, 0.05, 0.15, 0.60])
+
+
+def block_covariance():
+    # Two uncorrelated pairs of highly correlated assets
+    correlation = np.array([[1.0, 0.9, 0.0, 0.0], [0.9, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.9], [0.0, 0.0, 0.9, 1.0]])
+    return correlation * np.outer(VOLS, VOLS)
+
+
+def test_weights_are_long_only_and_sum_to_one():
+    weights = hierarchical_risk_parity(build_covariance_matrix(VOLS))["weights"]
+    assert weights.sum() == pytest.approx(1.0)
+    assert np.all(weights > 0)
+
+
+def test_uncorrelated_assets_get_inverse_variance_weights():
+    weights = hierarchical_risk_parity(np.diag(VOLS ** 2))["weights"]
+    expected = VOLS ** -2 / (VOLS ** -2).sum()
+    np.testing.assert_allclose(weights, expected)
+
+
+def test_clusters_follow_correlation():
+    _, order = cluster_assets(block_covariance())
+    assert {frozenset(order[:2]), frozenset(order[2:])} == {frozenset({0, 1}), frozenset({2, 3})}
+
+
+def test_cached_clustering_matches_a_fresh_one():
+    cov = block_covariance()
+    cached = hierarchical_risk_parity(cov)["weights"]
+    clear_cluster_cache()
+    np.testing.assert_array_equal(hierarchical_risk_parity(cov)["weights"], cached)
+
+
+def test_single_asset_and_empty():
+    np.testing.assert_array_equal(hierarchical_risk_parity([[0.04]])["weights"], [1.0])
+    assert len(hierarchical_risk_parity(np.zeros((0, 0)))["weights"]) == 0
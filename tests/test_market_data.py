@@ -0,0 +1,72 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import market_data
+from config_enhanced import ASSET_ASSUMPTIONS, VOLATILITY_FORECAST
+from market_data import MarketDataRegistry, MarketSnapshot
+from return_store import write_return_store
+
+
+@pytest.fixture
+def store_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(market_data, "RETURN_STORE_PATH", str(tmp_path))
+    monkeypatch.setitem(VOLATILITY_FORECAST, "enabled", False)
+    return str(tmp_path)
+
+
+def test_snapshot_arrays_are_read_only():
+    snapshot = MarketSnapshot(1, ASSET_ASSUMPTIONS)
+    with pytest.raises(ValueError):
+        snapshot.mu[0] = 1.0
+    mu, cov = snapshot.subset(list(ASSET_ASSUMPTIONS)[:2])
+    assert cov.shape == (2, 2)
+    assert mu[0] == pytest.approx(list(ASSET_ASSUMPTIONS.values())[0]["return"] / 100)
+
+
+def test_current_is_reused_within_the_check_interval(store_path):
+    registry = MarketDataRegistry()
+    first = registry.current()
+    assert first.returns is None
+    write_return_store(np.zeros((3, 1)), ["SPY"], pd.bdate_range("2024-01-01", periods=3), path=store_path)
+    assert registry.current() is first
+
+
+def test_rewritten_store_is_picked_up_after_the_interval(store_path, monkeypatch):
+    monkeypatch.setattr(market_data, "MARKET_DATA_CHECK_SECONDS", 0)
+    registry = MarketDataRegistry()
+    first = registry.current()
+    write_return_store(np.zeros((3, 1)), ["SPY"], pd.bdate_range("2024-01-01", periods=3), path=store_path)
+    second = registry.current()
+    assert second.version == first.version + 1
+    assert second.returns is not None
+    assert registry.current() is second
+
+
+def test_publish_wins_over_default_rebuilds(store_path, monkeypatch):
+    monkeypatch.setattr(market_data, "MARKET_DATA_CHECK_SECONDS", 0)
+    registry = MarketDataRegistry()
+    published = registry.publish({"SPY": {"return": 8.0, "volatility": 16.0}})
+    write_return_store(np.zeros((3, 1)), ["SPY"], pd.bdate_range("2024-01-01", periods=3), path=store_path)
+    assert registry.current() is published
+    assert registry.version == published.version
+
+
+def test_build_does_not_hold_the_registry_lock(store_path, monkeypatch):
+    building = threading.Event()
+    release = threading.Event()
+
+    def slow_asset_data(store):
+        building.set()
+        release.wait(5)
+        return ASSET_ASSUMPTIONS
+
+    monkeypatch.setattr(market_data, "_default_asset_data", slow_asset_data)
+    registry = MarketDataRegistry()
+    reader = threading.Thread(target=registry.current)
+    reader.start()
+    assert building.wait(5)
+    published = registry.publish({"SPY": {"return": 8.0, "volatility": 16.0}})
+    release.set()
+    reader.join()
+    assert registry.current() is published
@@ -0,0 +1,40 @@
+import json
+import os
+import pytest
+from streamlit.testing.v1 import AppTest
+
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", "5_Optimize.py")
+
+
+def run_page():
+    app = AppTest.from_file(PAGE, default_timeout=120)
+    app.session_state.selected_assets = {"AAPL": 0.3, "BND": 0.3, "BTC": 0.1, "GLD": 0.2, "TLT": 0.1}
+    app.session_state.optimization_objective = "Maximize Sharpe Ratio"
+    app.session_state.run_optimization = True
+    app.run()
+    assert not app.exception
+    return app
+
+
+def frontier_charts(app):
+    return app.get("vega_lite_chart")
+
+
+@pytest.fixture(scope="module")
+def app():
+    return run_page()
+
+
+def test_frontier_is_one_data_chart(app):
+    charts = frontier_charts(app)
+    assert len(charts) == 1
+    spec = json.loads(charts[0].proto.spec)
+    assert [layer["data"]["name"] for layer in spec["layer"]] == ["simulated", "lines", "markers"]
+    assert any("5,000 simulated portfolios" in caption.value for caption in app.caption)
+
+
+def test_frontier_cloud_is_reproducible(app):
+    again = run_page()
+    first = {dataset.name: dataset.data.data for dataset in frontier_charts(app)[0].proto.datasets}
+    second = {dataset.name: dataset.data.data for dataset in frontier_charts(again)[0].proto.datasets}
+    assert first == second
@@ -0,0 +1,57 @@
+import gc
+import pickle
+import numpy as np
+import pytest
+from portfolio import Portfolio, TickerIndex
+
+
+def test_behaves_as_a_read_only_mapping():
+    portfolio = Portfolio(["SPY", "AGG"], [0.6, 0.4])
+    assert dict(portfolio) == {"SPY": 0.6, "AGG": 0.4}
+    assert portfolio == {"SPY": 0.6, "AGG": 0.4}
+    assert portfolio.get("GLD", 0.0) == 0.0
+    with pytest.raises(ValueError):
+        portfolio.weights[0] = 1.0
+    with pytest.raises(TypeError):
+        portfolio["SPY"] = 1.0
+
+
+def test_equal_portfolios_share_the_index_and_hash():
+    first = Portfolio.from_dict({"SPY": 0.5, "AGG": 0.5})
+    second = Portfolio.equal_weight(["SPY", "AGG"])
+    assert first.index is second.index
+    assert first == second and hash(first) == hash(second)
+    assert Portfolio(["SPY"], [-0.0]) == Portfolio(["SPY"], [0.0])
+    assert hash(Portfolio(["SPY"], [-0.0])) == hash(Portfolio(["SPY"], [0.0]))
+
+
+def test_round_trips_exactly():
+    weights = {"SPY": 0.1 + 0.2, "AGG": 1 / 3, "GLD": 1e-17}
+    portfolio = Portfolio.from_dict(weights)
+    assert portfolio.to_dict() == weights
+    restored = pickle.loads(pickle.dumps(portfolio))
+    assert restored == portfolio and restored.index is portfolio.index
+
+
+def test_edits_return_new_portfolios():
+    portfolio = Portfolio(["SPY", "AGG"], [2.0, 2.0])
+    assert portfolio.normalized() == {"SPY": 0.5, "AGG": 0.5}
+    assert portfolio.with_weight("AGG", 1.0)["AGG"] == 1.0
+    assert portfolio["AGG"] == 2.0
+    assert Portfolio.equal_weight([]).normalized() == {}
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        Portfolio(["SPY", "SPY"], [0.5, 0.5])
+    with pytest.raises(ValueError):
+        Portfolio(["SPY", "AGG"], [1.0])
+
+
+def test_unused_indices_are_released():
+    tickers = ("ZZZ1", "ZZZ2")
+    portfolio = Portfolio(tickers, np.array([0.5, 0.5]))
+    assert TickerIndex.intern(tickers) is portfolio.index
+    del portfolio
+    gc.collect()
+    assert tickers not in TickerIndex._interned
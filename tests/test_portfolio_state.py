@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import portfolio_state
+from factor_model import FactorRiskModel
+from portfolio_state import PortfolioState, sync_portfolio_state
+from risk_model import build_covariance_matrix
+
+ASSETS = ["SPY", "AGG", "GLD", "VNQ"]
+MU = np.array([10.0, 4.0, 6.0, 8.0])
+VOLS = [18.0, 5.0, 15.0, 22.0]
+COV = build_covariance_matrix(VOLS)
+
+
+def assert_matches_full_computation(state, cov=COV):
+    w = state.weights
+    assert state.variance == pytest.approx(w @ cov @ w, rel=1e-10, abs=1e-12)
+    assert state.expected_return == pytest.approx(MU @ w, rel=1e-10, abs=1e-12)
+    np.testing.assert_allclose(state.sigma_w, cov @ w, atol=1e-10)
+
+
+def test_incremental_updates_match_full_recomputation():
+    rng = np.random.default_rng(7)
+    state = PortfolioState(ASSETS, MU, COV, np.full(4, 0.25))
+    for _ in range(200):
+        state.update(int(rng.integers(4)), rng.random())
+        assert_matches_full_computation(state)
+    contributions = state.risk_contributions()
+    w = state.weights
+    np.testing.assert_allclose(contributions, w * (COV @ w) / (w @ COV @ w))
+
+
+def test_factor_model_columns_give_the_same_metrics():
+    model = FactorRiskModel.constant_correlation(VOLS)
+    state = PortfolioState(ASSETS, MU, model, [0.4, 0.3, 0.2, 0.1])
+    state.update("GLD", 0.5)
+    state.update(0, 0.0)
+    assert_matches_full_computation(state, model.covariance())
+
+
+def test_empty_and_single_asset_portfolios():
+    empty = PortfolioState([], [], np.zeros((0, 0)))
+    assert empty.volatility == 0.0 and empty.sharpe_ratio(2.0) == 0.0
+    assert empty.risk_contributions().shape == (0,)
+
+    single = PortfolioState(["SPY"], [10.0], np.array([[324.0]]), [1.0])
+    assert single.volatility == pytest.approx(18.0)
+    assert single.sharpe_ratio(1.0) == pytest.approx(0.5)
+    np.testing.assert_allclose(single.risk_contributions(), [1.0])
+
+
+def test_periodic_refresh_resets_drift(monkeypatch):
+    monkeypatch.setattr(portfolio_state, "REFRESH_EVERY", 3)
+    state = PortfolioState(ASSETS, MU, COV)
+    for i, weight in enumerate([0.1, 0.2, 0.3]):
+        state.update(i, weight)
+    assert state.updates == 0
+    assert_matches_full_computation(state)
+
+
+def test_sync_reuses_state_for_the_same_inputs():
+    state = sync_portfolio_state(None, ASSETS, MU, COV, {"SPY": 0.5, "AGG": 0.5}, key="v1")
+    same = sync_portfolio_state(state, ASSETS, MU, COV, {"SPY": 0.6, "AGG": 0.5}, key="v1")
+    assert same is state and same.updates == 1
+    assert same.weights_dict() == {"SPY": 0.6, "AGG": 0.5, "GLD": 0.0, "VNQ": 0.0}
+    assert_matches_full_computation(same)
+
+    assert sync_portfolio_state(state, ASSETS, MU, COV, {"SPY": 1.0}, key="v2") is not state
+    assert sync_portfolio_state(state, ASSETS[:2], MU[:2], COV[:2, :2], {"SPY": 1.0}, key="v1") is not state
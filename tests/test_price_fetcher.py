@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from price_fetcher import FixtureProvider, PriceCache, fetch_prices
+
+DATES = pd.bdate_range("2024-01-01", periods=40)
+PRICES = pd.DataFrame(
+    100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, (len(DATES), 3)), axis=0)),
+    index=DATES, columns=["SPY", "AGG", "GLD"],
+)
+
+
+def fetch(cache, provider, **options):
+    options.setdefault("requests_per_second", None)
+    options.setdefault("backoff_seconds", 0.0)
+    return fetch_prices(["SPY", "AGG", "GLD", "XYZ"], provider=provider, cache=cache, **options)
+
+
+def test_cache_directory_is_created_on_first_write(tmp_path):
+    directory = tmp_path / "prices"
+    cache = PriceCache(str(directory))
+    assert not directory.exists()
+    assert cache.read("SPY") is None
+    cache.write("SPY", PRICES["SPY"])
+    assert sorted(os.listdir(directory)) == ["SPY.csv"]
+
+
+def test_end_date_is_exclusive(tmp_path):
+    provider = FixtureProvider(PRICES)
+    prices, failed = fetch(PriceCache(str(tmp_path)), provider, start=DATES[5], end=DATES[10])
+    assert failed == ["XYZ"]
+    assert list(prices.index) == list(DATES[5:10])
+    pd.testing.assert_frame_equal(prices[["SPY", "AGG", "GLD"]], PRICES.iloc[5:10], check_freq=False)
+
+
+def test_fresh_cache_is_not_refetched(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    provider = FixtureProvider(PRICES)
+    fetch(cache, provider, start=DATES[0], end=DATES[-1], batch_size=2)
+    requests = provider.requests
+    prices, _ = fetch(cache, provider, start=DATES[0], end=DATES[-1], batch_size=2)
+    # Only the unknown ticker is requested again
+    assert provider.requests == requests + 1
+    assert len(prices) == len(DATES) - 1
+
+
+def test_failures_are_retried(tmp_path):
+    provider = FixtureProvider(PRICES, failures=2)
+    prices, failed = fetch(PriceCache(str(tmp_path)), provider, max_retries=2)
+    assert failed == ["XYZ"]
+    assert prices.shape == PRICES.shape
+
+
+def test_write_merges_with_cached_prices(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    cache.write("SPY", PRICES["SPY"].iloc[:20])
+    cache.write("SPY", PRICES["SPY"].iloc[10:] * 2)
+    merged = cache.read("SPY")
+    np.testing.assert_allclose(merged.iloc[:10], PRICES["SPY"].iloc[:10])
+    np.testing.assert_allclose(merged.iloc[10:], PRICES["SPY"].iloc[10:] * 2)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
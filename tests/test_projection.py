@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from projection import project_wealth
+
+MU = np.array([0.07, 0.04])
+COV = np.array([[0.18 ** 2, 0.3 * 0.18 * 0.06], [0.3 * 0.18 * 0.06, 0.06 ** 2]])
+
+
+def test_high_volatility_percentiles_are_not_clamped():
+    result = project_wealth([1.0], [0.653], [[0.785 ** 2]], years=30, n_paths=4000)
+    final = result["percentiles"][0, -1]
+    assert np.all(np.diff(final) > 0)
+    assert np.all(np.diff(result["percentiles"][0, 1:], axis=-1) > 0)
+
+
+def test_mean_matches_compounded_expectation():
+    result = project_wealth([[0.6, 0.4]], MU, COV, years=5, n_paths=20000, initial_wealth=100.0)
+    expected = 100.0 * (1 + (0.6 * MU[0] + 0.4 * MU[1]) / 12) ** 60
+    assert result["mean_final"][0] == pytest.approx(expected, rel=0.01)
+    # Step 0 holds the initial wealth, up to one histogram bin
+    np.testing.assert_allclose(result["percentiles"][:, 0], 100.0, rtol=0.01)
+
+
+def test_identical_for_any_block_layout_and_jobs():
+    options = dict(years=3, n_paths=3000, block_size=1000, goal=1.2)
+    first = project_wealth([[0.6, 0.4], [0.2, 0.8]], MU, COV, n_jobs=1, **options)
+    second = project_wealth([[0.6, 0.4], [0.2, 0.8]], MU, COV, n_jobs=2, **options)
+    np.testing.assert_array_equal(first["percentiles"], second["percentiles"])
+    np.testing.assert_array_equal(first["goal_probability"], second["goal_probability"])
+    different = project_wealth([[0.6, 0.4], [0.2, 0.8]], MU, COV, seed=7, **options)
+    assert not np.array_equal(first["percentiles"], different["percentiles"])
+
+
+def test_single_asset_zero_horizon():
+    result = project_wealth([1.0], [0.05], [[0.01]], years=0, n_paths=10)
+    assert result["percentiles"].shape == (1, 1, 5)
+    np.testing.assert_allclose(result["percentiles"], 1.0, rtol=0.01)
@@ -0,0 +1,38 @@
+import pickle
+import numpy as np
+from random_streams import block_generators, block_seeds, generator, seed_sequence
+
+
+def draws(seeds):
+    return [np.random.Generator(np.random.PCG64(s)).random(3).tolist() for s in seeds]
+
+
+def test_block_seeds_are_repeatable_for_a_seed_sequence():
+    parent = seed_sequence(42, "projection")
+    assert draws(block_seeds(parent, 4)) == draws(block_seeds(parent, 4))
+    assert draws(block_seeds(parent, 4, "a")) == draws(block_seeds(parent, 4, "a"))
+    assert draws(block_seeds(parent, 4, "a")) != draws(block_seeds(parent, 4, "b"))
+
+
+def test_seed_sequence_parent_matches_integer_seed():
+    assert draws(block_seeds(seed_sequence(42, "job"), 3)) == draws(block_seeds(42, 3, "job"))
+    assert draws(block_seeds(seed_sequence(42), 3, "job")) == draws(block_seeds(42, 3, "job"))
+
+
+def test_block_streams_do_not_depend_on_count():
+    assert draws(block_seeds(7, 2, "x")) == draws(block_seeds(7, 5, "x"))[:2]
+    assert len(set(map(tuple, draws(block_seeds(7, 5, "x"))))) == 5
+
+
+def test_named_streams():
+    assert generator(1, "a").random() == generator(1, "a").random()
+    assert generator(1, "a").random() != generator(1, "b").random()
+    assert generator(seed_sequence(1), "a").random() == generator(1, "a").random()
+    rng = np.random.default_rng(0)
+    assert generator(rng) is rng
+
+
+def test_generators_survive_pickling():
+    first = [g.random() for g in block_generators(3, 3, "pool")]
+    seeds = pickle.loads(pickle.dumps(block_seeds(3, 3, "pool")))
+    assert [np.random.Generator(np.random.PCG64(s)).random() for s in seeds] == first
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+from config_enhanced import DEFAULT_TRANSACTION_COST_BPS, TICKER_CLASS, TRANSACTION_COST_BPS
+from rebalancing import optimize_rebalance, transaction_cost_table
+from risk_model import build_covariance_matrix
+
+MU = np.array([0.08, 0.04, 0.06, 0.12])
+COV = build_covariance_matrix([0.18, 0.05, 0.15, 0.40])
+CURRENT = np.array([0.25, 0.25, 0.25, 0.25])
+
+
+def mean_variance(risk_aversion=2.5):
+    """Reference long-only mean-variance weights without trading costs"""
+    result = minimize(lambda w: -MU @ w + 0.5 * risk_aversion * w @ COV @ w, CURRENT, method="SLSQP",
+                      bounds=[(0, 1)] * 4, constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1}],
+                      options={"ftol": 1e-14})
+    return result.x
+
+
+def test_free_trading_reaches_the_mean_variance_optimum():
+    result = optimize_rebalance(CURRENT, MU, COV, risk_aversion=2.5)
+    assert result["converged"]
+    np.testing.assert_allclose(result["weights"], mean_variance(2.5), atol=1e-5)
+    assert result["cost"] == 0.0
+
+
+def test_expensive_trades_are_skipped():
+    result = optimize_rebalance(CURRENT, MU, COV, costs_bps=[5000] * 4)
+    np.testing.assert_allclose(result["weights"], CURRENT, atol=1e-8)
+    assert result["turnover"] == pytest.approx(0.0, abs=1e-8)
+
+
+def test_turnover_limit_and_accounting():
+    result = optimize_rebalance(CURRENT, MU, COV, costs_bps=[10, 5, 10, 50], max_turnover=0.1)
+    trade = result["weights"] - CURRENT
+    assert 0.5 * np.abs(trade).sum() <= 0.1 + 1e-6
+    np.testing.assert_allclose(result["buys"] - result["sells"], trade, atol=1e-8)
+    assert result["cost"] == pytest.approx(np.array([10, 5, 10, 50]) / 10_000 @ np.abs(trade), abs=1e-8)
+
+
+def test_single_asset_stays_put():
+    result = optimize_rebalance([1.0], [0.05], [[0.04]])
+    np.testing.assert_allclose(result["weights"], [1.0])
+
+
+def test_cost_table():
+    ticker = next(iter(TICKER_CLASS))
+    table = transaction_cost_table([ticker, "UNKNOWN", "SPY"], overrides={"SPY": 1.5})
+    assert table[ticker] == TRANSACTION_COST_BPS.get(TICKER_CLASS[ticker], DEFAULT_TRANSACTION_COST_BPS)
+    assert table["UNKNOWN"] == DEFAULT_TRANSACTION_COST_BPS
+    assert table["SPY"] == 1.5
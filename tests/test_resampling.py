@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from random_streams import seed_sequence
+from resampling import mean_variance_weights, resampled_weights
+from risk_model import build_covariance_matrix
+
+MU = np.array([0.08, 0.04, 0.06])
+COV = build_covariance_matrix([0.18, 0.05, 0.15])
+
+
+def test_unconstrained_optimum_is_recovered():
+    # Interior solution of max mu'w - (delta/2) w'Sigma w subject to sum(w) = 1
+    inverse = np.linalg.inv(COV)
+    ones = np.ones(3)
+    nu = (ones @ inverse @ MU - 2.5) / (ones @ inverse @ ones)
+    expected = inverse @ (MU - nu) / 2.5
+    assert np.all(expected > 0)
+    np.testing.assert_allclose(mean_variance_weights(MU, COV, risk_aversion=2.5), expected, atol=1e-6)
+
+
+def test_reproducible_for_any_job_count():
+    options = dict(n_resamples=40, batch_size=10, seed=seed_sequence(7, "test"))
+    serial = resampled_weights(MU, COV, n_jobs=1, **options)
+    parallel = resampled_weights(MU, COV, n_jobs=2, **options)
+    np.testing.assert_array_equal(serial["samples"], parallel["samples"])
+    assert not np.array_equal(serial["samples"], resampled_weights(MU, COV, n_resamples=40, seed=8)["samples"])
+
+
+def test_bands_bracket_the_average():
+    result = resampled_weights(MU, COV, n_resamples=60, seed=1, n_jobs=1)
+    assert result["samples"].shape == (60, 3)
+    assert result["weights"].sum() == pytest.approx(1.0)
+    assert np.all(result["lower"] <= result["weights"] + 1e-12)
+    assert np.all(result["weights"] <= result["upper"] + 1e-12)
+    np.testing.assert_allclose(result["samples"].sum(axis=1), 1.0)
+
+
+def test_single_asset():
+    result = resampled_weights([0.05], [[0.01]], n_resamples=5, seed=0, n_jobs=1)
+    np.testing.assert_allclose(result["weights"], [1.0])
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from cvar_optimizer import historical_var_cvar, var_cvar_from_returns
+from return_store import ReturnStore, open_return_store, portfolio_returns, store_covariance, write_return_store
+
+TICKERS = ["SPY", "AGG", "GLD", "BTC"]
+DATES = pd.bdate_range("2020-01-01", periods=300)
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0003, 0.01, (len(DATES), len(TICKERS)))
+    returns[5, 3] = np.nan
+    write_return_store(returns, TICKERS, DATES, path=str(tmp_path))
+    return ReturnStore(str(tmp_path)), returns
+
+
+def test_columns_are_zero_copy_views(store):
+    store, returns = store
+    column = store.column("GLD")
+    assert not column.flags.owndata
+    np.testing.assert_array_equal(column, returns[:, 2])
+    assert not store.block(["AGG", "GLD"]).flags.owndata
+    np.testing.assert_array_equal(store.block(["BTC", "SPY"]), returns[:, [3, 0]])
+
+
+def test_empty_block(store):
+    store, _ = store
+    assert store.block([]).shape == (len(DATES), 0)
+    assert store.block([], start=DATES[10], end=DATES[19]).shape == (10, 0)
+
+
+def test_date_bounds_are_inclusive(store):
+    store, returns = store
+    np.testing.assert_array_equal(store.column("SPY", DATES[10], DATES[19]), returns[10:20, 0])
+
+
+def test_covariance_matches_numpy(store):
+    store, returns = store
+    complete = returns[~np.isnan(returns).any(axis=1)]
+    np.testing.assert_allclose(store_covariance(store, TICKERS, chunk_rows=37), np.cov(complete.T))
+
+
+def test_historical_var_cvar_reads_the_store(store):
+    store, returns = store
+    weights = {"SPY": 0.6, "AGG": 0.4}
+    expected = var_cvar_from_returns(returns[:, :2] @ [0.6, 0.4], 0.95)
+    np.testing.assert_allclose(historical_var_cvar(store, weights), expected)
+    assert portfolio_returns(store, {"BTC": 1.0})[5] == 0.0
+
+
+def test_rewrite_is_picked_up(tmp_path):
+    write_return_store(np.zeros((3, 1)), ["SPY"], DATES[:3], path=str(tmp_path))
+    first = open_return_store(str(tmp_path))
+    write_return_store(np.ones((4, 2)), ["SPY", "AGG"], DATES[:4], path=str(tmp_path))
+    second = open_return_store(str(tmp_path))
+    assert second.shape == (4, 2)
+    np.testing.assert_array_equal(first.column("SPY"), 0.0)
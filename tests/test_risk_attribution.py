@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+from factor_model import FactorRiskModel
+from risk_attribution import aggregate_by_class, risk_attribution
+from risk_model import build_covariance_matrix
+
+VOLS = [0.18, 0.05, 0.15, 0.60]
+COV = build_covariance_matrix(VOLS)
+WEIGHTS = np.array([0.4, 0.3, 0.2, 0.1])
+
+
+def test_components_sum_to_the_portfolio_figures():
+    result = risk_attribution(WEIGHTS, COV, expected_returns=[0.08, 0.04, 0.06, 0.3])
+    assert result["volatility"] == pytest.approx(np.sqrt(WEIGHTS @ COV @ WEIGHTS))
+    assert result["component_risk"].sum() == pytest.approx(result["volatility"])
+    assert result["percent_risk"].sum() == pytest.approx(1.0)
+    assert result["component_var"].sum() == pytest.approx(result["var"])
+    assert result["component_cvar"].sum() == pytest.approx(result["cvar"])
+
+
+def test_matches_the_normal_reference():
+    mu = np.array([0.08, 0.04, 0.06, 0.3])
+    result = risk_attribution(WEIGHTS, COV, expected_returns=mu, alpha=0.99)
+    sigma = np.sqrt(WEIGHTS @ COV @ WEIGHTS)
+    assert result["var"] == pytest.approx(norm.ppf(0.99) * sigma - WEIGHTS @ mu)
+    assert result["cvar"] == pytest.approx(norm.pdf(norm.ppf(0.99)) / 0.01 * sigma - WEIGHTS @ mu)
+
+
+def test_batch_and_factor_model_agree_with_single_dense():
+    batch = np.vstack([WEIGHTS, np.full(4, 0.25)])
+    dense = risk_attribution(batch, COV)
+    factor = risk_attribution(batch, FactorRiskModel.constant_correlation(VOLS))
+    for key in dense:
+        np.testing.assert_allclose(factor[key], dense[key])
+        np.testing.assert_allclose(dense[key][0], risk_attribution(WEIGHTS, COV)[key])
+
+
+def test_zero_portfolio_has_no_risk():
+    result = risk_attribution(np.zeros(4), COV)
+    assert result["volatility"] == 0.0
+    np.testing.assert_array_equal(result["percent_risk"], 0.0)
+
+
+def test_class_aggregation():
+    table = aggregate_by_class([0.1, 0.2, 0.3], ["A", "B", "C"], class_map={"A": "Bonds", "B": "Bonds"})
+    assert table[0].to_dict() == {"Bonds": pytest.approx(0.3), "Other": 0.3}
@@ -0,0 +1,30 @@
+import numpy as np
+from risk_model import LRUCache, build_covariance_matrix, covariance_fingerprint
+
+
+def test_covariance_from_constant_and_full_correlation():
+    vols = [0.2, 0.1]
+    np.testing.assert_allclose(build_covariance_matrix(vols, 0.5), [[0.04, 0.01], [0.01, 0.01]])
+    full = np.array([[1.0, -0.3], [-0.3, 1.0]])
+    np.testing.assert_allclose(build_covariance_matrix(vols, full), full * np.outer(vols, vols))
+    np.testing.assert_allclose(build_covariance_matrix([0.3]), [[0.09]])
+    assert build_covariance_matrix([]).shape == (0, 0)
+
+
+def test_fingerprint_depends_on_values_and_shape():
+    cov = build_covariance_matrix([0.2, 0.1, 0.3])
+    assert covariance_fingerprint(cov) == covariance_fingerprint(cov.tolist())
+    assert covariance_fingerprint(cov) != covariance_fingerprint(cov * 1.0000001)
+    assert covariance_fingerprint(np.zeros((2, 3))) != covariance_fingerprint(np.zeros((3, 2)))
+
+
+def test_lru_cache_evicts_the_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and cache.get("b", "missing") == "missing"
+    assert len(cache) == 2 and cache.get("a") == 1 and cache.get("c") == 3
+    cache.clear()
+    assert len(cache) == 0
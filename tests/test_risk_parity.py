@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from risk_model import build_covariance_matrix
+from risk_parity import equal_risk_contribution, risk_contributions
+
+VOLS = np.array([0.18, 0.05, 0.15, 0.60, 0.08])
+COV = build_covariance_matrix(VOLS)
+
+
+@pytest.mark.parametrize("method", ["newton", "ccd"])
+def test_contributions_are_equal(method):
+    result = equal_risk_contribution(COV, method=method)
+    assert result["converged"]
+    assert result["weights"].sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(result["risk_contributions"], 0.2, atol=1e-8)
+
+
+def test_solvers_agree_and_match_inverse_volatility_when_uncorrelated():
+    newton = equal_risk_contribution(COV)["weights"]
+    ccd = equal_risk_contribution(COV, method="ccd")["weights"]
+    np.testing.assert_allclose(newton, ccd, atol=1e-8)
+
+    diagonal = equal_risk_contribution(np.diag(VOLS ** 2))["weights"]
+    np.testing.assert_allclose(diagonal, (1 / VOLS) / (1 / VOLS).sum(), atol=1e-10)
+
+
+def test_budgets_and_warm_start():
+    budgets = [0.4, 0.3, 0.1, 0.1, 0.1]
+    result = equal_risk_contribution(COV, budgets=budgets)
+    np.testing.assert_allclose(result["risk_contributions"], budgets, atol=1e-8)
+    warm = equal_risk_contribution(COV, budgets=budgets, x0=result["weights"])
+    assert warm["iterations"] <= result["iterations"]
+    np.testing.assert_allclose(warm["weights"], result["weights"], atol=1e-10)
+
+
+def test_single_asset_and_invalid_inputs():
+    np.testing.assert_allclose(equal_risk_contribution([[0.04]])["weights"], [1.0])
+    with pytest.raises(ValueError):
+        equal_risk_contribution(COV, budgets=[1, 1, 1, 1, 0])
+    with pytest.raises(ValueError):
+        equal_risk_contribution(COV, budgets=[1, 1])
+    with pytest.raises(ValueError):
+        equal_risk_contribution(COV, method="bisection")
+
+
+def test_risk_contributions_sum_to_one():
+    contributions = risk_contributions([0.5, 0.1, 0.1, 0.2, 0.1], COV)
+    assert contributions.sum() == pytest.approx(1.0)
+    np.testing.assert_array_equal(risk_contributions(np.zeros(5), COV), 0.0)
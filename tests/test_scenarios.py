@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from return_store import ReturnStore, write_return_store
+from risk_model import build_covariance_matrix
+from scenarios import ScenarioGenerator, history_returns, iter_scenarios, simulate_scenarios
+
+MU = np.array([0.07, 0.03, 0.05])
+COV = build_covariance_matrix([0.18, 0.05, 0.15])
+HISTORY = np.random.default_rng(8).standard_t(4, size=(750, 3)) * 0.01
+
+
+@pytest.mark.parametrize("model", ["normal", "student_t", "gaussian_copula", "t_copula"])
+def test_scenarios_match_the_target_moments(model):
+    scenarios = simulate_scenarios(ScenarioGenerator(model, MU, COV), 200000, seed=1)
+    np.testing.assert_allclose(scenarios.mean(axis=0), MU, atol=0.003)
+    np.testing.assert_allclose(np.cov(scenarios.T), COV, rtol=0.1, atol=2e-4)
+
+
+def test_fat_tails_are_joint():
+    normal = simulate_scenarios(ScenarioGenerator("normal", MU, COV), 100000, seed=2)
+    student = simulate_scenarios(ScenarioGenerator("student_t", MU, COV), 100000, seed=2)
+
+    def worst_loss(scenarios):
+        return np.quantile(scenarios @ [0.6, 0.0, 0.4], 0.001)
+
+    assert worst_loss(student) < worst_loss(normal)
+
+
+def test_chunks_are_reproducible():
+    generator = ScenarioGenerator("t_copula", MU, COV, history=HISTORY)
+    first = simulate_scenarios(generator, 2500, chunk_size=1000, seed=5)
+    np.testing.assert_array_equal(first, simulate_scenarios(generator, 2500, chunk_size=1000, seed=5))
+    np.testing.assert_array_equal(first, np.vstack(list(iter_scenarios(generator, 2500, 1000, seed=5))))
+    assert not np.array_equal(first, simulate_scenarios(generator, 2500, chunk_size=1000, seed=6))
+
+
+def test_empirical_marginals_stay_inside_the_history():
+    scenarios = simulate_scenarios(ScenarioGenerator("gaussian_copula", MU, COV, history=HISTORY), 20000, seed=3)
+    standardized = (HISTORY - HISTORY.mean(axis=0)) / HISTORY.std(axis=0, ddof=1)
+    volatility = np.sqrt(np.diag(COV))
+    assert np.all(scenarios >= MU + volatility * standardized.min(axis=0) - 1e-12)
+    assert np.all(scenarios <= MU + volatility * standardized.max(axis=0) + 1e-12)
+
+
+def test_bootstrap_compounds_history_blocks():
+    single = ScenarioGenerator("bootstrap", history=HISTORY, horizon=1, block_length=1)
+    draws = single.sample(np.random.default_rng(0), 500)
+    assert all(any(np.allclose(row, period) for period in HISTORY) for row in draws[:20])
+
+    flat = ScenarioGenerator("bootstrap", history=np.full((30, 1), 0.01), horizon=12, block_length=5)
+    np.testing.assert_allclose(flat.sample(np.random.default_rng(0), 4), 1.01 ** 12 - 1)
+
+
+def test_invalid_generators_raise():
+    with pytest.raises(ValueError):
+        ScenarioGenerator("levy", MU, COV)
+    with pytest.raises(ValueError):
+        ScenarioGenerator("student_t", MU, COV, dof=2)
+    with pytest.raises(ValueError):
+        ScenarioGenerator("bootstrap", MU, COV)
+
+
+def test_history_returns_keeps_complete_rows(tmp_path):
+    returns = HISTORY[:10].copy()
+    returns[3, 1] = np.nan
+    write_return_store(returns, ["SPY", "AGG", "GLD"], pd.bdate_range("2021-01-01", periods=10), path=str(tmp_path))
+    store = ReturnStore(str(tmp_path))
+
+    np.testing.assert_array_equal(history_returns(store, ["GLD", "AGG"]), returns[np.r_[0:3, 4:10]][:, [2, 1]])
+    assert history_returns(store, ["SPY", "BTC"]) is None
+    assert history_returns(store, []) is None and history_returns(None, ["SPY"]) is None
@@ -0,0 +1,99 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+import pytest
+from config_enhanced import ASSET_STATS
+from portfolio_analytics_enhanced import calculate_portfolio_metrics
+from risk_attribution import risk_attribution
+from risk_model import build_covariance_matrix
+from scoring_service import MicroBatcher, ScoringService, create_server, normalize_request
+
+A, B, C = list(ASSET_STATS)[:3]
+
+
+def test_requests_are_canonical():
+    first = normalize_request({"weights": {A: 60, B: 40}})
+    second = normalize_request({"weights": {B: 40.0, A: 60}})
+    assert first == second and hash(first) == hash(second)
+
+
+@pytest.mark.parametrize("portfolio", [
+    {"weights": {}},
+    {"weights": {"NOPE": 1}},
+    {"weights": {A: float("nan")}},
+    {"weights": {A: "x"}},
+    {"weights": {A: 0.0}},
+    {"weights": {A: 1}, "objective": "Guess"},
+    {"weights": {A: 1}, "risk_free_rate": float("inf")},
+    [],
+])
+def test_invalid_requests_are_rejected(portfolio):
+    with pytest.raises(ValueError):
+        normalize_request(portfolio)
+
+
+def test_scores_match_the_page_metrics_and_are_cached():
+    service = ScoringService(workers=1)
+    request = normalize_request({"weights": {A: 50, B: 30, C: 20}, "objective": "Minimize Risk"})
+    other = normalize_request({"weights": {A: 100}})
+    results = service.score([request, other, request])
+    assert results[0] is results[2]
+    assert service.stats == {"portfolios": 3, "cache_hits": 0, "scored": 2, "batches": 1}
+
+    expected = calculate_portfolio_metrics([A, B, C], {A: 50, B: 30, C: 20}, request[2])
+    assert results[0]["metrics"]["volatility"] == pytest.approx(expected["volatility"])
+    weights = np.array([0.5, 0.3, 0.2])
+    cov = build_covariance_matrix([ASSET_STATS[asset]["volatility"] for asset in (A, B, C)])
+    assert results[0]["var_95"] == pytest.approx(risk_attribution(weights, cov)["var"])
+    assert "optimized_var_95" in results[0] and "optimized_weights" not in results[1]
+
+    assert service.score([other])[0] is results[1]
+    assert service.stats["cache_hits"] == 1
+
+
+def test_batcher_isolates_a_failing_client():
+    class Service:
+        def score(self, requests):
+            if "bad" in requests:
+                raise RuntimeError("bad request")
+            return [request.upper() for request in requests]
+
+    batcher = MicroBatcher(Service(), max_batch=10, max_wait_ms=200)
+    outcomes = {}
+
+    def client(name, requests):
+        try:
+            outcomes[name] = batcher.score(requests)
+        except RuntimeError as exc:
+            outcomes[name] = exc
+
+    threads = [threading.Thread(target=client, args=(name, requests))
+               for name, requests in [("a", ["x", "y"]), ("b", ["bad"]), ("c", ["z"])]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert outcomes["a"] == ["X", "Y"] and outcomes["c"] == ["Z"]
+    assert isinstance(outcomes["b"], RuntimeError)
+
+
+def test_http_round_trip():
+    server = create_server(host="127.0.0.1", port=0, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        body = json.dumps({"portfolios": [{"weights": {A: 1, B: 1}}]}).encode()
+        with urllib.request.urlopen(urllib.request.Request(f"{url}/score", data=body)) as response:
+            results = json.load(response)["results"]
+        assert results[0]["metrics"]["weights"] == {A: 50.0, B: 50.0}
+
+        bad = json.dumps({"portfolios": [{"weights": {"NOPE": 1}}]}).encode()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(urllib.request.Request(f"{url}/score", data=bad))
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.batcher.service.close()
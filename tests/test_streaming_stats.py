@@ -0,0 +1,84 @@
+import pickle
+import numpy as np
+import pytest
+from streaming_stats import Histogram, Moments, P2Quantile, TDigest
+
+RNG = np.random.default_rng(5)
+SAMPLE = RNG.standard_t(4, size=(20000, 3)) * 0.02 + 1e6
+
+
+def test_chunked_moments_match_numpy():
+    moments = Moments(shape=(3,))
+    for chunk in np.array_split(SAMPLE, 13):
+        moments.add(chunk)
+    np.testing.assert_allclose(moments.mean, SAMPLE.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(moments.variance, SAMPLE.var(axis=0, ddof=1), rtol=1e-8)
+    np.testing.assert_array_equal(moments.max, SAMPLE.max(axis=0))
+
+
+def test_merged_moments_equal_a_single_pass():
+    left, right, single = Moments(), Moments(), Moments()
+    left.add(SAMPLE[:7, 0])
+    right.add(SAMPLE[7:, 0])
+    left.merge(pickle.loads(pickle.dumps(right)))
+    single.add(SAMPLE[:, 0])
+    assert left.count == single.count
+    assert left.mean == pytest.approx(single.mean, rel=1e-12)
+    assert left.variance == pytest.approx(single.variance, rel=1e-8)
+
+
+def test_moments_of_empty_and_single_observations():
+    moments = Moments()
+    moments.add([])
+    moments.merge(Moments())
+    assert moments.count == 0 and np.isnan(moments.variance)
+    moments.add([2.5])
+    assert moments.mean == 2.5 and np.isnan(moments.variance)
+
+
+def test_histogram_quantiles_are_within_one_bin():
+    values = RNG.normal(size=(5000, 2))
+    edges = np.linspace(-5, 5, 201)
+    histogram = Histogram(edges, shape=(2,))
+    for chunk in np.array_split(values, 4):
+        histogram.add(chunk)
+    q = [0.05, 0.5, 0.95]
+    np.testing.assert_allclose(histogram.quantiles(q), np.quantile(values, q, axis=0).T, atol=edges[1] - edges[0])
+    np.testing.assert_array_equal(histogram.total, [5000, 5000])
+
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(edges[::2], shape=(2,)))
+
+
+def test_tdigest_tails_match_exact_quantiles():
+    values = RNG.standard_t(3, size=100000)
+    digest, other = TDigest(), TDigest()
+    for chunk in np.array_split(values[:60000], 6):
+        digest.add(chunk)
+    other.add(values[60000:])
+    digest.merge(other)
+
+    assert digest.count == len(values)
+    q = np.array([0.001, 0.01, 0.05, 0.5, 0.95, 0.99])
+    np.testing.assert_allclose(digest.quantile(q), np.quantile(values, q), rtol=0.02, atol=0.01)
+    tail = np.sort(values)[:5000].mean()
+    assert digest.tail_mean(0.05) == pytest.approx(tail, rel=0.02)
+    assert digest.cdf(np.quantile(values, 0.05)) == pytest.approx(0.05, abs=0.002)
+
+
+def test_empty_tdigest():
+    digest = TDigest()
+    digest.add([])
+    assert np.isnan(digest.quantile(0.5)) and np.all(np.isnan(digest.cdf([0.0, 1.0])))
+
+
+def test_p2_quantile_tracks_the_target():
+    values = RNG.normal(size=20000)
+    estimator = P2Quantile(0.05)
+    estimator.add(values)
+    assert estimator.value == pytest.approx(np.quantile(values, 0.05), abs=0.05)
+
+    short = P2Quantile(0.5)
+    assert np.isnan(short.value)
+    short.add([3.0, 1.0, 2.0])
+    assert short.value == 2.0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from config_enhanced import STRESS_SCENARIOS, TICKER_CLASS
+from stress_testing import custom_scenario, load_stress_results, scenario_matrix, stream_stress_test
+
+ASSETS = ["SPY", "AGG", "GLD", "TLT", "BTC"]
+
+
+def reference_shocks(assets, scenarios):
+    return np.array([[scenario.get("tickers", {}).get(asset, scenario["classes"].get(TICKER_CLASS.get(asset), 0.0))
+                      for asset in assets] for scenario in scenarios.values()])
+
+
+def test_shocks_match_a_per_asset_lookup():
+    names, shocks = scenario_matrix(ASSETS)
+    assert names == list(STRESS_SCENARIOS)
+    np.testing.assert_allclose(shocks, reference_shocks(ASSETS, STRESS_SCENARIOS))
+
+
+def test_custom_scenario_overrides_and_unknown_assets():
+    scenarios = {"Equity selloff": custom_scenario({"Equities": -0.2}, {"SPY": -0.3})}
+    _, shocks = scenario_matrix(["SPY", "AAPL", "AGG", "ZZZZ"], scenarios)
+    np.testing.assert_allclose(shocks, [[-0.3, -0.2, 0.0, 0.0]])
+
+    _, single = scenario_matrix(["SPY"], scenarios)
+    assert single.shape == (1, 1)
+
+
+def test_streamed_results_match_a_dense_product(tmp_path):
+    rng = np.random.default_rng(11)
+    book = rng.dirichlet(np.ones(len(ASSETS)), size=257)
+    _, shocks = scenario_matrix(ASSETS)
+    expected = book @ shocks.T
+
+    summary = stream_stress_test(book, ASSETS, path=str(tmp_path), chunk_size=50, dtype=np.float64)
+    names, pnl = load_stress_results(str(tmp_path))
+    assert names == summary["scenarios"] and summary["portfolios"] == len(book)
+    np.testing.assert_allclose(pnl, expected)
+    np.testing.assert_allclose(summary["worst_pnl"], expected.min(axis=0))
+    np.testing.assert_array_equal(summary["worst_portfolio"], expected.argmin(axis=0))
+    np.testing.assert_allclose(summary["mean_pnl"], expected.mean(axis=0))
+
+    blocks = stream_stress_test(np.array_split(book, 7), ASSETS, path=str(tmp_path / "blocks"), dtype=np.float64)
+    np.testing.assert_allclose(blocks["mean_pnl"], summary["mean_pnl"])
+    np.testing.assert_array_equal(load_stress_results(str(tmp_path / "blocks"))[1], pnl)
+
+
+def test_empty_book(tmp_path):
+    summary = stream_stress_test(np.zeros((0, len(ASSETS))), ASSETS, path=str(tmp_path))
+    assert summary["portfolios"] == 0
+    assert np.all(np.isnan(summary["worst_pnl"])) and np.all(np.isnan(summary["mean_pnl"]))
+    assert load_stress_results(str(tmp_path))[1].shape == (0, len(STRESS_SCENARIOS))
@@ -0,0 +1,61 @@
+import os
+import numpy as np
+import pytest
+import universe_artifacts
+from universe_artifacts import build_artifacts, load_universe_artifacts, precompute_artifacts, source_fingerprint
+from resampling import mean_variance_weights
+from risk_model import build_covariance_matrix
+
+ASSETS = ["SPY", "AGG", "GLD", "BTC"]
+MU = np.array([0.08, 0.04, 0.06, 0.30])
+VOLS = np.array([0.18, 0.05, 0.15, 0.70])
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    universe_artifacts._loaded.clear()
+
+
+def test_corners_run_from_max_return_to_min_variance():
+    artifacts = build_artifacts(ASSETS, MU, VOLS, 0.04)
+    corners = artifacts["corner_weights"]
+    np.testing.assert_allclose(corners.sum(axis=1), 1.0)
+    assert np.argmax(corners[0]) == np.argmax(MU)
+    cov = build_covariance_matrix(VOLS)
+    min_variance = mean_variance_weights(np.zeros(4), cov, risk_aversion=1.0)
+    np.testing.assert_allclose(corners[-1], min_variance, atol=1e-3)
+    assert np.all(np.diff(artifacts["corner_returns"]) <= 1e-9)
+    np.testing.assert_allclose(artifacts["cholesky"] @ artifacts["cholesky"].T, cov)
+
+
+def test_fingerprint_tracks_every_input():
+    base = source_fingerprint(ASSETS, MU, VOLS, 0.04)
+    assert source_fingerprint(ASSETS, MU, VOLS, 0.04) == base
+    assert source_fingerprint(ASSETS, MU * 1.01, VOLS, 0.04) != base
+    assert source_fingerprint(ASSETS, MU, VOLS, 0.05) != base
+    assert source_fingerprint(ASSETS, MU, VOLS, 0.04, correlation=0.5) != base
+    assert source_fingerprint(ASSETS[::-1], MU, VOLS, 0.04) != base
+
+
+def test_load_reads_precomputed_bundles_and_never_writes(tmp_path):
+    directory = str(tmp_path)
+    fresh = load_universe_artifacts(ASSETS, MU, VOLS, 0.04, directory=directory)
+    assert os.listdir(directory) == []
+
+    [path] = precompute_artifacts([(ASSETS, MU, VOLS, 0.04)], directory=directory)
+    universe_artifacts._loaded.clear()
+    loaded = load_universe_artifacts(ASSETS, MU, VOLS, 0.04, directory=directory)
+    assert os.listdir(directory) == [os.path.basename(path)]
+    np.testing.assert_allclose(loaded["corner_weights"], fresh["corner_weights"])
+    assert loaded["fingerprint"] == fresh["fingerprint"]
+
+    # A stale bundle (different inputs) is ignored, not reused
+    universe_artifacts._loaded.clear()
+    changed = load_universe_artifacts(ASSETS, MU, VOLS * 1.1, 0.04, directory=directory)
+    np.testing.assert_allclose(changed["volatility"], VOLS * 1.1)
+
+
+def test_single_asset():
+    artifacts = build_artifacts(["SPY"], [0.08], [0.18], 0.04)
+    np.testing.assert_allclose(artifacts["corner_weights"], [[1.0]])
+    assert artifacts["sharpe"][0] == pytest.approx(0.04 / 0.18)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+import volatility_forecast
+from return_store import ReturnStore, write_return_store
+from volatility_forecast import (
+    _prepare, annualized_volatility, ewma_next_variance, fit_garch, forecast_volatilities, garch_objective,
+)
+
+
+def simulate_garch(rng, n_obs, omega, alpha, beta):
+    returns = np.empty(n_obs)
+    h = omega / (1 - alpha - beta)
+    for t in range(n_obs):
+        returns[t] = np.sqrt(h) * rng.standard_normal()
+        h = omega + alpha * returns[t] ** 2 + beta * h
+    return returns
+
+
+RNG = np.random.default_rng(21)
+RETURNS = np.column_stack([simulate_garch(RNG, 3000, 2e-6, 0.10, 0.85),
+                           simulate_garch(RNG, 3000, 1e-6, 0.05, 0.90)])
+
+
+def test_gradient_matches_finite_differences():
+    squared, mask, variance = _prepare(RETURNS[:400])
+    theta = np.array([0.9, 0.93, 0.1, 0.06])
+    _, gradient = garch_objective(theta, squared, mask, variance)
+    step = 1e-6
+    numeric = [(garch_objective(theta + step * e, squared, mask, variance)[0]
+                - garch_objective(theta - step * e, squared, mask, variance)[0]) / (2 * step) for e in np.eye(4)]
+    np.testing.assert_allclose(gradient, numeric, rtol=1e-4, atol=1e-8)
+
+
+def test_fit_recovers_simulated_parameters_and_chunks_are_independent():
+    fit = fit_garch(RETURNS)
+    np.testing.assert_allclose(fit["alpha"], [0.10, 0.05], atol=0.04)
+    np.testing.assert_allclose(fit["alpha"] + fit["beta"], [0.95, 0.95], atol=0.03)
+
+    alone = fit_garch(RETURNS[:, :1])
+    assert alone["alpha"][0] == pytest.approx(fit["alpha"][0], abs=1e-3)
+    assert alone["beta"][0] == pytest.approx(fit["beta"][0], abs=1e-3)
+
+
+def test_ewma_matches_explicit_weights():
+    squared, _, variance = _prepare(RETURNS[:50])
+    lam = 0.94
+    powers = lam ** np.arange(49, -1, -1)[:, None]
+    expected = lam ** 50 * variance + ((1 - lam) * powers * squared).sum(axis=0)
+    np.testing.assert_allclose(ewma_next_variance(squared, variance, lam), expected)
+
+
+def test_forecast_reverts_to_the_long_run_variance():
+    variance, next_variance = np.array([1e-4, 1e-4]), np.array([4e-4, 4e-4])
+    flat, reverting = annualized_volatility(variance, next_variance, [1.0, 0.0], horizon=10, periods_per_year=252)
+    assert flat == pytest.approx(np.sqrt(4e-4 * 252))
+    assert reverting == pytest.approx(np.sqrt((4e-4 + 9e-4) / 10 * 252))
+
+
+@pytest.fixture
+def store(tmp_path):
+    returns = np.column_stack([RETURNS[:600], RETURNS[:600, :1] * 2])
+    returns[:400, 2] = np.nan
+    dates = pd.bdate_range("2015-01-01", periods=len(returns))
+    write_return_store(returns, ["SPY", "AGG", "SHORT"], dates, path=str(tmp_path / "store"))
+    return ReturnStore(str(tmp_path / "store"))
+
+
+def test_forecasts_are_cached_per_history(store, tmp_path, monkeypatch):
+    path = str(tmp_path / "params.json")
+    first = forecast_volatilities(store, ["SPY", "AGG", "SHORT", "MISSING"], n_jobs=1, path=path)
+    assert set(first) == {"SPY", "AGG"}
+    assert all(0 < vol < 1 for vol in first.values())
+
+    def refit(*args):
+        raise AssertionError("unchanged histories must not be refitted")
+
+    monkeypatch.setattr(volatility_forecast, "_fit_chunk", refit)
+    assert forecast_volatilities(store, ["SPY", "AGG"], n_jobs=1, path=path) == first
+    assert forecast_volatilities(store, [], n_jobs=1, path=path) == {}
+
+
+def test_ewma_forecast_is_flat(store, tmp_path):
+    vols = forecast_volatilities(store, ["SPY"], model="ewma", n_jobs=1, path=str(tmp_path / "params.json"))
+    squared, _, variance = _prepare(store.column("SPY")[:, None])
+    assert vols["SPY"] == pytest.approx(np.sqrt(ewma_next_variance(squared, variance)[0] * 252))
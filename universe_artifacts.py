@@ -0,0 +1,208 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - UNIVERSE ARTIFACTS
+Precomputed, Versioned Per-Universe Bundles (Covariance, Stats, Frontier)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from config_enhanced import ASSUMED_CORRELATION, DATA_DIR, TICKER_CLASS
+from resampling import mean_variance_weights
+from risk_model import build_covariance_matrix, LRUCache
+
+FORMAT_VERSION = 1
+ARTIFACT_DIR = os.path.join(DATA_DIR, "artifacts")
+
+# Risk aversions swept to trace the long-only frontier, from return-seeking to minimum variance
+FRONTIER_RISK_AVERSIONS = np.logspace(-1, 3, 40)
+
+_loaded = LRUCache(maxsize=64)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SOURCE FINGERPRINT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def source_fingerprint(assets, mu, volatility, risk_free_rate, correlation=ASSUMED_CORRELATION):
+    """
+    Hash of everything an artifact bundle is derived from
+
+    Any change in the inputs (new estimates, a different risk-free rate or
+    correlation, a format bump) yields a new fingerprint, which is how stale
+    bundles are detected.
+    """
+    digest = hashlib.sha1(f"v{FORMAT_VERSION}|{','.join(assets)}|{risk_free_rate!r}".encode())
+    for values in (mu, volatility, correlation):
+        digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _corner_portfolios(mu, cov):
+    """
+    Long-only frontier portfolios where the set of held assets changes
+
+    Between two such corners the frontier weights move linearly, so the
+    corners summarize the whole frontier.
+    """
+    weights, supports = [], []
+    previous = None
+    for risk_aversion in FRONTIER_RISK_AVERSIONS:
+        previous = mean_variance_weights(mu, cov, risk_aversion, x0=previous)
+        support = tuple(previous > 1e-6)
+        if not supports or support != supports[-1]:
+            weights.append(previous)
+            supports.append(support)
+    if not np.array_equal(weights[-1], previous):
+        weights.append(previous)
+    return np.array(weights)
+
+
+def build_artifacts(assets, mu, volatility, risk_free_rate, correlation=ASSUMED_CORRELATION):
+    """
+    Derived quantities for one universe
+
+    Args:
+        assets: List of tickers
+        mu: Expected returns (decimal)
+        volatility: Volatilities (decimal)
+        risk_free_rate: Risk-free rate (decimal)
+        correlation: Constant correlation or full correlation matrix
+
+    Returns:
+        Dictionary of numpy arrays and metadata
+    """
+    mu = np.asarray(mu, dtype=float)
+    volatility = np.asarray(volatility, dtype=float)
+    cov = build_covariance_matrix(volatility, correlation)
+
+    sharpe = np.divide(mu - risk_free_rate, volatility, out=np.zeros_like(mu), where=volatility > 0)
+    inverse_vol = np.divide(1.0, volatility, out=np.zeros_like(volatility), where=volatility > 0)
+
+    classes = np.array([TICKER_CLASS.get(asset, "Other") for asset in assets])
+    class_names, class_index = np.unique(classes, return_inverse=True)
+
+    corners = _corner_portfolios(mu, cov)
+
+    return {
+        "assets": np.array(assets),
+        "mu": mu,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "inverse_volatility": inverse_vol,
+        "covariance": cov,
+        "cholesky": np.linalg.cholesky(cov),
+        "rank_return": np.argsort(-mu, kind="stable"),
+        "rank_volatility": np.argsort(volatility, kind="stable"),
+        "rank_sharpe": np.argsort(-sharpe, kind="stable"),
+        "class_names": class_names,
+        "class_index": class_index,
+        "corner_weights": corners,
+        "corner_returns": corners @ mu,
+        "corner_volatilities": np.sqrt(np.einsum("ij,jk,ik->i", corners, cov, corners)),
+        "fingerprint": source_fingerprint(assets, mu, volatility, risk_free_rate, correlation),
+        "built_at": time.time(),
+    }
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERIALIZATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _artifact_path(assets, directory):
+    universe = hashlib.sha1(",".join(assets).encode()).hexdigest()[:16]
+    return os.path.join(directory, f"universe_{universe}.npz")
+
+
+def save_artifacts(artifacts, directory=ARTIFACT_DIR):
+    """Write a bundle to a single .npz file (atomic rename)"""
+    os.makedirs(directory, exist_ok=True)
+    path = _artifact_path(list(artifacts["assets"]), directory)
+    meta = {"format_version": FORMAT_VERSION, "fingerprint": artifacts["fingerprint"], "built_at": artifacts["built_at"]}
+    arrays = {key: value for key, value in artifacts.items() if isinstance(value, np.ndarray)}
+
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+def _read_artifacts(path):
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        artifacts = {key: data[key] for key in data.files if key != "meta"}
+    artifacts.update(fingerprint=meta["fingerprint"], built_at=meta["built_at"])
+    return meta, artifacts
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOAD (BUILD ON MISS)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_universe_artifacts(assets, mu, volatility, risk_free_rate, correlation=ASSUMED_CORRELATION,
+                            directory=ARTIFACT_DIR):
+    """
+    Artifact bundle for a universe, rebuilt automatically when its inputs change
+
+    Lookup order: in-process cache, then a precomputed bundle file, then a
+    fresh build kept in memory only (bundle files are written solely by
+    precompute_artifacts). A bundle is only used if its fingerprint matches
+    the current inputs.
+
+    Args:
+        assets: List of tickers (order defines the array order)
+        mu: Expected returns (decimal)
+        volatility: Volatilities (decimal)
+        risk_free_rate: Risk-free rate (decimal)
+        correlation: Constant correlation or full correlation matrix
+        directory: Bundle directory
+
+    Returns:
+        Dictionary of numpy arrays (see build_artifacts); treat as read-only
+    """
+    assets = list(assets)
+    fingerprint = source_fingerprint(assets, mu, volatility, risk_free_rate, correlation)
+
+    cached = _loaded.get(fingerprint)
+    if cached is not None:
+        return cached
+
+    path = _artifact_path(assets, directory)
+    artifacts = None
+    if os.path.exists(path):
+        try:
+            meta, artifacts = _read_artifacts(path)
+            if meta["format_version"] != FORMAT_VERSION or meta["fingerprint"] != fingerprint:
+                artifacts = None
+        except (OSError, ValueError, KeyError):
+            artifacts = None
+
+    if artifacts is None:
+        artifacts = build_artifacts(assets, mu, volatility, risk_free_rate, correlation)
+
+    _loaded.put(fingerprint, artifacts)
+    return artifacts
+
+
+def precompute_artifacts(universes, directory=ARTIFACT_DIR):
+    """
+    Build and save bundles for known universes ahead of time
+
+    Args:
+        universes: Iterable of (assets, mu, volatility, risk_free_rate) or
+            (assets, mu, volatility, risk_free_rate, correlation) tuples
+        directory: Bundle directory
+
+    Returns:
+        List of written bundle paths
+    """
+    paths = []
+    for universe in universes:
+        artifacts = build_artifacts(*universe)
+        _loaded.put(artifacts["fingerprint"], artifacts)
+        paths.append(save_artifacts(artifacts, directory))
+    return paths
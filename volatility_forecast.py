@@ -0,0 +1,305 @@
+
+"""
+═══════════════════════════════════════════════════════════════════════════════
+🏔️ THE MOUNTAIN PATH - VOLATILITY FORECASTING
+GARCH(1,1) and EWMA Forecasts Fitted Across the Universe in One Pass
+═══════════════════════════════════════════════════════════════════════════════
+
+Recursions run over time with every asset of a chunk as one vector, so a
+likelihood evaluation costs one pass over the history for the whole chunk.
+Chunks of assets are fitted in parallel. Fitted parameters are cached per
+ticker with a fingerprint of its history: unchanged histories are not
+refitted, and changed ones are refitted from the previous parameters.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import minimize
+from config_enhanced import RETURN_STORE_PERIODS_PER_YEAR, VOLATILITY_FORECAST, VOLATILITY_PARAMS_PATH
+
+FORMAT_VERSION = 1
+
+# Starting point of a cold GARCH fit: persistence (alpha + beta) and alpha's share of it
+DEFAULT_PERSISTENCE = 0.95
+DEFAULT_ALPHA_SHARE = 0.08 / 0.95
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PREPARATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _prepare(returns):
+    """
+    Squared demeaned returns with gaps filled by the sample variance
+
+    A filled value leaves the variance recursion at its long-run level and
+    adds nothing to the likelihood, so assets with shorter or gappy
+    histories can share the time loop with the others.
+
+    Returns:
+        Tuple of (squared returns (T x n), observed mask (T x n), sample variances (n,))
+    """
+    returns = np.asarray(returns, dtype=float)
+    mask = ~np.isnan(returns)
+    demeaned = returns - np.nanmean(returns, axis=0)
+    variance = np.nanvar(returns, axis=0, ddof=1)
+    squared = np.where(mask, demeaned ** 2, variance)
+    return squared, mask, variance
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EWMA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def ewma_next_variance(squared, variance, lam=VOLATILITY_FORECAST["ewma_lambda"]):
+    """
+    RiskMetrics EWMA variance for the next period, all assets at once
+
+    Args:
+        squared: Squared returns (T x n), as from _prepare
+        variance: Starting variances (n,)
+        lam: Decay factor
+
+    Returns:
+        Next-period variances (n,)
+    """
+    h = np.array(variance, dtype=float)
+    for t in range(len(squared)):
+        h = lam * h + (1.0 - lam) * squared[t]
+    return h
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GARCH(1,1)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _garch_coefficients(theta, n):
+    """(alpha, beta) from the (persistence, alpha share) parameterization"""
+    persistence, share = theta[:n], theta[n:]
+    return persistence * share, persistence * (1.0 - share)
+
+
+def garch_objective(theta, squared, mask, variance):
+    """
+    GARCH(1,1) negative log-likelihood and its gradient for a chunk of assets
+
+    h_t = omega + alpha e_{t-1}^2 + beta h_{t-1}, with variance targeting
+    omega = s^2 (1 - alpha - beta). Parameters are (persistence, alpha share)
+    per asset so the stationarity constraint becomes simple bounds. The
+    derivatives of h_t follow their own recursions, computed in the same
+    pass. Assets are independent; each one's likelihood is averaged over
+    its observations and the chunk total is returned.
+
+    Args:
+        theta: Parameters (2n,): persistences then alpha shares
+        squared, mask, variance: As from _prepare
+
+    Returns:
+        Tuple of (objective, gradient (2n,))
+    """
+    n = len(variance)
+    alpha, beta = _garch_coefficients(theta, n)
+    omega = variance * (1.0 - alpha - beta)
+
+    h = variance.copy()
+    dh_dalpha = np.zeros(n)
+    dh_dbeta = np.zeros(n)
+    nll = np.zeros(n)
+    grad_alpha = np.zeros(n)
+    grad_beta = np.zeros(n)
+
+    weights = mask.astype(float)
+    for t in range(len(squared)):
+        if t:
+            dh_dalpha = squared[t - 1] - variance + beta * dh_dalpha
+            dh_dbeta = h - variance + beta * dh_dbeta
+            h = omega + alpha * squared[t - 1] + beta * h
+        ratio = squared[t] / h
+        nll += weights[t] * (np.log(h) + ratio)
+        dnll_dh = weights[t] * (1.0 - ratio) / h
+        grad_alpha += dnll_dh * dh_dalpha
+        grad_beta += dnll_dh * dh_dbeta
+
+    scale = 0.5 / np.maximum(mask.sum(axis=0), 1)
+    persistence, share = theta[:n], theta[n:]
+    gradient = np.concatenate([
+        (grad_alpha * share + grad_beta * (1.0 - share)) * scale,
+        (grad_alpha - grad_beta) * persistence * scale,
+    ])
+    return float((nll * scale).sum()), gradient
+
+
+def garch_next_variance(squared, variance, alpha, beta):
+    """Next-period GARCH(1,1) variances (n,) after the whole history"""
+    omega = variance * (1.0 - alpha - beta)
+    h = np.array(variance, dtype=float)
+    for t in range(len(squared)):
+        h = omega + alpha * squared[t] + beta * h
+    return h
+
+
+def fit_garch(returns, x0=None, max_iterations=200):
+    """
+    Fit GARCH(1,1) to a chunk of assets jointly
+
+    The chunk likelihood is a sum of per-asset terms, so one bounded
+    L-BFGS-B solve over all parameters fits every asset at once.
+
+    Args:
+        returns: Return matrix (T x n); NaN marks missing observations
+        x0: Optional starting (persistence, alpha share) pairs (n x 2), e.g.
+            the previous fit, to warm start a refit on extended data
+        max_iterations: L-BFGS-B iteration limit
+
+    Returns:
+        Dictionary with alpha, beta, variance (long-run), next_variance,
+        n_obs (per asset) and iterations
+    """
+    squared, mask, variance = _prepare(returns)
+    n = squared.shape[1]
+    if x0 is None:
+        theta0 = np.concatenate([np.full(n, DEFAULT_PERSISTENCE), np.full(n, DEFAULT_ALPHA_SHARE)])
+    else:
+        x0 = np.asarray(x0, dtype=float)
+        theta0 = np.concatenate([x0[:, 0], x0[:, 1]])
+
+    result = minimize(garch_objective, theta0, args=(squared, mask, variance), jac=True, method="L-BFGS-B",
+                      bounds=[(0.0, 0.999)] * n + [(1e-4, 1.0)] * n, options={"maxiter": max_iterations})
+    alpha, beta = _garch_coefficients(result.x, n)
+    return {
+        "alpha": alpha,
+        "beta": beta,
+        "variance": variance,
+        "next_variance": garch_next_variance(squared, variance, alpha, beta),
+        "n_obs": mask.sum(axis=0),
+        "iterations": result.nit,
+    }
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FORECASTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def annualized_volatility(variance, next_variance, persistence, horizon=VOLATILITY_FORECAST["horizon"],
+                          periods_per_year=RETURN_STORE_PERIODS_PER_YEAR):
+    """
+    Annualized volatility from the average forecast variance over a horizon
+
+    E[h_{T+k}] = s^2 + persistence^(k-1) (h_{T+1} - s^2), so the forecast
+    reverts from the current level to the long-run variance. EWMA has
+    persistence 1 (the forecast stays flat).
+
+    Returns:
+        Volatilities (n,), decimal
+    """
+    decay = np.asarray(persistence, dtype=float)[:, None] ** np.arange(horizon)
+    path = variance[:, None] + decay * (next_variance - variance)[:, None]
+    return np.sqrt(path.mean(axis=1) * periods_per_year)
+
+
+def _fit_chunk(model, returns, x0):
+    """Fit one chunk of assets (runs in a worker process)"""
+    if model == "ewma":
+        squared, mask, variance = _prepare(returns)
+        next_variance = ewma_next_variance(squared, variance)
+        return {"persistence": np.ones(len(variance)), "variance": variance,
+                "next_variance": next_variance, "x": np.zeros((len(variance), 2))}
+    fit = fit_garch(returns, x0)
+    persistence = fit["alpha"] + fit["beta"]
+    share = np.divide(fit["alpha"], persistence, out=np.full_like(persistence, DEFAULT_ALPHA_SHARE), where=persistence > 0)
+    return {"persistence": persistence, "variance": fit["variance"],
+            "next_variance": fit["next_variance"], "x": np.column_stack([persistence, share])}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARAMETER CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def history_fingerprint(column):
+    """Short hash of one ticker's return history"""
+    return hashlib.sha1(np.ascontiguousarray(column, dtype=np.float64).tobytes()).hexdigest()[:16]
+
+
+def _load_params(path):
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cached.get("tickers", {}) if cached.get("format_version") == FORMAT_VERSION else {}
+
+
+def _save_params(params, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"format_version": FORMAT_VERSION, "tickers": params}, f)
+    os.replace(tmp, path)
+
+
+def forecast_volatilities(store, tickers, model=VOLATILITY_FORECAST["model"], horizon=VOLATILITY_FORECAST["horizon"],
+                          chunk_size=VOLATILITY_FORECAST["chunk_size"], n_jobs=None, path=VOLATILITY_PARAMS_PATH):
+    """
+    Annualized volatility forecasts for the tickers in a ReturnStore
+
+    Tickers whose history is unchanged since the cached fit reuse it
+    without touching the data again; the rest are fitted in chunks across
+    a process pool, GARCH refits starting from the cached parameters.
+
+    Args:
+        store: ReturnStore
+        tickers: Tickers to forecast (those missing from the store or with
+            fewer than min_observations returns are skipped)
+        model: "garch" or "ewma"
+        horizon: Forecast horizon in history periods
+        chunk_size: Assets per fitting job
+        n_jobs: Worker processes. None uses every core; 1 runs in-process.
+        path: Parameter cache file
+
+    Returns:
+        Dictionary with ticker: annualized volatility (decimal)
+    """
+    cached = _load_params(path)
+    columns = {ticker: store.column(ticker) for ticker in tickers if ticker in store}
+    columns = {ticker: column for ticker, column in columns.items()
+               if np.count_nonzero(~np.isnan(column)) >= VOLATILITY_FORECAST["min_observations"]}
+
+    fingerprints = {ticker: history_fingerprint(column) for ticker, column in columns.items()}
+    stale = [ticker for ticker in columns
+             if cached.get(ticker, {}).get("model") != model or cached[ticker]["fingerprint"] != fingerprints[ticker]]
+
+    if stale:
+        chunks = [stale[i:i + chunk_size] for i in range(0, len(stale), chunk_size)]
+        jobs = []
+        for chunk in chunks:
+            x0 = np.array([cached[ticker]["x"] if cached.get(ticker, {}).get("model") == model
+                           else [DEFAULT_PERSISTENCE, DEFAULT_ALPHA_SHARE] for ticker in chunk])
+            jobs.append((model, np.column_stack([columns[ticker] for ticker in chunk]), x0))
+
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(jobs) == 1:
+            fits = [_fit_chunk(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs))) as pool:
+                fits = list(pool.map(_fit_chunk, *zip(*jobs)))
+
+        for chunk, fit in zip(chunks, fits):
+            for i, ticker in enumerate(chunk):
+                cached[ticker] = {
+                    "model": model,
+                    "fingerprint": fingerprints[ticker],
+                    "x": fit["x"][i].tolist(),
+                    "persistence": float(fit["persistence"][i]),
+                    "variance": float(fit["variance"][i]),
+                    "next_variance": float(fit["next_variance"][i]),
+                }
+        _save_params(cached, path)
+
+    if not columns:
+        return {}
+    names = list(columns)
+    vols = annualized_volatility(
+        np.array([cached[ticker]["variance"] for ticker in names]),
+        np.array([cached[ticker]["next_variance"] for ticker in names]),
+        np.array([cached[ticker]["persistence"] for ticker in names]),
+        horizon,
+    )
+    return dict(zip(names, vols.tolist()))